@@ -0,0 +1,479 @@
+import os
+import time
+import queue
+import asyncio
+import logging
+import threading
+import contextvars
+from collections import OrderedDict, deque
+from contextlib import nullcontext
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import llm_scheduler
+
+from news_fetcher3 import get_news_about, extract_article_content
+from sentiment_analysis import iter_sentiment_results, is_llm_result, CACHE_VERSION as SENTIMENT_VERSION, MAX_BATCH_ARTICLES
+from summarizer import stream_overall_summary
+from keyword_engine import extract_keywords
+from models import canonical_url, get_article_analyses, save_article_analyses
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+# fetch -> dedupe -> extract -> image    -> (results)
+#                            -> sentiment -> (results) -> summary
+STAGES = ("fetch", "dedupe", "extract", "image", "sentiment", "summary")
+
+# Workers per stage; sentiment workers each run one batch of requests at a time
+STAGE_CONCURRENCY = {
+    'extract': int(os.getenv("PIPELINE_EXTRACT_WORKERS", "4")),
+    'image': int(os.getenv("PIPELINE_IMAGE_WORKERS", "6")),
+    'sentiment': int(os.getenv("PIPELINE_SENTIMENT_WORKERS", "2")),
+}
+
+# Articles waiting between two stages; a full queue makes the stage before it wait
+QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "16"))
+
+# Articles whose feed entry carries less text than this are extracted from the page
+MIN_CONTENT_CHARS = 200
+
+_DONE = object()
+
+
+class AnalysisPipeline:
+    """
+    Search analysis as a chain of stages running in a background thread.
+
+    fetch → dedupe → extract → image/sentiment → summary. Stages are
+    connected by bounded queues and run with their own number of workers, so
+    images and sentiment are worked on while the UI is still laying out
+    cards, and the overall summary starts as soon as the first page's
+    sentiment is in, from every analysis finished by then (see
+    summary_articles). The UI only consumes the output:
+
+        pipeline = AnalysisPipeline(query, max_articles=20).start()
+        articles = pipeline.articles()            # deduplicated, before enrichment
+        for kind, url, value in pipeline.results(page_urls):
+            ...                                   # ('image', url, image_url) / ('sentiment', url, result)
+        for piece in pipeline.summary():
+            ...                                   # overall summary text as it is generated
+
+    Results are kept per article and can be read by several consumers, and
+    the output never waits for the UI. Articles are enriched in the order
+    given; with `page_size`, only the first page is analyzed at the LLM's
+    normal priority and the rest is prefetched in the background, unless the
+    UI asks for it with prioritize(). Articles fetched beforehand (e.g. from
+    a cache) can be passed in; the fetch stage then only hands them on.
+    """
+
+    def __init__(self, query: str, max_articles: int = 20, start_date: Optional[str] = None,
+                 end_date: Optional[str] = None, articles: Optional[List[Dict[str, Any]]] = None,
+                 page_size: Optional[int] = None, concurrency: Optional[Dict[str, int]] = None,
+                 queue_size: int = QUEUE_SIZE):
+        self.query = query
+        self.max_articles = max_articles
+        self.start_date = start_date
+        self.end_date = end_date
+        self.concurrency = {**STAGE_CONCURRENCY, **(concurrency or {})}
+        self.queue_size = queue_size
+        self.fetched = articles
+        self.page_size = page_size
+
+        self.error: Optional[str] = None
+        self.top_topics: List[Tuple[str, int]] = []
+        self.article_keywords: Dict[str, List[str]] = {}
+        self.reused = 0
+        self.images: Dict[str, Optional[str]] = {}
+        self.sentiments: Dict[str, Optional[Dict[str, Any]]] = {}
+
+        self._articles: List[Dict[str, Any]] = []
+        self._articles_ready = threading.Event()
+        self._changed = threading.Condition()
+        self._results_done = False
+        self._promoted: deque = deque()
+        self._visible: set = set()
+        self._summary: "queue.Queue" = queue.Queue()
+        self._first_page: List[str] = []
+        self._summary_urls: List[str] = []
+        self._summary_started = threading.Event()
+        self._analyzed: Dict[str, Dict[str, Any]] = {}
+        # Sentiment stored by earlier searches, looked up once for all articles after dedupe
+        self._stored: Dict[str, Dict[str, Any]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sentiment_changed: Optional[asyncio.Condition] = None
+        self._cancelled = threading.Event()
+        self._stats = {stage: {'items': 0, 'busy': 0.0, 'max_queue': 0} for stage in STAGES}
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+
+    # ----- consumer side -----
+
+    def start(self) -> "AnalysisPipeline":
+        """Run the pipeline in a background thread (with the caller's context, e.g. the LLM user)."""
+        context = contextvars.copy_context()
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=context.run, args=(asyncio.run, self._run()),
+                                        name=f"pipeline-{self.query[:20]}", daemon=True)
+        self._thread.start()
+        return self
+
+    def articles(self, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Deduplicated articles, as soon as fetching is done. Empty if fetching failed."""
+        self._articles_ready.wait(timeout)
+        return self._articles
+
+    def results(self, urls: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, str, Any]]:
+        """
+        Image and sentiment of the given articles (default: all), those already
+        done first, then in completion order until all of them are done.
+
+        Yields:
+            ('image', url, image_url or None) and ('sentiment', url, result or None)
+        """
+        self._articles_ready.wait()
+        wanted = set(a['url'] for a in self._articles if a.get('url')) if urls is None else set(urls)
+        stores = (('image', self.images), ('sentiment', self.sentiments))
+        delivered = set()
+        while len(delivered) < len(stores) * len(wanted):
+            with self._changed:
+                ready = [(kind, url, store[url]) for kind, store in stores for url in wanted
+                         if url in store and (kind, url) not in delivered]
+                if not ready:
+                    if self._results_done:
+                        return
+                    self._changed.wait()
+                    continue
+            for kind, url, value in ready:
+                delivered.add((kind, url))
+                yield kind, url, value
+
+    def prioritize(self, urls: Iterable[str]) -> None:
+        """Enrich these articles next (e.g. the page the user opened), at the LLM's normal priority."""
+        urls = list(urls)
+        self._visible.update(urls)
+        self._promoted.extend(urls)
+        # Articles already waiting for sentiment can be picked up by the visible workers now
+        loop = self._loop
+        if loop and not loop.is_closed():
+            try:
+                asyncio.run_coroutine_threadsafe(self._wake_sentiment(), loop)
+            except RuntimeError:
+                pass  # The pipeline just finished
+
+    def summary(self) -> Iterator[str]:
+        """Pieces of the overall summary as they are generated (nothing if no article was analyzed)."""
+        while True:
+            piece = self._summary.get()
+            if piece is _DONE:
+                return
+            yield piece
+
+    def summary_articles(self, timeout: Optional[float] = None) -> List[str]:
+        """URLs of the analyzed articles the overall summary covers, once it has started."""
+        self._summary_started.wait(timeout)
+        return list(self._summary_urls)
+
+    def cancel(self) -> None:
+        """Stop feeding new work into the stages; output already queued is still delivered."""
+        self._cancelled.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Items handled, busy seconds and highest queue depth per stage, and total time."""
+        end = self._finished_at or time.perf_counter()
+        return {
+            'stages': {stage: dict(stats) for stage, stats in self._stats.items()},
+            'seconds': end - self._started_at if self._started_at else 0.0,
+            'articles': len(self._articles),
+            'reused_analyses': self.reused,
+            'error': self.error
+        }
+
+    # ----- stages -----
+
+    async def _run(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        extract_in = asyncio.Queue(self.queue_size)
+        image_in = asyncio.Queue(self.queue_size)
+        sentiment_in = asyncio.Queue(self.queue_size)
+        # Starts once the first page is analyzed, while the other pages are still being enriched
+        summary = asyncio.create_task(self._summary_stage())
+        try:
+            await asyncio.gather(
+                self._fetch_and_dedupe(extract_in),
+                self._stage('extract', extract_in, self._extract, {'image': image_in, 'sentiment': sentiment_in}),
+                self._stage('image', image_in, self._image, {}),
+                self._sentiment_stage(sentiment_in),
+            )
+        except Exception as e:
+            self.error = str(e)
+            logger.error(f"Pipeline for {self.query} failed: {e}")
+        finally:
+            self._articles_ready.set()
+            with self._changed:
+                self._results_done = True
+                self._changed.notify_all()
+
+        try:
+            await summary
+        finally:
+            self._summary_started.set()
+            self._summary.put(_DONE)
+            self._finished_at = time.perf_counter()
+            logger.info(f"Pipeline for {self.query}: {len(self._articles)} articles in "
+                        f"{self._finished_at - self._started_at:.2f}s")
+        # Only now is every body extracted; the summary stage may have scored partial ones
+        await asyncio.to_thread(self._learn_keywords)
+
+    async def _fetch_and_dedupe(self, outbox: asyncio.Queue) -> None:
+        try:
+            start = time.perf_counter()
+            fetched = self.fetched
+            if fetched is None:
+                try:
+                    fetched = await asyncio.to_thread(get_news_about, self.query, self.max_articles,
+                                                      self.start_date, self.end_date)
+                except Exception as e:
+                    self.error = f"fetch failed: {e}"
+                    logger.error(f"Fetching articles for {self.query} failed: {e}")
+                    fetched = []
+            self._count('fetch', len(fetched), time.perf_counter() - start)
+
+            # The same story syndicated under tracking parameters or www. variants counts once
+            start = time.perf_counter()
+            seen = set()
+            for article in fetched:
+                key = canonical_url(article.get('url', '')) if article.get('url') else id(article)
+                if key not in seen:
+                    seen.add(key)
+                    self._articles.append(article)
+            self._count('dedupe', len(self._articles), time.perf_counter() - start)
+            pending = OrderedDict((a['url'], a) for a in self._articles if a.get('url'))
+            self._first_page = list(pending)[:self.page_size] if self.page_size else list(pending)
+            self._visible.update(self._first_page)
+            self._articles_ready.set()
+
+            # One $in query for every article, before any of them reaches the sentiment stage;
+            # lexicon answers stored before they were filtered out are analyzed again
+            stored = await asyncio.to_thread(get_article_analyses, self.query, list(pending))
+            self._stored = {url: doc['sentiment'] for url, doc in stored.items()
+                            if is_llm_result(doc.get('sentiment')) and doc.get('version') == SENTIMENT_VERSION}
+
+            # In the given order, except for articles the UI asked for in the meantime
+            while pending and not self._cancelled.is_set():
+                article = None
+                while self._promoted and article is None:
+                    article = pending.pop(self._promoted.popleft(), None)
+                if article is None:
+                    _, article = pending.popitem(last=False)
+                await outbox.put(article)
+                self._track_queue('extract', outbox)
+        finally:
+            await outbox.put(_DONE)
+
+    async def _stage(self, name: str, inbox: asyncio.Queue, handler, outboxes: Dict[str, asyncio.Queue]) -> None:
+        """Run `handler` on every article from `inbox` with the stage's workers, passing it to the next stages."""
+        async def worker():
+            while True:
+                article = await inbox.get()
+                if article is _DONE:
+                    # Let the other workers see the end too
+                    await inbox.put(_DONE)
+                    return
+                start = time.perf_counter()
+                try:
+                    article = await handler(article)
+                except Exception as e:
+                    logger.warning(f"{name} stage failed for {article.get('url')}: {e}")
+                self._count(name, 1, time.perf_counter() - start)
+                for stage, outbox in outboxes.items():
+                    await outbox.put(article)
+                    self._track_queue(stage, outbox)
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(max(1, self.concurrency.get(name, 1)))))
+        finally:
+            for outbox in outboxes.values():
+                await outbox.put(_DONE)
+
+    async def _extract(self, article: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch the page for articles whose feed entry has too little text."""
+        if len(article.get('content') or '') >= MIN_CONTENT_CHARS:
+            return article
+        extracted = await asyncio.to_thread(extract_article_content, article['url'])
+        if extracted and len(extracted.get('content') or '') > len(article.get('content') or ''):
+            article['content'] = extracted['content']
+            for field in ('title', 'publish_date', 'image_url', 'author'):
+                if not article.get(field) and extracted.get(field):
+                    article[field] = extracted[field]
+        return article
+
+    async def _image(self, article: Dict[str, Any]) -> Dict[str, Any]:
+        """Image for the card: the one the fetcher found, otherwise a (cached) page lookup."""
+        from enhanced_image_extractor import find_image
+        image_url = await asyncio.to_thread(find_image, article)
+        self._emit(self.images, article['url'], image_url)
+        return article
+
+    async def _sentiment_stage(self, inbox: asyncio.Queue) -> None:
+        """
+        Analyze articles in small batches as they arrive from extraction.
+
+        Visible articles (the first page and any the UI asked for) have their
+        own workers; the rest is analyzed by one worker at background LLM
+        priority, so a prefetch waiting for quota never holds up a page the
+        user opened. Analyses stored by earlier searches (any user) are
+        reused; the rest go through the async sentiment pipeline and are
+        stored for the next search.
+        """
+        waiting: List[Dict[str, Any]] = []
+        finished = False
+        self._sentiment_changed = changed = asyncio.Condition()
+
+        def take(visible_only: bool) -> List[Dict[str, Any]]:
+            batch = [a for a in waiting if a['url'] in self._visible][:MAX_BATCH_ARTICLES]
+            if not batch and not visible_only:
+                batch = waiting[:MAX_BATCH_ARTICLES]
+            for article in batch:
+                waiting.remove(article)
+            return batch
+
+        async def collect():
+            nonlocal finished
+            while not finished:
+                article = await inbox.get()
+                async with changed:
+                    if article is _DONE:
+                        finished = True
+                    else:
+                        waiting.append(article)
+                    changed.notify_all()
+
+        async def worker(visible_only: bool):
+            while True:
+                async with changed:
+                    await changed.wait_for(lambda: finished or take_ready(visible_only))
+                    batch = take(visible_only)
+                    if not batch and finished and (visible_only or not waiting):
+                        return
+                if batch:
+                    start = time.perf_counter()
+                    await self._analyze(batch)
+                    self._count('sentiment', len(batch), time.perf_counter() - start)
+
+        def take_ready(visible_only: bool) -> bool:
+            return any(a['url'] in self._visible for a in waiting) or (bool(waiting) and not visible_only)
+
+        workers = [worker(True) for _ in range(max(1, self.concurrency['sentiment']))] + [worker(False)]
+        try:
+            await asyncio.gather(collect(), *workers)
+        finally:
+            self._sentiment_changed = None
+
+    async def _wake_sentiment(self) -> None:
+        changed = self._sentiment_changed
+        if changed:
+            async with changed:
+                changed.notify_all()
+
+    async def _analyze(self, batch: List[Dict[str, Any]]) -> None:
+        # Articles nobody is looking at yet give way to other users' requests
+        visible = any(article['url'] in self._visible for article in batch)
+        with nullcontext() if visible else llm_scheduler.priority("background"):
+            await self._analyze_batch(batch)
+
+    async def _analyze_batch(self, batch: List[Dict[str, Any]]) -> None:
+        by_url = {article['url']: article for article in batch}
+        reused = {url: self._stored[url] for url in by_url if url in self._stored}
+        if reused:
+            self.reused += len(reused)
+            logger.info(f"Reusing {len(reused)} stored analyses for {self.query}")
+        for url, result in reused.items():
+            self._emit_sentiment(by_url[url], result)
+
+        pending = {url: article.get('content', '') for url, article in by_url.items() if url not in reused}
+        titles = {url: by_url[url].get('title', '') for url in pending}
+        analyzed = []
+        if pending:
+            async for url, result in iter_sentiment_results(self.query, pending, titles=titles):
+                self._emit_sentiment(by_url[url], result)
+                # Lexicon answers are recomputed per search; only LLM analyses are shared
+                if is_llm_result(result):
+                    analyzed.append({'url': url, 'sentiment': result, 'version': SENTIMENT_VERSION})
+        if analyzed:
+            await asyncio.to_thread(save_article_analyses, self.query, analyzed)
+
+    def _emit_sentiment(self, article: Dict[str, Any], result: Optional[Dict[str, Any]]) -> None:
+        if result:
+            self._analyzed[article['url']] = {
+                'url': article['url'],
+                'title': article.get('title', ''),
+                'source': article.get('source', 'Unknown'),
+                'summary': result['Summary'],
+                'sentiment_score': float(result['Score'])
+            }
+        self._emit(self.sentiments, article['url'], result)
+
+    def _emit(self, store: Dict[str, Any], url: str, value: Any) -> None:
+        with self._changed:
+            store[url] = value
+            self._changed.notify_all()
+
+    async def _summary_stage(self) -> None:
+        """Topics over the whole result set, then the streamed overall summary of the analyses done so far."""
+        await asyncio.to_thread(self._wait_for_first_page)
+        if not self._articles:
+            return
+        start = time.perf_counter()
+        # Later pages may still be mid-extraction, so the DF table is not updated yet (see _learn_keywords)
+        self.article_keywords, self.top_topics = await asyncio.to_thread(
+            extract_keywords, self.query, *self._keyword_input(), update=False)
+
+        # Same order as the cards, so the summary cache key matches across reruns
+        entries = [self._analyzed[a['url']] for a in self._articles if a.get('url') in self._analyzed]
+        self._summary_urls = [entry['url'] for entry in entries]
+        self._summary_started.set()
+        if entries and not self._cancelled.is_set():
+            try:
+                await asyncio.to_thread(self._stream_summary, entries)
+            except Exception as e:
+                logger.error(f"Overall summary for {self.query} failed: {e}")
+        self._count('summary', 1, time.perf_counter() - start)
+
+    def _keyword_input(self) -> Tuple[Dict[str, str], Dict[str, str]]:
+        contents = {a['url']: a.get('content', '') for a in self._articles if a.get('url')}
+        titles = {a['url']: a.get('title', '') for a in self._articles if a.get('url')}
+        return contents, titles
+
+    def _learn_keywords(self) -> None:
+        """Add the finished article bodies to the persistent document-frequency table."""
+        if not self._articles:
+            return
+        try:
+            extract_keywords(self.query, *self._keyword_input(), update=True)
+        except Exception as e:
+            logger.warning(f"Could not update keyword statistics for {self.query}: {e}")
+
+    def _wait_for_first_page(self) -> None:
+        """Block until every first-page article has its sentiment, or the stages are done."""
+        self._articles_ready.wait()
+        with self._changed:
+            self._changed.wait_for(lambda: self._results_done or all(url in self.sentiments for url in self._first_page))
+
+    def _stream_summary(self, entries: List[Dict[str, Any]]) -> None:
+        for piece in stream_overall_summary(self.query, entries):
+            self._summary.put(piece)
+
+    # ----- bookkeeping -----
+
+    def _count(self, stage: str, items: int, seconds: float) -> None:
+        self._stats[stage]['items'] += items
+        self._stats[stage]['busy'] += seconds
+
+    def _track_queue(self, stage: str, inbox: asyncio.Queue) -> None:
+        self._stats[stage]['max_queue'] = max(self._stats[stage]['max_queue'], inbox.qsize())
@@ -1,13 +1,18 @@
 #app.py
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib as mpl
 
-# Configure matplotlib to use a font that supports common Unicode characters
-mpl.rcParams['font.family'] = 'sans-serif'
-mpl.rcParams['font.sans-serif'] = ['Arial', 'DejaVu Sans', 'Liberation Sans', 'Bitstream Vera Sans', 'sans-serif']
+def get_pyplot():
+    """Import matplotlib on the first chart; it is slow to import and most reruns draw none."""
+    import matplotlib.pyplot as plt
+    import matplotlib as mpl
+
+    # Configure matplotlib to use a font that supports common Unicode characters
+    mpl.rcParams['font.family'] = 'sans-serif'
+    mpl.rcParams['font.sans-serif'] = ['Arial', 'DejaVu Sans', 'Liberation Sans', 'Bitstream Vera Sans', 'sans-serif']
+    return plt
+
 import time
+import math
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -19,7 +24,7 @@ import requests
 import urllib.parse
 from datetime import datetime, timedelta
 from bs4 import BeautifulSoup
-from news_fetcher3 import get_news_about, make_absolute_url_robust, test_image_accessibility  # Import our enhanced RSS fetcher
+from news_fetcher3 import make_absolute_url_robust, test_image_accessibility  # Import our enhanced RSS fetcher
 
 def is_consent_page(response):
     """Check if the response is a consent page"""
@@ -170,17 +175,23 @@ def handle_consent(session, url):
     except Exception as e:
         logger.error(f"Error in handle_consent: {str(e)}")
         return False
-from sentiment_analysis import analyze_sentiment  # Import the sentiment analysis function
-from summarizer import generate_overall_summary  # Import the summarizer function
-from tts import translate_and_generate_audio  # Import the TTS function
+from summarizer import generate_overall_summary, SentenceSplitter  # Import the summarizer functions
+from analysis_pipeline import AnalysisPipeline  # Staged fetch/extract/image/sentiment/summary pipeline
+import app_cache  # Streamlit caching of clients, fetched news and analyses
+from tts import SentenceAudioStream  # Import the TTS functions
+import audio_jobs  # Background audio generation
 from auth_ui import show_login_form, show_register_form, show_logout_button, get_current_user, require_login, require_admin
 from models import log_search  # Import the search logging function
+from llm_scheduler import set_user  # Fair sharing of the LLM quota between users
 import asyncio
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Result cards per page on the search page; only the open page is enriched right away
+RESULTS_PAGE_SIZE = 10
+
 # Professional styling with clean design (keeping the same CSS as before)
 st.markdown("""
 <style>
@@ -809,6 +820,8 @@ if not st.session_state.get('authenticated'):
 
 # User is authenticated, get user info
 user = get_current_user()
+set_user(user.get('username') if user else None)
+app_cache.warm_resources()
 
 # Navigation
 st.sidebar.title("Navigation")
@@ -843,13 +856,8 @@ if user:
     
     # Main content based on navigation
     if page == "Personalized Feed":
-        def get_articles_by_domains(domains, date_range="Last 7 days"):
-            """
-            Fetch articles based on the given domains and date range using enhanced RSS fetcher.
-            """
-            articles = []
-            processed_urls = set()
-            
+        def date_range_bounds(date_range):
+            """Start (None for all time) and end date of a date range choice, as YYYY-MM-DD strings."""
             # Convert date range to start_date and end_date
             end_date = datetime.now()
             if date_range == "Last 24 hours":
@@ -862,32 +870,66 @@ if user:
                 start_date = None
             
             # Format dates as strings for the API
-            start_date_str = start_date.strftime('%Y-%m-%d') if start_date else None
-            end_date_str = end_date.strftime('%Y-%m-%d')
+            return (start_date.strftime('%Y-%m-%d') if start_date else None), end_date.strftime('%Y-%m-%d')
+        
+        def get_materialized_articles(user, date_range="Last 7 days"):
+            """
+            Articles of the user's materialized feed in the date range, or None if the
+            feed has not been materialized for all of the user's interests yet.
+            """
+            feed = app_cache.load_user_feed(str(user['_id']))
+            interests = user.get('interests', [])
+            if not feed or any(domain not in feed.get('domains', {}) for domain in interests):
+                return None
             
-            # Search for articles for each domain using the enhanced RSS fetcher
-            for domain in domains:
-                try:
-                    logger.info(f"Fetching articles for domain: {domain}")
-                    domain_articles = get_news_about(
-                        query=domain,
-                        max_articles=20,  # Limit per domain
-                        start_date=start_date_str,
-                        end_date=end_date_str
-                    )
-                    
-                    # Add articles to the results, avoiding duplicates
-                    for article in domain_articles:
-                        if article.get('url') and article['url'] not in processed_urls:
-                            # Add domain information to the article
-                            article['domain'] = domain
-                            articles.append(article)
-                            processed_urls.add(article['url'])
-                            logger.info(f"Added article: {article.get('title')} with image: {article.get('image_url', 'No image')}")
-                    
-                except Exception as e:
-                    st.error(f"Error fetching articles for {domain}: {str(e)}")
-                    logger.error(f"Error fetching articles for {domain}: {str(e)}")
+            start_date_str, end_date_str = date_range_bounds(date_range)
+            articles = []
+            processed_urls = set()
+            for domain in interests:
+                for article in feed['domains'][domain]:
+                    # Same date filter as the fetcher: undated articles are kept
+                    publish_date = str(article.get('publish_date') or '').split('T')[0]
+                    if len(publish_date) == 10 and publish_date[4] == '-':
+                        if (start_date_str and publish_date < start_date_str) or publish_date > end_date_str:
+                            continue
+                    if article.get('url') and article['url'] not in processed_urls:
+                        articles.append({**article, 'domain': domain})
+                        processed_urls.add(article['url'])
+            
+            logger.info(f"Loaded {len(articles)} articles from the materialized feed (updated {feed.get('updated_at')})")
+            return articles
+        
+        def get_articles_by_domains(domains, date_range="Last 7 days"):
+            """
+            Fetch articles based on the given domains and date range using enhanced RSS fetcher.
+            """
+            articles = []
+            processed_urls = set()
+            start_date_str, end_date_str = date_range_bounds(date_range)
+            
+            # One crawl of the RSS feeds for all domains
+            try:
+                logger.info(f"Fetching articles for domains: {', '.join(domains)}")
+                domain_news = app_cache.fetch_domain_news(
+                    tuple(domains),
+                    max_articles=20,  # Limit per domain
+                    start_date=start_date_str,
+                    end_date=end_date_str
+                )
+            except Exception as e:
+                st.error(f"Error fetching articles: {str(e)}")
+                logger.error(f"Error fetching articles for {domains}: {str(e)}")
+                domain_news = {}
+            
+            for domain, domain_articles in domain_news.items():
+                # Add articles to the results, avoiding duplicates
+                for article in domain_articles:
+                    if article.get('url') and article['url'] not in processed_urls:
+                        # Add domain information to the article
+                        article['domain'] = domain
+                        articles.append(article)
+                        processed_urls.add(article['url'])
+                        logger.info(f"Added article: {article.get('title')} with image: {article.get('image_url', 'No image')}")
             
             logger.info(f"Total articles fetched: {len(articles)}")
             return articles
@@ -916,7 +958,10 @@ if user:
             
             # Show overall statistics
             with st.spinner("Loading your personalized feed..."):
-                all_articles = get_articles_by_domains(user_interests, date_range)
+                # Precomputed in the background (feed_materializer); built now until it is
+                all_articles = get_materialized_articles(user, date_range)
+                if all_articles is None:
+                    all_articles = get_articles_by_domains(user_interests, date_range)
             
             if not all_articles:
                 st.info("No articles found for your interests in the selected time range.")
@@ -958,6 +1003,13 @@ if user:
                     articles_by_interest[domain] = []
                 articles_by_interest[domain].append(article)
             
+            # Look up images for every card at once; each card only waits for its own
+            from enhanced_image_extractor import prefetch_images
+            image_futures = prefetch_images([
+                article for articles in articles_by_interest.values() for article in articles[:10]
+                if not article.get('materialized_at')  # Looked up when the feed was materialized
+            ])
+            
             # Display articles grouped by interest
             for interest, articles in articles_by_interest.items():
                 st.markdown(f"""
@@ -975,18 +1027,11 @@ if user:
                     
                     with col1:
                         image_displayed = False
-                        if article.get('url'):
+                        if article.get('url') in image_futures or article.get('materialized_at'):
                             try:
-                                # Use the enhanced image extractor
-                                from enhanced_image_extractor import EnhancedImageExtractor
-                                extractor = EnhancedImageExtractor()
-                                
-                                # Try to get image from article URL
-                                image_url = extractor.extract_image(article['url'])
-                                
-                                # If no image found, try the RSS feed URL if available
-                                if not image_url and article.get('rss_feed_url'):
-                                    image_url = extractor.extract_image(article['rss_feed_url'], is_rss_feed=True)
+                                # Found by the feed materializer or the prefetch, or already known from the RSS feed
+                                image_url = (article.get('image_url') if article.get('materialized_at')
+                                             else image_futures[article['url']].result())
                                 
                                 # If we found an image, display it
                                 if image_url:
@@ -1037,9 +1082,9 @@ if user:
                         </div>
                         """, unsafe_allow_html=True)
                         
-                        # Enhanced content preview
-                        if article.get('content'):
-                            content = article['content']
+                        # Enhanced content preview (materialized cards only keep the start of the content)
+                        if article.get('content') or article.get('preview'):
+                            content = article.get('content') or article['preview']
                             preview = content[:300] + "..." if len(content) > 300 else content
                             st.markdown(f"""
                             <div class="content-preview">
@@ -1049,20 +1094,18 @@ if user:
                             """, unsafe_allow_html=True)
                         
                         # Add article summary and sentiment analysis in a single section
-                        if article.get('content'):
+                        if article.get('content') or article.get('materialized_at'):
                             try:
                                 with st.spinner("🤖 Analyzing article..."):
-                                    # Generate summary
-                                    from summarizer import generate_overall_summary
-                                    summary_article = [{
-                                        'summary': article['content'][:500],  # First 500 chars for summarization
-                                        'sentiment_score': 0  # Will be updated by sentiment analysis
-                                    }]
-                                    summary = generate_overall_summary(interest, summary_article)
-                                    
-                                    # Analyze sentiment
-                                    sentiment_result = analyze_sentiment(interest, article['content'])
-                                    sentiment_score = sentiment_result.get('sentiment_score', 0) if sentiment_result else 0
+                                    if article.get('materialized_at'):
+                                        # Analyzed when the feed was materialized
+                                        summary, sentiment_score = article.get('summary'), article.get('sentiment_score', 0)
+                                    else:
+                                        # Generate summary and analyze sentiment (cached across reruns)
+                                        summary, sentiment_result = app_cache.analyze_feed_article(
+                                            interest, article.get('url', ''), article['content'], title=article.get('title')
+                                        )
+                                        sentiment_score = float(sentiment_result['Score']) if sentiment_result else 0
                                     sentiment = "Positive" if sentiment_score > 0.1 else "Negative" if sentiment_score < -0.1 else "Neutral"
                                     
                                     # Determine sentiment color
@@ -1198,6 +1241,9 @@ if user:
         if not search_query:
             st.warning("Please specify a search target to proceed with analysis.")
             st.stop()
+        
+        # A new search starts on its first page
+        st.session_state.results_page = 1
 
         # Enhanced search status display
         status_container = st.container()
@@ -1210,12 +1256,44 @@ if user:
         with progress_container:
             progress_bar = st.progress(0)
 
+        # Prepare date range
+        start_date_str = start_date.strftime('%Y-%m-%d') if start_date else None
+        end_date_str = end_date.strftime('%Y-%m-%d') if end_date else None
+        
+        def article_display_date(article):
+            """Publish date as YYYY-MM-DD for grouping, or 'Unknown Date'."""
+            # Parse the date if available, otherwise use 'Unknown Date'
+            date_str = article.get('publish_date', 'Unknown Date')
+            if date_str != 'Unknown Date':
+                try:
+                    # Try to parse ISO 8601 format (e.g., 2023-08-10T16:45:00Z)
+                    if 'T' in date_str:
+                        date_obj = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+                        date_str = date_obj.strftime('%Y-%m-%d')
+                    elif ' ' in date_str:
+                        # Try to parse YYYY-MM-DD HH:MM:SS format
+                        date_obj = datetime.strptime(date_str.split()[0], '%Y-%m-%d')
+                        date_str = date_obj.strftime('%Y-%m-%d')
+                except (ValueError, AttributeError):
+                    date_str = 'Unknown Date'
+            return date_str
+        
+        # Skip dates outside the selected range
+        def in_date_range(date):
+            if start_date_str and end_date_str and date != 'Unknown Date':
+                try:
+                    article_date = datetime.strptime(date, '%Y-%m-%d').date()
+                    start_date_obj = datetime.strptime(start_date_str, '%Y-%m-%d').date()
+                    end_date_obj = datetime.strptime(end_date_str, '%Y-%m-%d').date()
+                    if article_date < start_date_obj or article_date > end_date_obj:
+                        return False
+                except (ValueError, TypeError):
+                    # If date parsing fails, include the article to be safe
+                    pass
+            return True
+        
         # Fetch news articles with enhanced progress updates
         try:
-            # Prepare date range
-            start_date_str = start_date.strftime('%Y-%m-%d') if start_date else None
-            end_date_str = end_date.strftime('%Y-%m-%d') if end_date else None
-            
             # Show professional date range info
             if start_date_str and end_date_str:
                 status_text.info(f"**📅 Analysis Configuration** | Period: {start_date_str} to {end_date_str} | Max Articles: {max_articles}")
@@ -1224,14 +1302,32 @@ if user:
             progress_bar.progress(20)
             status_text.info(f"**Enhanced Data Collection** | Processing RSS feeds for: {search_query}")
             
-            # Use the enhanced RSS fetcher
-            articles = get_news_about(
+            # Fetched articles are cached for a while, so repeating a search skips the feeds
+            fetched_articles = app_cache.fetch_news(
                 search_query, 
                 max_articles=max_articles,
                 start_date=start_date_str,
                 end_date=end_date_str
             )
             
+            # Newest first (undated last) and within the period: the order of the
+            # result pages, so the first page is the first to be enriched
+            fetched_articles = [a for a in fetched_articles if in_date_range(article_display_date(a))]
+            fetched_articles.sort(key=article_display_date, reverse=True)
+            fetched_articles.sort(key=lambda a: article_display_date(a) == 'Unknown Date')
+            
+            # Extraction, images, sentiment and the summary run as one pipeline
+            # in the background; the page renders its output as it arrives
+            pipeline = AnalysisPipeline(
+                search_query, 
+                max_articles=max_articles,
+                start_date=start_date_str,
+                end_date=end_date_str,
+                articles=fetched_articles,
+                page_size=RESULTS_PAGE_SIZE
+            ).start()
+            articles = pipeline.articles()
+            
             progress_bar.progress(60)
             status_text.info(f"**📊 Processing Results** | Found {len(articles)} articles")
             
@@ -1262,7 +1358,7 @@ if user:
         if not articles:
             st.error("**❌ No Results Found** | Please adjust search parameters or date range.")
         else:
-            # Log the search in the database with full article details
+            # Log the search; article details go to the shared article_analyses collection
             if user and '_id' in user:
                 try:
                     log_success = log_search(
@@ -1271,7 +1367,9 @@ if user:
                         results_count=len(articles),
                         articles=articles
                     )
-                    if not log_success:
+                    if log_success:
+                        app_cache.invalidate_search_history()
+                    else:
                         st.warning("Analysis completed successfully. Search history logging unavailable.")
                 except Exception as e:
                     st.error(f"**Logging Error**: {str(e)}")
@@ -1303,33 +1401,6 @@ if user:
                 </div>
                 """, unsafe_allow_html=True)
 
-            # Group articles by date
-            articles_by_date = {}
-            for article in articles:
-                # Parse the date if available, otherwise use 'Unknown Date'
-                date_str = article.get('publish_date', 'Unknown Date')
-                if date_str != 'Unknown Date':
-                    try:
-                        # Try to parse ISO 8601 format (e.g., 2023-08-10T16:45:00Z)
-                        if 'T' in date_str:
-                            date_obj = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                            date_str = date_obj.strftime('%Y-%m-%d')
-                        elif ' ' in date_str:
-                            # Try to parse YYYY-MM-DD HH:MM:SS format
-                            date_obj = datetime.strptime(date_str.split()[0], '%Y-%m-%d')
-                            date_str = date_obj.strftime('%Y-%m-%d')
-                    except (ValueError, AttributeError):
-                        date_str = 'Unknown Date'
-                
-                if date_str not in articles_by_date:
-                    articles_by_date[date_str] = []
-                articles_by_date[date_str].append(article)
-            
-            # Sort dates in descending order (newest first)
-            sorted_dates = sorted([d for d in articles_by_date.keys() if d != 'Unknown Date'], reverse=True)
-            if 'Unknown Date' in articles_by_date:
-                sorted_dates.append('Unknown Date')
-            
             # Enhanced section header
             st.markdown("""
             <div class="section-header">
@@ -1337,221 +1408,246 @@ if user:
             </div>
             """, unsafe_allow_html=True)
             
-            sentiment_results = []  # Store sentiment results for overall analysis
-            articles_with_sentiment = []  # Store articles with API-generated summaries and sentiment scores
-            
-            # Track processed articles for rate limiting
-            processed_articles = 0
-            
-            # Display articles grouped by date with enhanced styling
-            for date in sorted_dates:
-                # Skip if date filter is set and doesn't match
-                if start_date_str and end_date_str and date != 'Unknown Date':
+            def render_image(slot, article, image_url):
+                """Show the article's image, or a placeholder if none was found."""
+                if image_url:
                     try:
-                        article_date = datetime.strptime(date, '%Y-%m-%d').date()
-                        start_date_obj = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-                        end_date_obj = datetime.strptime(end_date_str, '%Y-%m-%d').date()
-                        if article_date < start_date_obj or article_date > end_date_obj:
-                            continue
-                    except (ValueError, TypeError):
-                        # If date parsing fails, include the article to be safe
-                        pass
+                        slot.image(
+                            image_url,
+                            width=250,
+                            use_container_width=True,
+                            caption=f"📸 Source: {article.get('source', 'Unknown')}",
+                            output_format='JPEG'
+                        )
+                        # Update the article to indicate it has an image
+                        article['image_url'] = image_url
+                        article['has_image'] = True
+                        return
+                    except Exception as e:
+                        logger.error(f"Error displaying image: {e}")
+                        article['has_image'] = False
                 
-                # Date section without image statistics
-                articles_in_date = articles_by_date[date]
+                # Show a placeholder if no image is available
+                slot.image(
+                    "https://via.placeholder.com/300x200?text=No+Image+Available",
+                    width=250,
+                    use_container_width=True,
+                    caption="No image available for this article"
+                )
+            
+            def render_sentiment(slot, article, date, sentiment_result):
+                """Render one article's sentiment block into its placeholder."""
+                if not sentiment_result:
+                    slot.error("❌ Failed to analyze sentiment for this article.")
+                    return
                 
-                st.markdown(f"""
-                <div class="date-section">
-                    📅 {date if date != 'Unknown Date' else 'Date Unknown'} • 
-                    {len(articles_in_date)} Articles
-                </div>
-                """, unsafe_allow_html=True)
+                # Enhanced sentiment display
+                sentiment_class = "positive" if float(sentiment_result['Score']) > 0 else "negative" if float(sentiment_result['Score']) < 0 else "neutral"
+                sentiment_icon = "🟢" if sentiment_class == "positive" else "🔴" if sentiment_class == "negative" else "🟡"
                 
-                with st.expander(f"View articles from {date if date != 'Unknown Date' else 'Unknown Date'}", expanded=True):
-                    for i, article in enumerate(articles_in_date):
-                        # Enhanced article processing with professional card styling
-                        st.markdown('<div class="article-card">', unsafe_allow_html=True)
-                        
-                        # Enhanced article header
+                with slot.container():
+                    st.markdown(f"""
+                    <div style="margin: 1rem 0;">
+                        <div class="sentiment-{sentiment_class}">
+                            {sentiment_icon} Sentiment: {sentiment_result['Sentiment']} | Score: {sentiment_result['Score']}
+                        </div>
+                    </div>
+                    """, unsafe_allow_html=True)
+                    if 'Relevance' in sentiment_result:
+                        st.caption(f"↓ Low relevance ({sentiment_result['Relevance']:.2f}): {search_query} is only "
+                                   f"mentioned in passing, scored locally without the LLM")
+                    elif sentiment_result.get('Engine') == 'lexicon':
+                        st.caption("⚡ Scored locally by the lexicon engine")
+                    
+                    # Enhanced summary and keywords
+                    keywords = sentiment_result['Keywords']
+                    if keywords:
+                        keywords_html = ' '.join([f'<span class="keyword-tag">🏷️ {keyword}</span>' for keyword in keywords])
                         st.markdown(f"""
-                        <div class="article-title">
-                            📄 {article.get('title', 'Untitled Article')}
+                        <div style="margin: 1rem 0;">
+                            <strong>Key Topics Identified:</strong><br>
+                            <div style="margin-top: 0.5rem;">{keywords_html}</div>
                         </div>
                         """, unsafe_allow_html=True)
+            
+            @st.fragment
+            def show_results_page():
+                """One page of result cards; switching pages reruns only this part."""
+                page_count = math.ceil(len(articles) / RESULTS_PAGE_SIZE)
+                page = 1
+                if page_count > 1:
+                    page = st.radio(
+                        "Results page",
+                        list(range(1, page_count + 1)),
+                        format_func=lambda p: f"Page {p}",
+                        horizontal=True,
+                        key="results_page"
+                    )
+                page_articles = articles[(page - 1) * RESULTS_PAGE_SIZE:page * RESULTS_PAGE_SIZE]
+                
+                # This page is enriched next; the others keep being prefetched in the background
+                pipeline.prioritize(article['url'] for article in page_articles if article.get('url'))
+                
+                # Image and sentiment placeholders per article URL, filled in as the pipeline delivers
+                image_slots = {}
+                sentiment_slots = {}
+                
+                # Group the page's articles by date (already newest first)
+                articles_by_date = {}
+                for article in page_articles:
+                    articles_by_date.setdefault(article_display_date(article), []).append(article)
+                
+                # Display articles grouped by date with enhanced styling
+                for date, articles_in_date in articles_by_date.items():
+                    # Date section without image statistics
+                    st.markdown(f"""
+                    <div class="date-section">
+                        📅 {date if date != 'Unknown Date' else 'Date Unknown'} • 
+                        {len(articles_in_date)} Articles
+                    </div>
+                    """, unsafe_allow_html=True)
+                
+                    with st.expander(f"View articles from {date if date != 'Unknown Date' else 'Unknown Date'}", expanded=True):
+                        for i, article in enumerate(articles_in_date):
+                            # Enhanced article processing with professional card styling
+                            st.markdown('<div class="article-card">', unsafe_allow_html=True)
                         
-                        # Create columns for enhanced layout
-                        col1, col2 = st.columns([1, 2])
+                            # Enhanced article header
+                            st.markdown(f"""
+                            <div class="article-title">
+                                📄 {article.get('title', 'Untitled Article')}
+                            </div>
+                            """, unsafe_allow_html=True)
                         
-                        # Enhanced image display with robust consent handling and retry logic
-                        with col1:
-                            image_displayed = False
-                            if article.get('url'):
+                            # Create columns for enhanced layout
+                            col1, col2 = st.columns([1, 2])
+                        
+                            # The image is found by the pipeline's image stage while the page renders
+                            with col1:
+                                image_slot = st.empty()
+                                if article.get('url'):
+                                    image_slot.info("🖼️ Loading image...")
+                                    image_slots[article['url']] = (image_slot, article)
+                                else:
+                                    render_image(image_slot, article, None)
+                        
+                            # Enhanced article details
+                            with col2:
+                                # Enhanced metadata with better error handling
                                 try:
-                                    # Use the enhanced image extractor
-                                    from enhanced_image_extractor import EnhancedImageExtractor
-                                    extractor = EnhancedImageExtractor()
-                                    
-                                    # Try to get image from article URL
-                                    image_url = extractor.extract_image(article['url'])
-                                    
-                                    # If no image found, try the RSS feed URL if available
-                                    if not image_url and article.get('rss_feed_url'):
-                                        image_url = extractor.extract_image(article['rss_feed_url'], is_rss_feed=True)
-                                    
-                                    # If we found an image, display it
-                                    if image_url:
+                                    # Format the publish date if available
+                                    publish_date = 'Unknown date'
+                                    if article.get('publish_date'):
                                         try:
-                                            st.image(
-                                                image_url,
-                                                width=250,
-                                                use_container_width=True,
-                                                caption=f"📸 Source: {article.get('source', 'Unknown')}",
-                                                output_format='JPEG'
-                                            )
-                                            # Update the article to indicate it has an image
-                                            article['image_url'] = image_url
-                                            article['has_image'] = True
-                                            image_displayed = True
+                                            if isinstance(article['publish_date'], (int, float)):
+                                                # Handle timestamp
+                                                publish_date = datetime.fromtimestamp(article['publish_date']).strftime('%Y-%m-%d %H:%M')
+                                            elif isinstance(article['publish_date'], str):
+                                                # Try to parse the date string
+                                                try:
+                                                    dt = datetime.fromisoformat(article['publish_date'].replace('Z', '+00:00'))
+                                                    publish_date = dt.strftime('%Y-%m-%d %H:%M')
+                                                except ValueError:
+                                                    publish_date = article['publish_date']
                                         except Exception as e:
-                                            logger.error(f"Error displaying image: {e}")
-                                            article['has_image'] = False
-                                    
-                                except Exception as e:
-                                    logger.error(f"Error extracting image: {e}")
-                            
-                            if not image_displayed:
-                                # Show a placeholder if no image is available
-                                st.image(
-                                    "https://via.placeholder.com/300x200?text=No+Image+Available",
-                                    width=250,
-                                    use_container_width=True,
-                                    caption="No image available for this article"
-                                )
-                        
-                        # Enhanced article details
-                        with col2:
-                            # Enhanced metadata with better error handling
-                            try:
-                                # Format the publish date if available
-                                publish_date = 'Unknown date'
-                                if article.get('publish_date'):
-                                    try:
-                                        if isinstance(article['publish_date'], (int, float)):
-                                            # Handle timestamp
-                                            publish_date = datetime.fromtimestamp(article['publish_date']).strftime('%Y-%m-%d %H:%M')
-                                        elif isinstance(article['publish_date'], str):
-                                            # Try to parse the date string
-                                            try:
-                                                dt = datetime.fromisoformat(article['publish_date'].replace('Z', '+00:00'))
-                                                publish_date = dt.strftime('%Y-%m-%d %H:%M')
-                                            except ValueError:
-                                                publish_date = article['publish_date']
-                                    except Exception as e:
-                                        logger.warning(f"Error formatting date {article.get('publish_date')}: {e}")
+                                            logger.warning(f"Error formatting date {article.get('publish_date')}: {e}")
                                 
-                                # Get source with fallback to domain
-                                source = article.get('source', '')
-                                if not source and 'url' in article:
-                                    try:
-                                        domain = urllib.parse.urlparse(article['url']).netloc
-                                        source = domain.replace('www.', '') if domain else 'Unknown source'
-                                    except Exception as e:
-                                        logger.warning(f"Error parsing URL for source: {e}")
+                                    # Get source with fallback to domain
+                                    source = article.get('source', '')
+                                    if not source and 'url' in article:
+                                        try:
+                                            domain = urllib.parse.urlparse(article['url']).netloc
+                                            source = domain.replace('www.', '') if domain else 'Unknown source'
+                                        except Exception as e:
+                                            logger.warning(f"Error parsing URL for source: {e}")
                                 
-                                st.markdown(f"""
-                                <div class="article-meta">
-                                    <strong>🏢 Source:</strong> <span class="article-source">{source or 'Unknown source'}</span><br>
-                                    <strong>📅 Published:</strong> {publish_date}<br>
-                                    <strong>🔗 URL:</strong> <a href="{article['url']}" target="_blank" rel="noopener noreferrer" style="color: #3b82f6;">View Original Article</a>
-                                    {f'<br><strong>✍️ Author:</strong> {article["author"]}' if article.get('author') and article['author'] != 'Unknown' else ''}
-                                </div>
-                                """, unsafe_allow_html=True)
+                                    st.markdown(f"""
+                                    <div class="article-meta">
+                                        <strong>🏢 Source:</strong> <span class="article-source">{source or 'Unknown source'}</span><br>
+                                        <strong>📅 Published:</strong> {publish_date}<br>
+                                        <strong>🔗 URL:</strong> <a href="{article['url']}" target="_blank" rel="noopener noreferrer" style="color: #3b82f6;">View Original Article</a>
+                                        {f'<br><strong>✍️ Author:</strong> {article["author"]}' if article.get('author') and article['author'] != 'Unknown' else ''}
+                                    </div>
+                                    """, unsafe_allow_html=True)
                                 
-                            except Exception as meta_error:
-                                logger.error(f"Error displaying article metadata: {meta_error}")
-                                st.markdown("""
-                                <div class="article-meta" style="color: #ef4444;">
-                                    ❌ Error loading article metadata
-                                </div>
-                                """, unsafe_allow_html=True)
+                                except Exception as meta_error:
+                                    logger.error(f"Error displaying article metadata: {meta_error}")
+                                    st.markdown("""
+                                    <div class="article-meta" style="color: #ef4444;">
+                                        ❌ Error loading article metadata
+                                    </div>
+                                    """, unsafe_allow_html=True)
                             
-                            # Enhanced content display
-                            content = article.get('content', 'No content available')
+                                # Enhanced content display
+                                content = article.get('content', 'No content available')
                             
-                            # Create expandable content section
-                            with st.expander("📖 Full Article Content", expanded=False):
+                                # Create expandable content section
+                                with st.expander("📖 Full Article Content", expanded=False):
+                                    st.markdown(f"""
+                                    <div class="content-full">
+                                        {content}
+                                    </div>
+                                    """, unsafe_allow_html=True)
+                            
+                                # Show enhanced preview
+                                preview = content[:400] + "..." if len(content) > 400 else content
                                 st.markdown(f"""
-                                <div class="content-full">
-                                    {content}
+                                <div class="content-preview">
+                                    <strong>📝 Content Preview:</strong><br>
+                                    <em>{preview}</em>
                                 </div>
                                 """, unsafe_allow_html=True)
-                            
-                            # Show enhanced preview
-                            preview = content[:400] + "..." if len(content) > 400 else content
-                            st.markdown(f"""
-                            <div class="content-preview">
-                                <strong>📝 Content Preview:</strong><br>
-                                <em>{preview}</em>
-                            </div>
-                            """, unsafe_allow_html=True)
                     
-                        # Enhanced sentiment analysis
+                            # Sentiment is filled in as the pipeline's sentiment stage delivers it
+                            if article.get('url'):
+                                sentiment_slot = st.empty()
+                                sentiment_slot.info("🤖 Analyzing sentiment with AI...")
+                                sentiment_slots[article['url']] = (sentiment_slot, article, date)
+                        
+                            st.markdown('</div>', unsafe_allow_html=True)  # Close article card
+                
+                # Fill images and sentiment in the order the pipeline finishes them
+                for kind, url, value in pipeline.results(set(image_slots) | set(sentiment_slots)):
+                    if kind == 'image' and url in image_slots:
+                        image_slot, article = image_slots.pop(url)
                         try:
-                            with st.spinner("🤖 Analyzing sentiment with AI..."):
-                                sentiment_result = analyze_sentiment(search_query, article['content'])
-                            
-                            if sentiment_result:
-                                # Enhanced sentiment display
-                                sentiment_class = "positive" if float(sentiment_result['Score']) > 0 else "negative" if float(sentiment_result['Score']) < 0 else "neutral"
-                                sentiment_icon = "🟢" if sentiment_class == "positive" else "🔴" if sentiment_class == "negative" else "🟡"
-                                
-                                st.markdown(f"""
-                                <div style="margin: 1rem 0;">
-                                    <div class="sentiment-{sentiment_class}">
-                                        {sentiment_icon} Sentiment: {sentiment_result['Sentiment']} | Score: {sentiment_result['Score']}
-                                    </div>
-                                </div>
-                                """, unsafe_allow_html=True)
-                                
-                                # Enhanced summary and keywords
-                                
-                                if sentiment_result['Keywords']:
-                                    keywords_html = ' '.join([f'<span class="keyword-tag">🏷️ {keyword}</span>' for keyword in sentiment_result['Keywords']])
-                                    st.markdown(f"""
-                                    <div style="margin: 1rem 0;">
-                                        <strong>Key Topics Identified:</strong><br>
-                                        <div style="margin-top: 0.5rem;">{keywords_html}</div>
-                                    </div>
-                                    """, unsafe_allow_html=True)
-                                
-                                # Store sentiment results for overall analysis
-                                sentiment_results.append(sentiment_result)
-                                
-                                # Store article with enhanced metadata
-                                articles_with_sentiment.append({
-                                    "summary": sentiment_result['Summary'],
-                                    "sentiment_score": float(sentiment_result['Score']),
-                                    "topics": sentiment_result['Keywords'],
-                                    "date": date,
-                                    "has_image": bool(article.get('image_url')),
-                                    "source": article.get('source', 'Unknown')
-                                })
-                                
-                                # Increment the processed articles counter
-                                processed_articles += 1
-                                
-                                # Add a small delay between API calls to avoid rate limits
-                                time.sleep(1.5)  # Reduced delay for better UX
-                                    
-                            else:
-                                st.error("❌ Failed to analyze sentiment for this article.")
+                            render_image(image_slot, article, value)
                         except Exception as e:
-                            st.error(f"**⚠️ Processing Error**: {str(e)}")
+                            logger.error(f"Error extracting image: {e}")
+                    elif kind == 'sentiment' and url in sentiment_slots:
+                        slot, article, date = sentiment_slots.pop(url)
+                        try:
+                            render_sentiment(slot, article, date, value)
+                        except Exception as e:
+                            slot.error(f"**⚠️ Processing Error**: {str(e)}")
                             logger.error(f"Sentiment analysis error: {str(e)}")
-                            continue  # Continue with the next article if there's an error
-                        
-                        st.markdown('</div>', unsafe_allow_html=True)  # Close article card
-
+                # Cards the pipeline never got to (e.g. it failed part way)
+                for image_slot, article in image_slots.values():
+                    render_image(image_slot, article, None)
+                for slot, article, date in sentiment_slots.values():
+                    render_sentiment(slot, article, date, None)
+            
+            show_results_page()
+            
+            # The summary starts once the first page is analyzed, from every analysis done by
+            # then; the overall figures cover the same articles while later pages keep enriching
+            summarized = set(pipeline.summary_articles())
+            for _ in pipeline.results(summarized):
+                pass
+            articles_with_sentiment = []  # Articles with API-generated summaries and sentiment scores
+            for article in articles:
+                sentiment_result = pipeline.sentiments.get(article.get('url'))
+                if sentiment_result and article['url'] in summarized:
+                    articles_with_sentiment.append({
+                        "url": article['url'],
+                        "summary": sentiment_result['Summary'],
+                        "sentiment_score": float(sentiment_result['Score']),
+                        "topics": sentiment_result['Keywords'],
+                        "date": article_display_date(article),
+                        "has_image": bool(pipeline.images.get(article['url'])),
+                        "source": article.get('source', 'Unknown')
+                    })
+            
             # Generate enhanced overall summary
             if articles_with_sentiment:
                 # Enhanced overall summary section
@@ -1574,16 +1670,56 @@ if user:
                     overall_score = sum(article['sentiment_score'] for article in valid_articles) / len(valid_articles)
                     overall_sentiment = "Positive" if overall_score > 0 else "Negative" if overall_score < 0 else "Neutral"
                     
-                    # Generate enhanced overall summary
-                    overall_summary = generate_overall_summary(search_query, valid_articles)
-                    if overall_summary:
+                    articles_with_images = sum(1 for article in valid_articles if article.get('has_image', False) or article.get('image_url'))
+                    unique_sources = len(set(article.get('source', 'Unknown') for article in valid_articles))
+                    
+                    def render_executive_summary(text):
                         # Enhanced summary container
-                        st.markdown(f"""
+                        summary_slot.markdown(f"""
                         <div class="executive-summary">
                             <h3>Intelligence Report for "{search_query}"</h3>
-                            <p>{overall_summary}</p>
+                            <p>{text}</p>
                         </div>
                         """, unsafe_allow_html=True)
+                    
+                    # Stream the overall summary onto the page; completed sentences
+                    # go to speech synthesis while the rest is still being written
+                    summary_slot = st.empty()
+                    summary_slot.info("🤖 Writing executive summary...")
+                    audio_stream = SentenceAudioStream(lang="en")
+                    audio_stream.add(
+                        f"Analysis Results for {search_query}. "
+                        f"Overall sentiment score is {overall_score:.2f}, indicating {overall_sentiment.lower()} coverage. "
+                        f"We analyzed {len(valid_articles)} articles from {unique_sources} different sources. "
+                        f"{articles_with_images} articles included images."
+                    )
+                    # The intro clip can play while the rest is still being synthesized
+                    preview_slot = st.empty()
+                    preview_shown = False
+                    splitter = SentenceSplitter()
+                    overall_summary = ""
+                    for piece in pipeline.summary():
+                        overall_summary += piece
+                        render_executive_summary(overall_summary + " ▌")
+                        for sentence in splitter.feed(piece):
+                            audio_stream.add(sentence)
+                        if not preview_shown:
+                            first_clip = audio_stream.first_chunk(timeout=0)
+                            if first_clip:
+                                preview_slot.audio(first_clip, format="audio/mp3")
+                                preview_shown = True
+                    for sentence in splitter.flush():
+                        audio_stream.add(sentence)
+                    overall_summary = overall_summary.strip()
+                    
+                    if overall_summary:
+                        render_executive_summary(overall_summary)
+                        
+                        # The audio is finished by a background worker; the page does not wait for it
+                        audio_job_id = audio_jobs.submit_stream(
+                            audio_stream, user=user.get('username') if user else None, query=search_query, lang="en"
+                        )
+                        preview_slot.empty()
                         
                         # Enhanced sentiment overview with more details
                         sentiment_color = "#10b981" if overall_score > 0 else "#ef4444" if overall_score < 0 else "#6b7280"
@@ -1618,6 +1754,7 @@ if user:
                         with col1:
                             # Enhanced pie chart
                             if any(sentiment_counts.values()):
+                                plt = get_pyplot()
                                 fig, ax = plt.subplots(figsize=(10, 8))
                                 
                                 # Professional color palette with enhanced styling
@@ -1662,9 +1799,6 @@ if user:
                         
                         with col2:
                             # Enhanced statistics with additional metrics
-                            articles_with_images = sum(1 for article in valid_articles if article.get('has_image', False) or article.get('image_url'))
-                            unique_sources = len(set(article.get('source', 'Unknown') for article in valid_articles))
-                            
                             st.markdown(f"""
                             <div class="statistics-section">
                                 <h4>📈 Enhanced Analytics</h4>
@@ -1696,24 +1830,17 @@ if user:
                             """, unsafe_allow_html=True)
                             
                             # Enhanced topics display
-                            if all('topics' in article for article in valid_articles):
-                                all_topics = [topic for article in valid_articles for topic in article.get('topics', [])]
-                                if all_topics:
-                                    topic_counts = {}
-                                    for topic in all_topics:
-                                        topic_counts[topic] = topic_counts.get(topic, 0) + 1
-                                    
-                                    # Enhanced topics display
-                                    topics_html = ""
-                                    for topic, count in sorted(topic_counts.items(), key=lambda x: x[1], reverse=True)[:5]:
-                                        topics_html += f'<div class="topic-item"><strong>🏷️ {topic}</strong> <span class="count">({count} mentions)</span></div>'
-                                    
-                                    st.markdown(f"""
-                                    <div class="topics-section">
-                                        <h4>Top Discussion Topics</h4>
-                                        {topics_html}
-                                    </div>
-                                    """, unsafe_allow_html=True)
+                            if pipeline.top_topics:
+                                topics_html = ""
+                                for topic, count in pipeline.top_topics:
+                                    topics_html += f'<div class="topic-item"><strong>🏷️ {topic}</strong> <span class="count">({count} articles)</span></div>'
+                                
+                                st.markdown(f"""
+                                <div class="topics-section">
+                                    <h4>Top Discussion Topics</h4>
+                                    {topics_html}
+                                </div>
+                                """, unsafe_allow_html=True)
                         
                         # Enhanced audio summary generation
                         try:
@@ -1723,36 +1850,35 @@ if user:
                             </div>
                             """, unsafe_allow_html=True)
                             
-                            with st.spinner("🤖 Generating enhanced audio summary..."):
-                                enhanced_summary_text = f"""
-                                Analysis Results for {search_query}:
-                                
-                                Overall sentiment score is {overall_score:.2f}, indicating {overall_sentiment.lower()} coverage.
-                                
-                                We analyzed {len(valid_articles)} articles from {unique_sources} different sources.
-                                {articles_with_images} articles included images.
-                                
-                                {overall_summary}
-                                """
-                                
-                                audio_file = asyncio.run(translate_and_generate_audio(
-                                    enhanced_summary_text,
-                                    "en"  # Force English language
-                                ))
-                                if audio_file and os.path.exists(audio_file):
+                            @st.fragment(run_every=audio_jobs.POLL_SECONDS)
+                            def show_audio_job(job_id):
+                                """Placeholder that reruns on its own until the background audio job is done."""
+                                job = audio_jobs.get_job(job_id)
+                                if job and job['status'] == 'done' and os.path.exists(job['path']):
                                     st.markdown("""
                                     <div class="audio-summary">
                                         <h4>🎧 Enhanced Executive Summary Audio</h4>
                                         <p>Listen to the comprehensive analysis results</p>
                                     </div>
                                     """, unsafe_allow_html=True)
-                                    st.audio(audio_file, format="audio/mp3")
+                                    st.audio(job['path'], format="audio/mp3")
+                                elif job and job['status'] in ('queued', 'running'):
+                                    st.info("🤖 Generating enhanced audio summary... it will appear here when ready.")
+                                    # Most sentences were synthesized while the summary streamed
+                                    first_clip = audio_stream.first_chunk(timeout=0)
+                                    if first_clip:
+                                        st.audio(first_clip, format="audio/mp3")
                                 else:
                                     st.warning("🔇 Audio summary generation currently unavailable.")
+                            
+                            show_audio_job(audio_job_id)
                         except Exception as e:
                             st.warning(f"🔇 Audio summary unavailable: {str(e)}")
                             logger.error(f"Audio generation error: {str(e)}")
                     else:
+                        audio_stream.cancel()
+                        preview_slot.empty()
+                        summary_slot.empty()
                         st.warning("⚠️ Unable to generate comprehensive summary.")
 
     # Add logout button at the bottom
@@ -0,0 +1,177 @@
+import logging
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import streamlit as st
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+# How long cached data is served before it is loaded again (seconds)
+NEWS_TTL = 15 * 60
+ANALYSIS_TTL = 60 * 60
+ADMIN_TTL = 60
+FEED_TTL = 5 * 60
+
+# Entries kept per cached function
+MAX_ENTRIES = 500
+
+
+# ----- resources: one per process, shared by every session and rerun -----
+
+@st.cache_resource(show_spinner=False)
+def get_mongo_client():
+    """MongoDB client (models' shared client; indexes are created on the first call)."""
+    from models import get_client
+    return get_client()
+
+
+@st.cache_resource(show_spinner=False)
+def get_llm_client():
+    """Synchronous LLM client shared with llm_client.complete."""
+    from llm_client import get_client
+    return get_client()
+
+
+@st.cache_resource(show_spinner=False)
+def get_http_session():
+    """Pooled HTTP session used for article extraction."""
+    from news_fetcher3 import get_http_session
+    return get_http_session()
+
+
+@st.cache_resource(show_spinner=False)
+def get_image_extractor():
+    """Image extractor shared by the image prefetch workers."""
+    from enhanced_image_extractor import get_extractor
+    return get_extractor()
+
+
+@st.cache_resource(show_spinner=False)
+def start_feed_materializer() -> bool:
+    """Background job keeping users' Personalized Feeds materialized (see feed_materializer)."""
+    from feed_materializer import start_scheduler
+    return start_scheduler()
+
+
+def warm_resources() -> None:
+    """Create the shared clients once per process, so the first search does not wait for them."""
+    for resource in (get_mongo_client, get_http_session, get_image_extractor, get_llm_client, start_feed_materializer):
+        try:
+            resource()
+        except Exception as e:
+            # Not cached, so the next rerun tries again
+            logger.warning(f"Could not create {resource.__name__}: {e}")
+
+
+# ----- data: results of loads and analyses, copied out to each rerun -----
+
+@st.cache_data(ttl=NEWS_TTL, max_entries=MAX_ENTRIES, show_spinner=False)
+def fetch_news(query: str, max_articles: int, start_date: Optional[str], end_date: Optional[str]) -> List[Dict[str, Any]]:
+    """news_fetcher3.get_news_about; cleared by invalidate_news when the feed list changes."""
+    from news_fetcher3 import get_news_about
+    return get_news_about(query, max_articles=max_articles, start_date=start_date, end_date=end_date)
+
+
+@st.cache_data(ttl=NEWS_TTL, max_entries=MAX_ENTRIES, show_spinner=False)
+def fetch_domain_news(domains: Tuple[str, ...], max_articles: int, start_date: Optional[str], end_date: Optional[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """news_fetcher3.get_news_for_domains: one feed crawl for all of a user's interests."""
+    from news_fetcher3 import get_news_for_domains
+    return get_news_for_domains(list(domains), max_articles=max_articles, start_date=start_date, end_date=end_date)
+
+
+@st.cache_data(ttl=ANALYSIS_TTL, max_entries=MAX_ENTRIES, show_spinner=False)
+def analyze_feed_article(interest: str, url: str, content: str, title: Optional[str] = None) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """
+    Short summary and sentiment for a personalized feed card.
+
+    Returns:
+        Tuple of the summary (None if it failed) and the analyze_sentiment result
+    """
+    from summarizer import summarize_article
+    from sentiment_analysis import analyze_sentiment
+    summary = summarize_article(interest, {
+        'url': url,
+        'title': title or '',
+        'summary': content[:500],  # First 500 chars for summarization
+        'sentiment_score': 0  # Will be updated by sentiment analysis
+    })
+    return summary, analyze_sentiment(interest, content, title=title)
+
+
+@st.cache_data(ttl=FEED_TTL, max_entries=MAX_ENTRIES, show_spinner=False)
+def load_user_feed(user_id: str) -> Optional[Dict[str, Any]]:
+    """feed_materializer.get_user_feed: the user's precomputed Personalized Feed, one document."""
+    from feed_materializer import get_user_feed
+    return get_user_feed(user_id)
+
+
+@st.cache_data(ttl=ADMIN_TTL, show_spinner=False)
+def load_users() -> List[Dict[str, Any]]:
+    """All users without their password hashes."""
+    from models import users_collection
+    return list(users_collection.find({}, {"password": 0}))  # Exclude passwords
+
+
+@st.cache_data(ttl=ADMIN_TTL, show_spinner=False)
+def load_search_history(start_date: date, end_date: date) -> List[Dict[str, Any]]:
+    """Searches logged between the two dates (inclusive), newest first."""
+    from models import search_history_collection
+    return list(search_history_collection.find({
+        "timestamp": {
+            "$gte": datetime.combine(start_date, datetime.min.time()),
+            "$lte": datetime.combine(end_date, datetime.max.time())
+        }
+    }).sort("timestamp", -1))
+
+
+@st.cache_data(ttl=ADMIN_TTL, show_spinner=False)
+def load_rss_feeds() -> List[Dict[str, Any]]:
+    """Every configured RSS feed, active or not."""
+    from models import get_rss_feeds
+    return get_rss_feeds(active_only=False)
+
+
+@st.cache_data(ttl=ADMIN_TTL, show_spinner=False)
+def load_database_stats() -> Dict[str, Any]:
+    """User and search counts and the database data size in MB."""
+    from models import DB_NAME
+    db = get_mongo_client()[DB_NAME]
+    return {
+        'users': db.users.count_documents({}),
+        'searches': db.search_history.count_documents({}),
+        'size_mb': db.command('dbstats')['dataSize'] / (1024 * 1024)
+    }
+
+
+# ----- invalidation hooks -----
+
+def invalidate_news() -> None:
+    """After RSS feeds are added, edited or removed: fetched articles may differ."""
+    fetch_news.clear()
+    fetch_domain_news.clear()
+    load_rss_feeds.clear()
+    logger.info("Cleared cached news and feed list")
+
+
+def invalidate_users() -> None:
+    """After users are created, edited or deleted."""
+    load_users.clear()
+    load_database_stats.clear()
+
+
+def invalidate_search_history() -> None:
+    """After searches are logged or deleted."""
+    load_search_history.clear()
+    load_database_stats.clear()
+
+
+def invalidate_all() -> None:
+    """Drop all cached data; resources stay."""
+    st.cache_data.clear()
+    logger.info("Cleared all cached data")
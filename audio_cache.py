@@ -0,0 +1,166 @@
+import os
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Any
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+# Synthesized MP3s, one file per (text, language, voice) under its content hash.
+# Files are never modified once written, and eviction spares files used within
+# EVICTION_GRACE_SECONDS, so a path handed out stays readable for at least that
+# long, also by several sessions at the same time.
+AUDIO_CACHE_DIR = Path("./cache/audio")
+
+# Least recently used files are deleted once the store grows past this size
+AUDIO_CACHE_MAX_BYTES = int(os.getenv("AUDIO_CACHE_MAX_MB", "200")) * 1024 * 1024
+
+# Files looked up or written this recently are never evicted; the store may
+# exceed its size limit until they age past it
+EVICTION_GRACE_SECONDS = 10 * 60
+
+_lock = threading.Lock()
+# key -> (size in bytes, last use); built from the directory on first use
+_index: Optional[Dict[str, list]] = None
+_stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'bytes_served': 0}
+
+
+def audio_key(text: str, lang: str, **voice: Any) -> str:
+    """
+    Content hash identifying one synthesized clip.
+
+    Args:
+        text: Text exactly as it is synthesized
+        lang: Language code
+        **voice: Engine and voice settings (e.g. engine='gtts', slow=False, tld='com')
+
+    Returns:
+        str: Hex digest of the text, language and settings
+    """
+    settings = "|".join(f"{name}={voice[name]}" for name in sorted(voice))
+    return hashlib.sha256(f"{lang}|{settings}|{text}".encode('utf-8')).hexdigest()
+
+
+def _path(key: str) -> Path:
+    return AUDIO_CACHE_DIR / f"{key}.mp3"
+
+
+def _load_index() -> Dict[str, list]:
+    """Sizes and access times of the files on disk. Caller must hold the lock."""
+    global _index
+    if _index is None:
+        _index = {}
+        if AUDIO_CACHE_DIR.exists():
+            for path in AUDIO_CACHE_DIR.glob("*.mp3"):
+                try:
+                    stat = path.stat()
+                    _index[path.stem] = [stat.st_size, stat.st_mtime]
+                except OSError:
+                    continue
+    return _index
+
+
+def _evict(index: Dict[str, list]) -> None:
+    """Delete least recently used files until the store fits. Caller must hold the lock."""
+    total = sum(size for size, _ in index.values())
+    grace_start = time.time() - EVICTION_GRACE_SECONDS
+    for key in sorted(index, key=lambda k: index[k][1]):
+        if total <= AUDIO_CACHE_MAX_BYTES or index[key][1] > grace_start:
+            # Sorted by last use: every file after this one was used recently too
+            break
+        size, _ = index.pop(key)
+        total -= size
+        _stats['evictions'] += 1
+        try:
+            _path(key).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not evict cached audio {key}: {e}")
+
+
+def get_path(key: str) -> Optional[Path]:
+    """Path of a cached clip, or None. Counts as a use for eviction."""
+    path = _path(key)
+    with _lock:
+        index = _load_index()
+        if key not in index or not path.exists():
+            index.pop(key, None)
+            _stats['misses'] += 1
+            return None
+        now = time.time()
+        index[key][1] = now
+        _stats['hits'] += 1
+        _stats['bytes_served'] += index[key][0]
+    try:
+        os.utime(path, (now, now))
+    except OSError:
+        pass
+    return path
+
+
+def get_bytes(key: str) -> Optional[bytes]:
+    """Cached clip as bytes, or None."""
+    path = get_path(key)
+    if path is None:
+        return None
+    try:
+        return path.read_bytes()
+    except OSError:
+        # Evicted by another process between the lookup and the read
+        return None
+
+
+def put(key: str, data: bytes) -> Optional[Path]:
+    """
+    Store a clip and evict old ones if the store is over its size limit.
+
+    The file is written under a temporary name and renamed into place, so
+    readers never see a partial clip.
+
+    Returns:
+        Path: Location of the stored clip
+        None: If the write failed
+    """
+    path = _path(key)
+    try:
+        AUDIO_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_file = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, path)
+    except Exception as e:
+        logger.warning(f"Error writing cached audio {path}: {e}")
+        return None
+    with _lock:
+        index = _load_index()
+        index[key] = [len(data), time.time()]
+        _evict(index)
+    return path
+
+
+def get_audio_cache_stats() -> Dict[str, Any]:
+    """
+    Size and hit rate of the audio store since server start.
+
+    Returns:
+        Dict[str, Any]: entries, bytes, max_bytes, hits, misses, hit_rate,
+        evictions and bytes_served
+    """
+    with _lock:
+        index = _load_index()
+        stats = dict(_stats)
+        stats['entries'] = len(index)
+        stats['bytes'] = sum(size for size, _ in index.values())
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+    stats['max_bytes'] = AUDIO_CACHE_MAX_BYTES
+    return stats
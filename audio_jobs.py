@@ -0,0 +1,147 @@
+import os
+import time
+import uuid
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+# Audio jobs running at the same time across all sessions of this process
+AUDIO_JOB_WORKERS = int(os.getenv("AUDIO_JOB_WORKERS", "2"))
+
+# Finished jobs kept for status lookups and the admin page
+MAX_JOBS = 500
+
+# How often a page showing a pending job checks on it (seconds)
+POLL_SECONDS = 2
+
+STATUSES = ("queued", "running", "done", "failed")
+
+_lock = threading.Lock()
+_jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Worker pool, started with the first job. Caller must hold the lock."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=AUDIO_JOB_WORKERS, thread_name_prefix="audio-job")
+    return _executor
+
+
+def _run(job_id: str, work: Callable[[], Optional[str]]) -> None:
+    with _lock:
+        job = _jobs[job_id]
+        job['status'] = 'running'
+        job['started_at'] = time.time()
+    try:
+        path, error = work(), None
+        if path is None:
+            error = "audio generation returned no file"
+    except Exception as e:
+        path, error = None, str(e)
+
+    with _lock:
+        job['finished_at'] = time.time()
+        job['path'] = path
+        job['error'] = error
+        job['status'] = 'failed' if error else 'done'
+    log = logger.warning if error else logger.info
+    log(f"Audio job {job_id} {job['status']} after {job['finished_at'] - job['started_at']:.2f}s "
+        f"(waited {job['started_at'] - job['submitted_at']:.2f}s){': ' + error if error else ''}")
+
+
+def submit(work: Callable[[], Optional[str]], user: Optional[str] = None, **info: Any) -> str:
+    """
+    Run an audio generation job in the background worker pool.
+
+    Args:
+        work: Callable that produces the audio and returns its path (None on failure)
+        user: User the job belongs to, for the admin page
+        **info: Extra details to record with the job (e.g. query, lang, chars)
+
+    Returns:
+        str: Job id for get_job
+    """
+    job_id = uuid.uuid4().hex
+    with _lock:
+        _jobs[job_id] = {
+            'id': job_id,
+            'user': user,
+            'status': 'queued',
+            'submitted_at': time.time(),
+            'started_at': None,
+            'finished_at': None,
+            'path': None,
+            'error': None,
+            **info
+        }
+        # Forget the oldest finished jobs
+        while len(_jobs) > MAX_JOBS:
+            oldest = next((key for key, job in _jobs.items() if job['status'] in ('done', 'failed')), None)
+            if oldest is None:
+                break
+            del _jobs[oldest]
+        _get_executor().submit(_run, job_id, work)
+    return job_id
+
+
+def submit_stream(stream, user: Optional[str] = None, **info: Any) -> str:
+    """Finish a tts.SentenceAudioStream in the background; its sentences keep synthesizing meanwhile."""
+    return submit(stream.finish, user=user, **info)
+
+
+def submit_text(text: str, lang: str = "en", user: Optional[str] = None, **info: Any) -> str:
+    """Translate (if needed) and synthesize text in the background; see tts.translate_and_generate_audio."""
+    from tts import translate_and_generate_audio
+    return submit(lambda: asyncio.run(translate_and_generate_audio(text, lang)),
+                  user=user, lang=lang, chars=len(text), **info)
+
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Status of a job.
+
+    Returns:
+        Dict with 'status' (queued, running, done or failed), 'path' once done,
+        'error' if failed, the timestamps and the details given on submit;
+        None for an unknown (or long forgotten) job id
+    """
+    with _lock:
+        job = _jobs.get(job_id)
+        return dict(job) if job else None
+
+
+def get_job_stats(recent: int = 20) -> Dict[str, Any]:
+    """
+    Job counts per status, average queue wait and run time, and the latest jobs.
+
+    Returns:
+        Dict[str, Any]: 'counts' per status, 'avg_wait' and 'avg_run' (seconds,
+        over finished jobs) and 'recent' (newest first, with 'wait' and 'run')
+    """
+    with _lock:
+        jobs = [dict(job) for job in _jobs.values()]
+
+    finished = [job for job in jobs if job['finished_at']]
+    for job in jobs:
+        job['wait'] = (job['started_at'] or time.time()) - job['submitted_at']
+        job['run'] = (job['finished_at'] or time.time()) - job['started_at'] if job['started_at'] else None
+
+    return {
+        'counts': {status: sum(job['status'] == status for job in jobs) for status in STATUSES},
+        'avg_wait': sum(job['wait'] for job in finished) / len(finished) if finished else 0.0,
+        'avg_run': sum(job['run'] for job in finished) / len(finished) if finished else 0.0,
+        'recent': list(reversed(jobs))[:recent]
+    }
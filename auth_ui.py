@@ -1,5 +1,6 @@
 import streamlit as st
 from models import verify_user, create_user, get_user, AVAILABLE_DOMAINS
+from app_cache import invalidate_users
 from datetime import datetime
 
 def show_login_form():
@@ -90,6 +91,7 @@ def show_register_form():
             )
             
             if user_id:
+                invalidate_users()
                 st.success("Registration successful! Please log in.")
                 return True
             else:
@@ -0,0 +1,119 @@
+"""
+Tokens-saved benchmark for entity-focused pre-summarization.
+
+Compares, per article of a recorded corpus, the text sent to the LLM by plain
+truncation (first MAX_ARTICLE_LENGTH characters) with the entity-focused
+extract, and reports tokens per article and how many of the sentences that
+mention the entity each version keeps.
+
+The corpus uses the same JSON Lines format as benchmark_lexicon_sentiment.py
+({"entity": ..., "content": ...} per line; other fields are ignored).
+
+Usage:
+    python benchmark_entity_focus.py --corpus corpus.jsonl
+    python benchmark_entity_focus.py --from-history 500 --budget 300
+"""
+import sys
+import json
+import time
+import argparse
+import logging
+from typing import Dict, List
+
+import numpy as np
+
+import entity_focus
+from sentiment_analysis import truncate_article
+from benchmark_lexicon_sentiment import load_corpus, history_corpus
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def mention_coverage(entity: str, full_text: str, sent_text: str) -> float:
+    """Share of the article's entity-mentioning sentences that made it into sent_text."""
+    pattern = entity_focus.entity_pattern(entity)
+    if not pattern:
+        return 0.0
+    mentions = [s for s in entity_focus.split_sentences(full_text) if pattern.search(s)]
+    if not mentions:
+        return 0.0
+    return sum(1 for s in mentions if s in sent_text) / len(mentions)
+
+
+def run(records: List[Dict], budget: int) -> Dict:
+    baseline_tokens, focused_tokens, baseline_coverage, focused_coverage = [], [], [], []
+    fallbacks = 0
+
+    started = time.perf_counter()
+    for record in records:
+        entity, content = record['entity'], record.get('content') or ''
+        baseline = truncate_article(content)
+        focused = entity_focus.focus_article(entity, content, budget)
+        if focused is None:
+            fallbacks += 1
+            focused = baseline
+
+        baseline_tokens.append(entity_focus.estimate_tokens(baseline))
+        focused_tokens.append(entity_focus.estimate_tokens(focused))
+        baseline_coverage.append(mention_coverage(entity, content, baseline))
+        focused_coverage.append(mention_coverage(entity, content, focused))
+    elapsed = time.perf_counter() - started
+
+    baseline_tokens, focused_tokens = np.array(baseline_tokens), np.array(focused_tokens)
+    saved = baseline_tokens - focused_tokens
+    return {
+        'articles': len(records),
+        'budget': budget,
+        'baseline_tokens_per_article': float(baseline_tokens.mean()),
+        'focused_tokens_per_article': float(focused_tokens.mean()),
+        'tokens_saved_per_article': float(saved.mean()),
+        'tokens_saved_p50': float(np.percentile(saved, 50)),
+        'tokens_saved_p90': float(np.percentile(saved, 90)),
+        'tokens_saved_pct': float(saved.sum() / baseline_tokens.sum()) if baseline_tokens.sum() else 0.0,
+        'baseline_mention_coverage': float(np.mean(baseline_coverage)),
+        'focused_mention_coverage': float(np.mean(focused_coverage)),
+        'fallbacks': fallbacks,
+        'ms_per_article': elapsed * 1000 / len(records)
+    }
+
+
+def print_report(report: Dict) -> None:
+    print(f"\n{'='*60}")
+    print(f"Entity focus on {report['articles']} articles (budget {report['budget']} tokens)")
+    print("="*60)
+    print(f"{'':28}{'truncation':>12}{'focused':>12}")
+    print(f"{'Tokens per article':28}{report['baseline_tokens_per_article']:>12.0f}"
+          f"{report['focused_tokens_per_article']:>12.0f}")
+    print(f"{'Entity sentences kept':28}{report['baseline_mention_coverage']:>12.1%}"
+          f"{report['focused_mention_coverage']:>12.1%}")
+    print(f"\nTokens saved per article: {report['tokens_saved_per_article']:.0f} "
+          f"(p50 {report['tokens_saved_p50']:.0f}, p90 {report['tokens_saved_p90']:.0f}, "
+          f"{report['tokens_saved_pct']:.1%} overall)")
+    print(f"Fell back to truncation:  {report['fallbacks']} articles without an entity mention")
+    print(f"Cost:                     {report['ms_per_article']:.2f} ms per article")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--corpus", help="JSON Lines corpus file")
+    source.add_argument("--from-history", type=int, metavar="N", help="Use up to N articles from search history")
+    parser.add_argument("--budget", type=int, default=entity_focus.FOCUS_TOKENS, help="Token budget per article")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    records = load_corpus(args.corpus) if args.corpus else history_corpus(args.from_history)
+    if not records:
+        print("No articles found")
+        sys.exit(1)
+
+    report = run(records, args.budget)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
@@ -0,0 +1,149 @@
+"""
+Import-time benchmark for the modules the Streamlit app loads.
+
+Imports each module in a fresh interpreter with `python -X importtime`, from
+an empty working directory and with outbound connections refused, and
+reports per module:
+
+- cumulative import time and the slowest imports underneath it (self time)
+- files or directories created during the import (disk I/O)
+- network connections attempted during the import
+
+The exit status is 1 when a module exceeds the budget or does any I/O at
+import, so the script can guard against startup regressions.
+
+Usage:
+    python benchmark_import_time.py
+    python benchmark_import_time.py --budget-ms 800 --top 5 models tts
+"""
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, List
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# What app.py and the admin page import from this repo
+MODULES = ["models", "auth_ui", "llm_client", "llm_scheduler", "news_fetcher3",
+           "sentiment_analysis", "keyword_engine", "summarizer", "tts", "analysis_pipeline",
+           "feed_materializer"]
+
+DEFAULT_BUDGET_MS = 750
+
+# Runs before the measured import: record and refuse every outbound connection
+PRELUDE = """
+import sys, json, socket
+sys.path.insert(0, {repo!r})
+attempts = []
+def _refuse(self, address):
+    attempts.append(repr(address))
+    raise ConnectionRefusedError("network disabled during import benchmark")
+socket.socket.connect = _refuse
+socket.socket.connect_ex = lambda self, address: _refuse(self, address)
+try:
+    import {module}
+finally:
+    sys.stderr.write("@@network " + json.dumps(attempts) + "\\n")
+"""
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """Rows of `-X importtime` output as dicts with self_us, cumulative_us and name."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append({'self_us': int(self_us), 'cumulative_us': int(cumulative_us),
+                     'name': name.rstrip(), 'depth': (len(name) - len(name.lstrip()) - 1) // 2})
+    return rows
+
+
+def measure(module: str, timeout: float) -> Dict:
+    workdir = tempfile.mkdtemp(prefix="importtime-")
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", PRELUDE.format(repo=REPO_DIR, module=module)],
+            cwd=workdir, env=env, capture_output=True, text=True, timeout=timeout
+        )
+        created = sorted(os.path.relpath(os.path.join(root, name), workdir)
+                         for root, dirs, files in os.walk(workdir) for name in dirs + files)
+        stderr, timed_out = proc.stderr, False
+    except subprocess.TimeoutExpired as e:
+        stderr, created, timed_out = (e.stderr or b"").decode(errors="replace"), [], True
+        proc = None
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    rows = parse_importtime(stderr)
+    own = next((r for r in rows if r['name'].strip() == module and r['depth'] == 0), None)
+    network = next((json.loads(line[len("@@network "):]) for line in stderr.splitlines()
+                    if line.startswith("@@network ")), [])
+    # Everything imported under the module (rows before it, up to the previous top-level import)
+    index = rows.index(own) if own else len(rows)
+    start = index
+    while start > 0 and rows[start - 1]['depth'] > 0:
+        start -= 1
+    slowest = sorted(rows[start:index + 1], key=lambda r: r['self_us'], reverse=True)
+
+    error = None
+    if timed_out:
+        error = f"timed out after {timeout:.0f}s"
+    elif proc.returncode != 0:
+        # Last line of the traceback, without the (often long) details
+        error = [line for line in stderr.splitlines() if not line.startswith(("import time:", "@@network"))][-1]
+        error = error.split(":")[0] if len(error) > 60 else error
+
+    return {
+        'module': module,
+        'import_ms': own['cumulative_us'] / 1000 if own else None,
+        'slowest': [(r['name'].strip(), r['self_us'] / 1000) for r in slowest],
+        'files_created': created,
+        'connections': network,
+        'error': error
+    }
+
+
+def print_report(results: List[Dict], budget_ms: float, top: int) -> None:
+    print(f"\n{'='*72}")
+    print(f"Import time per module (fresh interpreter, budget {budget_ms:.0f} ms)")
+    print("="*72)
+    print(f"{'Module':22}{'Import ms':>12}{'Files':>8}{'Conns':>8}  Status")
+    for r in results:
+        ms = f"{r['import_ms']:.0f}" if r['import_ms'] is not None else "-"
+        status = r['error'] or ("over budget" if r['import_ms'] is None or r['import_ms'] > budget_ms else "ok")
+        print(f"{r['module']:22}{ms:>12}{len(r['files_created']):>8}{len(r['connections']):>8}  {status}")
+
+    for r in results:
+        print(f"\n{r['module']}: slowest imports (self time)")
+        for name, ms in r['slowest'][:top]:
+            print(f"  {ms:8.1f} ms  {name}")
+        for path in r['files_created']:
+            print(f"  created  {path}")
+        for address in sorted(set(r['connections'])):
+            print(f"  connect  {address} ({r['connections'].count(address)} attempts)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=MODULES, help="Modules to import (default: the app's modules)")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="Import time budget per module")
+    parser.add_argument("--top", type=int, default=5, help="Slowest imports to list per module")
+    parser.add_argument("--timeout", type=float, default=90, help="Seconds before an import is given up on")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    results = [measure(module, args.timeout) for module in args.modules]
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results, args.budget_ms, args.top)
+
+    failed = [r for r in results
+              if r['error'] or r['files_created'] or r['connections'] or (r['import_ms'] or 0) > args.budget_ms]
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,189 @@
+"""
+Agreement benchmark: lexicon sentiment engine vs. stored LLM results.
+
+The corpus is a JSON Lines file with one article per line:
+
+    {"entity": "Tesla", "content": "...", "result": {"Score": 0.4, "Sentiment": "Positive", ...}}
+
+"result" is optional; when it is missing the LLM result is looked up in the
+sentiment cache by (entity, content hash), so any article the app has analyzed
+can be benchmarked. --from-history builds the corpus from logged searches
+instead of a file.
+
+Usage:
+    python benchmark_lexicon_sentiment.py --corpus corpus.jsonl
+    python benchmark_lexicon_sentiment.py --from-history 500 --save corpus.jsonl
+"""
+import sys
+import json
+import time
+import argparse
+import logging
+from typing import Dict, List
+
+import numpy as np
+
+import sentiment_cache
+import lexicon_sentiment
+from sentiment_analysis import CACHE_VERSION, prepare_article
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+LABELS = ["Negative", "Neutral", "Positive"]
+
+THRESHOLDS = [0.5, 0.6, 0.7, 0.8, 0.9]
+
+
+def load_corpus(path: str) -> List[Dict]:
+    """Read a JSON Lines corpus of {'entity', 'content'[, 'result']} records."""
+    records = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                records.append(json.loads(line))
+    return records
+
+
+def history_corpus(limit: int) -> List[Dict]:
+    """Build a corpus from the articles of logged searches (shared analyses first, then old embedded copies)."""
+    from models import article_analyses_collection, search_history_collection
+    records = []
+    cursor = article_analyses_collection.find({"content": {"$nin": ["", None]}},
+                                              {"entity": 1, "content": 1}).sort("updated_at", -1).limit(limit)
+    for analysis in cursor:
+        records.append({"entity": analysis['entity'], "content": analysis['content']})
+    if len(records) >= limit:
+        return records
+
+    cursor = search_history_collection.find({"entity": {"$exists": False}},
+                                            {"query": 1, "articles.content": 1}).sort("timestamp", -1)
+    for search in cursor:
+        for article in search.get('articles', []):
+            if article.get('content'):
+                records.append({"entity": search['query'], "content": article['content']})
+                if len(records) >= limit:
+                    return records
+    return records
+
+
+def attach_llm_results(records: List[Dict]) -> List[Dict]:
+    """Fill in missing 'result' fields from the sentiment cache; drop records without one."""
+    missing = [r for r in records if not r.get('result')]
+    keys = {
+        id(r): sentiment_cache.make_cache_key(r['entity'], prepare_article(r['entity'], r['content']), CACHE_VERSION)
+        for r in missing
+    }
+    # Read the backend directly so the benchmark does not count as cache hits
+    found = sentiment_cache.get_backend().get_many(keys.values()) if keys else {}
+    for record in missing:
+        entry = found.get(keys[id(record)])
+        if entry:
+            record['result'] = entry['result']
+    return [r for r in records if r.get('result')]
+
+
+def run(records: List[Dict]) -> Dict:
+    """Score every record with the lexicon engine and compare with the LLM result."""
+    started = time.perf_counter()
+    # Group by entity so each entity is one vectorized batch
+    by_entity: Dict[str, List[int]] = {}
+    for i, record in enumerate(records):
+        by_entity.setdefault(record['entity'], []).append(i)
+    predictions = [None] * len(records)
+    for entity, indexes in by_entity.items():
+        batch = lexicon_sentiment.analyze_lexicon_batch(entity, {i: records[i]['content'] for i in indexes})
+        for i in indexes:
+            predictions[i] = batch[i]
+    elapsed = time.perf_counter() - started
+
+    llm_labels = np.array([LABELS.index(r['result']['Sentiment']) if r['result']['Sentiment'] in LABELS else 1
+                           for r in records])
+    lex_labels = np.array([LABELS.index(p['Sentiment']) for p in predictions])
+    llm_scores = np.array([float(r['result']['Score']) for r in records])
+    lex_scores = np.array([p['Score'] for p in predictions])
+    confidence = np.array([p['Confidence'] for p in predictions])
+
+    confusion = np.zeros((3, 3), dtype=int)
+    np.add.at(confusion, (llm_labels, lex_labels), 1)
+
+    # Cohen's kappa corrects raw agreement for agreement expected by chance
+    total = confusion.sum()
+    observed = np.trace(confusion) / total
+    expected = (confusion.sum(axis=0) * confusion.sum(axis=1)).sum() / total ** 2
+    kappa = (observed - expected) / (1 - expected) if expected < 1 else 1.0
+
+    tiers = []
+    for threshold in THRESHOLDS:
+        answered = confidence >= threshold
+        tiers.append({
+            'threshold': threshold,
+            'coverage': float(answered.mean()),
+            'agreement': float((lex_labels[answered] == llm_labels[answered]).mean()) if answered.any() else None
+        })
+
+    return {
+        'articles': len(records),
+        'agreement': float(observed),
+        'kappa': float(kappa),
+        'score_mae': float(np.abs(lex_scores - llm_scores).mean()),
+        'score_correlation': float(np.corrcoef(lex_scores, llm_scores)[0, 1]) if len(records) > 1 else None,
+        'confusion': confusion.tolist(),
+        'tiers': tiers,
+        'articles_per_second': len(records) / elapsed if elapsed else None
+    }
+
+
+def print_report(report: Dict) -> None:
+    print(f"\n{'='*60}")
+    print(f"Lexicon vs LLM sentiment on {report['articles']} articles")
+    print("="*60)
+    print(f"Label agreement:   {report['agreement']:.1%}")
+    print(f"Cohen's kappa:     {report['kappa']:.3f}")
+    print(f"Score MAE:         {report['score_mae']:.3f}")
+    if report['score_correlation'] is not None:
+        print(f"Score correlation: {report['score_correlation']:.3f}")
+    print(f"Throughput:        {report['articles_per_second']:.0f} articles/s")
+
+    print("\nConfusion (rows = LLM, columns = lexicon):")
+    print(" " * 10 + "".join(f"{label:>10}" for label in LABELS))
+    for label, row in zip(LABELS, report['confusion']):
+        print(f"{label:>10}" + "".join(f"{count:>10}" for count in row))
+
+    print("\nTier-1 pass (articles at or above the confidence threshold skip the LLM):")
+    print(f"{'threshold':>10}{'coverage':>10}{'agreement':>11}")
+    for tier in report['tiers']:
+        agreement = f"{tier['agreement']:.1%}" if tier['agreement'] is not None else "-"
+        print(f"{tier['threshold']:>10.2f}{tier['coverage']:>10.1%}{agreement:>11}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--corpus", help="JSON Lines corpus file")
+    source.add_argument("--from-history", type=int, metavar="N", help="Use up to N articles from search history")
+    parser.add_argument("--save", help="Write the corpus (with LLM results) to this JSON Lines file")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    records = load_corpus(args.corpus) if args.corpus else history_corpus(args.from_history)
+    records = attach_llm_results(records)
+    if not records:
+        print("No articles with stored LLM results found")
+        sys.exit(1)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    report = run(records)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
@@ -0,0 +1,179 @@
+"""
+Load-time benchmark for the Personalized Feed's news fetch.
+
+Builds the feed for the first 1, 5 and all 13 AVAILABLE_DOMAINS as interests,
+two ways, on a cold cache:
+
+- per-domain: get_news_about once per interest, one after another, as the
+              feed page used to (every interest crawls every feed again)
+- shared:     get_news_for_domains, one concurrent crawl matched against all
+              interests, with the union of matched pages extracted concurrently
+
+Feeds and article pages are generated offline and served by stubs that wait a
+fixed latency per request like a remote site would; NewsAPI and MongoDB are not
+contacted and the app's RSS cache directory is left alone. Per run: feed and
+page requests made, articles found and seconds until the feed is ready. The
+shared crawl must return the same articles per interest as the per-domain loop.
+
+Usage:
+    python benchmark_personalized_feed.py
+    python benchmark_personalized_feed.py --feeds 40 --feed-latency 0.1 --page-latency 0.2 --json
+"""
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List
+
+import feedparser
+
+import news_fetcher
+import news_fetcher3
+from models import AVAILABLE_DOMAINS
+
+VERBS = ["outlook improves", "faces new questions", "sees record demand", "draws fresh investment",
+         "braces for changes", "reports a surprise", "gets a new rulebook", "moves into focus"]
+
+
+class StubWeb:
+    """Synthetic feeds and article pages with a fixed latency per request."""
+
+    def __init__(self, n_feeds: int, entries_per_feed: int, feed_latency: float, page_latency: float, seed: int):
+        rng = random.Random(seed)
+        now = time.time()
+        self.feed_latency = feed_latency
+        self.page_latency = page_latency
+        self.feed_requests = 0
+        self.page_requests = 0
+        self._lock = threading.Lock()
+        self.feeds = {}
+        for f in range(n_feeds):
+            feed_url = f"https://feeds{f}.example.com/rss"
+            entries = []
+            for e in range(entries_per_feed):
+                # Most entries are about one or two of the domains, some about none
+                topics = rng.sample(AVAILABLE_DOMAINS, rng.choice([0, 1, 1, 1, 2]))
+                title = f"{' and '.join(topics) or 'Local'} {rng.choice(VERBS)}"
+                # Short descriptions make the fetcher extract the page
+                description = f"{title}. " + ("Full story inside. " * rng.choice([1, 1, 15]))
+                entries.append(feedparser.FeedParserDict({
+                    'title': title,
+                    'link': f"https://feeds{f}.example.com/story/{e}",
+                    'description': description,
+                    'author': f"Reporter {rng.randint(1, 50)}",
+                    'published_parsed': time.gmtime(now - rng.uniform(0, 6 * 24 * 3600))
+                }))
+            self.feeds[feed_url] = feedparser.FeedParserDict({
+                'feed': feedparser.FeedParserDict({'title': f"Example Feed {f}"}),
+                'entries': entries
+            })
+
+    def parse(self, feed_url, **kwargs):
+        with self._lock:
+            self.feed_requests += 1
+        time.sleep(self.feed_latency)
+        return self.feeds[feed_url]
+
+    def extract_article_content(self, url: str) -> Dict[str, str]:
+        with self._lock:
+            self.page_requests += 1
+        time.sleep(self.page_latency)
+        return {'content': f"Full text of {url}. " * 20, 'image_url': f"{url}/lead.jpg"}
+
+
+def per_domain(domains: List[str], max_articles: int) -> Dict[str, List[Dict]]:
+    return {domain: news_fetcher3.get_news_about(domain, max_articles=max_articles) for domain in domains}
+
+
+def shared(domains: List[str], max_articles: int) -> Dict[str, List[Dict]]:
+    return news_fetcher3.get_news_for_domains(domains, max_articles=max_articles)
+
+
+def run_once(web: StubWeb, fetch, domains: List[str], max_articles: int) -> Dict:
+    feed_requests, page_requests = web.feed_requests, web.page_requests
+    with tempfile.TemporaryDirectory() as tmp:
+        news_fetcher3.CACHE_DIR = Path(tmp)  # Cold cache for every run
+        start = time.perf_counter()
+        results = fetch(domains, max_articles)
+        elapsed = time.perf_counter() - start
+    return {
+        'seconds': elapsed,
+        'feed_requests': web.feed_requests - feed_requests,
+        'page_requests': web.page_requests - page_requests,
+        'articles': sum(len(articles) for articles in results.values()),
+        'urls': {domain: [article['url'] for article in articles] for domain, articles in results.items()}
+    }
+
+
+def run(interest_counts: List[int], n_feeds: int, entries_per_feed: int, feed_latency: float,
+        page_latency: float, max_articles: int, seed: int) -> Dict:
+    web = StubWeb(n_feeds, entries_per_feed, feed_latency, page_latency, seed)
+    news_fetcher3.feedparser.parse = web.parse
+    news_fetcher3.extract_article_content = web.extract_article_content
+    news_fetcher3.get_active_rss_feeds = lambda: list(web.feeds)
+    news_fetcher3.get_rss_feeds_collection = lambda: news_fetcher3.DummyMongoClient()
+    news_fetcher.fetch_news = lambda query, num_articles=10: []
+
+    rows = []
+    for count in interest_counts:
+        domains = AVAILABLE_DOMAINS[:count]
+        before = run_once(web, per_domain, domains, max_articles)
+        after = run_once(web, shared, domains, max_articles)
+        rows.append({
+            'interests': len(domains),
+            'per_domain': {key: value for key, value in before.items() if key != 'urls'},
+            'shared': {key: value for key, value in after.items() if key != 'urls'},
+            'speedup': before['seconds'] / after['seconds'] if after['seconds'] else float('inf'),
+            'same_articles': before['urls'] == after['urls']
+        })
+
+    return {
+        'feeds': n_feeds,
+        'entries_per_feed': entries_per_feed,
+        'feed_latency': feed_latency,
+        'page_latency': page_latency,
+        'workers': {'feeds': news_fetcher3.FEED_FETCH_WORKERS, 'extract': news_fetcher3.ARTICLE_EXTRACT_WORKERS},
+        'rows': rows
+    }
+
+
+def print_report(report: Dict) -> None:
+    print(f"\n{'='*78}")
+    print(f"Personalized Feed over {report['feeds']} feeds x {report['entries_per_feed']} entries "
+          f"({report['feed_latency']:.2f}s per feed, {report['page_latency']:.2f}s per page; "
+          f"{report['workers']['feeds']}/{report['workers']['extract']} workers)")
+    print("="*78)
+    print(f"{'Interests':>9}  {'Mode':11}{'Feeds':>7}{'Pages':>7}{'Articles':>10}{'Seconds':>9}{'Speedup':>9}  Same")
+    for row in report['rows']:
+        for mode in ('per_domain', 'shared'):
+            r = row[mode]
+            speedup = f"{row['speedup']:>8.1f}x" if mode == 'shared' else ''
+            same = ('yes' if row['same_articles'] else 'NO') if mode == 'shared' else ''
+            print(f"{row['interests'] if mode == 'per_domain' else '':>9}  {mode:11}{r['feed_requests']:>7}"
+                  f"{r['page_requests']:>7}{r['articles']:>10}{r['seconds']:>9.2f}{speedup:>9}  {same}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interests", type=int, nargs="+", default=[1, 5, len(AVAILABLE_DOMAINS)],
+                        help="Interest counts to measure (first N of AVAILABLE_DOMAINS)")
+    parser.add_argument("--feeds", type=int, default=20, help="Active RSS feeds")
+    parser.add_argument("--entries", type=int, default=20, help="Entries per feed")
+    parser.add_argument("--feed-latency", type=float, default=0.05, help="Stub latency per feed download (s)")
+    parser.add_argument("--page-latency", type=float, default=0.05, help="Stub latency per article page (s)")
+    parser.add_argument("--max-articles", type=int, default=20, help="Articles per interest, as the feed page asks")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for the generated feeds")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    report = run(args.interests, args.feeds, args.entries, args.feed_latency, args.page_latency,
+                 args.max_articles, args.seed)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    sys.exit(0 if all(row['same_articles'] for row in report['rows']) else 1)
@@ -0,0 +1,124 @@
+"""
+Throughput benchmark for the translation layer in tts.py.
+
+Translates generated executive summaries (the app's spoken intro plus a few
+summary sentences) with the offline stub translator, which waits a fixed
+latency per request like a remote service would. Three passes are reported:
+
+- cold:    empty sentence cache
+- repeat:  the same summaries again
+- new:     different summaries for other companies; only the boilerplate repeats
+
+Per pass: requests sent, sentences translated, cache hit rate and summaries
+per second. Nothing touches the network or the app's translation cache file.
+
+Usage:
+    python benchmark_translation.py
+    python benchmark_translation.py --summaries 50 --latency 0.3 --lang fr --json
+"""
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+import tts
+import tts_backends
+from entity_focus import split_sentences
+
+COMPANIES = ["Tesla", "Reliance Industries", "Infosys", "Apple", "Tata Motors", "Microsoft", "HDFC Bank",
+             "Amazon", "Adani Group", "Nvidia", "Wipro", "Alphabet"]
+
+EVENTS = ["reported record quarterly profits", "announced a new factory", "faced a regulatory probe",
+          "cut its full-year outlook", "signed a major partnership", "replaced its chief executive",
+          "launched a new product line", "settled a long-running lawsuit", "raised prices across markets"]
+
+
+def make_summary(rng: random.Random, company: str) -> str:
+    """Executive summary text as the app sends it to speech synthesis."""
+    score = rng.uniform(-1, 1)
+    label = "positive" if score > 0.1 else "negative" if score < -0.1 else "neutral"
+    intro = (f"Analysis Results for {company}. "
+             f"Overall sentiment score is {score:.2f}, indicating {label} coverage. "
+             f"We analyzed {rng.randint(5, 40)} articles from {rng.randint(2, 12)} different sources. "
+             f"{rng.randint(0, 20)} articles included images. ")
+    body = " ".join(f"{company} {event}." for event in rng.sample(EVENTS, 4))
+    return intro + body + " Analysts expect more volatility in the coming weeks."
+
+
+async def run_pass(summaries: List[str], lang: str, backend) -> Dict:
+    calls, sentences = backend.calls, backend.sentences
+    before = tts.get_translation_stats()
+    start = time.perf_counter()
+    results = await asyncio.gather(*(tts.translate(summary, lang) for summary in summaries))
+    elapsed = time.perf_counter() - start
+    after = tts.get_translation_stats()
+    hits, misses = after['hits'] - before['hits'], after['misses'] - before['misses']
+    return {
+        'summaries': len(summaries),
+        'failed': sum(result is None for result in results),
+        'requests': backend.calls - calls,
+        'sentences_translated': backend.sentences - sentences,
+        'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+        'seconds': elapsed,
+        'summaries_per_second': len(summaries) / elapsed if elapsed else float('inf')
+    }
+
+
+def run(n_summaries: int, latency: float, lang: str, seed: int) -> Dict:
+    rng = random.Random(seed)
+    first = [make_summary(rng, rng.choice(COMPANIES)) for _ in range(n_summaries)]
+    other = [make_summary(rng, rng.choice(COMPANIES)) for _ in range(n_summaries)]
+    sentence_count = sum(len(split_sentences(summary)) for summary in first)
+
+    backend = tts_backends.StubTranslateBackend(latency=latency)
+    tts_backends.set_translate_backend(backend)
+    with tempfile.TemporaryDirectory() as tmp:
+        tts.TRANSLATION_CACHE_FILE = Path(tmp) / "translations.json"
+        passes = {}
+        for name, summaries in (("cold", first), ("repeat", first), ("new", other)):
+            passes[name] = asyncio.run(run_pass(summaries, lang, backend))
+        tts.flush_translations()
+    tts_backends.set_translate_backend(None)
+
+    return {
+        'lang': lang,
+        'latency': latency,
+        'sentences_per_summary': sentence_count / n_summaries if n_summaries else 0.0,
+        # Translating each summary whole, as before, costs one request per summary
+        'uncached_requests': n_summaries,
+        'passes': passes
+    }
+
+
+def print_report(report: Dict) -> None:
+    print(f"\n{'='*72}")
+    print(f"Translation to '{report['lang']}' with {report['latency']:.2f}s stub latency per request "
+          f"({report['sentences_per_summary']:.1f} sentences per summary)")
+    print("="*72)
+    print(f"{'Pass':10}{'Summaries':>11}{'Requests':>10}{'Translated':>12}{'Hit rate':>10}{'Seconds':>9}{'Per s':>9}")
+    for name, p in report['passes'].items():
+        print(f"{name:10}{p['summaries']:>11}{p['requests']:>10}{p['sentences_translated']:>12}"
+              f"{p['hit_rate']:>10.0%}{p['seconds']:>9.2f}{p['summaries_per_second']:>9.1f}")
+    print(f"\nWithout the sentence cache every pass sends {report['uncached_requests']} requests.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--summaries", type=int, default=30, help="Summaries per pass")
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub translator latency per request (s)")
+    parser.add_argument("--lang", default="hi", help="Target language code")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for the generated summaries")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    report = run(args.summaries, args.latency, args.lang, args.seed)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    sys.exit(0 if all(p['failed'] == 0 for p in report['passes'].values()) else 1)
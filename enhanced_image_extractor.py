@@ -2,10 +2,14 @@ import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 import feedparser
 from datetime import datetime, timedelta
 import os
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 
 # Configure logging
 logging.basicConfig(
@@ -15,6 +19,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Image lookups running at the same time; also the size of the shared session's connection pool
+IMAGE_PREFETCH_WORKERS = int(os.getenv("IMAGE_PREFETCH_WORKERS", "8"))
+
+# Article URLs whose image (or lack of one) is remembered, and for how long (seconds)
+IMAGE_CACHE_SIZE = 2000
+IMAGE_CACHE_TTL = 6 * 3600
+
 class EnhancedImageExtractor:
     """
     Enhanced image extractor that handles both RSS feeds and direct article URLs
@@ -42,6 +53,12 @@ class EnhancedImageExtractor:
         }
         
         session.headers.update(headers)
+        
+        # One session is shared by all prefetch workers
+        adapter = requests.adapters.HTTPAdapter(pool_connections=IMAGE_PREFETCH_WORKERS,
+                                                pool_maxsize=IMAGE_PREFETCH_WORKERS)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
         return session
     
     def extract_image(self, url: str, is_rss_feed: bool = False) -> Optional[str]:
@@ -222,16 +239,82 @@ class EnhancedImageExtractor:
                 return True
                 
             # If HEAD fails, try GET with stream to only download headers
-            response = self.session.get(url, stream=True, timeout=10)
-            if response.status_code == 200 and 'image/' in response.headers.get('content-type', ''):
-                return True
-                
-            return False
+            # (closed right away so the connection goes back to the shared pool)
+            with self.session.get(url, stream=True, timeout=10) as response:
+                return response.status_code == 200 and 'image/' in response.headers.get('content-type', '')
             
         except Exception as e:
             logger.debug(f"Error checking image accessibility for {url}: {e}")
             return False
 
+_extractor: Optional[EnhancedImageExtractor] = None
+_lock = threading.Lock()
+_cache: "OrderedDict[str, Tuple[float, Optional[str]]]" = OrderedDict()
+_executor: Optional[ThreadPoolExecutor] = None
+
+def get_extractor() -> EnhancedImageExtractor:
+    """The extractor shared by the whole process, created on first use."""
+    global _extractor
+    with _lock:
+        if _extractor is None:
+            _extractor = EnhancedImageExtractor()
+        return _extractor
+
+def find_image(article: Dict[str, Any]) -> Optional[str]:
+    """
+    Image for an article card.
+    
+    The image found by the news fetcher is used as is; only articles without
+    one are looked up, on the article page and then its RSS feed. Lookups are
+    cached by article URL, including the ones that found nothing.
+    
+    Args:
+        article: Article with 'url' and optionally 'image_url' and 'rss_feed_url'
+        
+    Returns:
+        Optional[str]: Image URL, or None if the article has no usable image
+    """
+    if article.get('image_url'):
+        return article['image_url']
+    url = article.get('url')
+    if not url:
+        return None
+    
+    with _lock:
+        cached = _cache.get(url)
+        if cached and time.time() - cached[0] < IMAGE_CACHE_TTL:
+            _cache.move_to_end(url)
+            return cached[1]
+    
+    extractor = get_extractor()
+    image_url = extractor.extract_image(url)
+    if not image_url and article.get('rss_feed_url'):
+        image_url = extractor.extract_image(article['rss_feed_url'], is_rss_feed=True)
+    
+    with _lock:
+        _cache[url] = (time.time(), image_url)
+        _cache.move_to_end(url)
+        while len(_cache) > IMAGE_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return image_url
+
+def prefetch_images(articles: List[Dict[str, Any]]) -> Dict[str, Future]:
+    """
+    Start image lookups for a whole result set on the shared worker pool.
+    
+    Cards can be laid out while the lookups run; each card then only waits
+    for its own image, if it is not ready yet.
+    
+    Returns:
+        Dict[str, Future]: Article URL to a future of find_image's result
+    """
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=IMAGE_PREFETCH_WORKERS, thread_name_prefix="image")
+        executor = _executor
+    return {article['url']: executor.submit(find_image, article) for article in articles if article.get('url')}
+
 def test_extractor():
     """Test the EnhancedImageExtractor with example URLs."""
     extractor = EnhancedImageExtractor()
@@ -0,0 +1,121 @@
+import os
+import re
+import logging
+from functools import lru_cache
+from typing import List, Optional, Pattern, Tuple
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+# Token budget for the text sent to the LLM per article
+FOCUS_TOKENS = int(os.getenv("SENTIMENT_FOCUS_TOKENS", "350"))
+
+# Same rough estimate sentiment_analysis uses for batch packing
+CHARS_PER_TOKEN = 4
+
+# Score of a sentence that mentions the entity, and how fast the score of its
+# neighbours decays with distance (0.5 -> next sentence scores 0.5, then 0.25...)
+MENTION_SCORE = 1.0
+PROXIMITY_DECAY = 0.5
+PROXIMITY_WINDOW = 2
+
+# The lead usually states what the article is about, so keep it if it fits
+LEAD_SCORE = 0.6
+
+# Marker between sentences that were not adjacent in the article
+GAP = " [...] "
+
+# Sentence ends, except after an initial ("E. Musk") so name variants stay intact
+SENTENCE_PATTERN = re.compile(r'(?<=[.!?])(?<!\b[A-Z]\.)\s+|\n+')
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+@lru_cache(maxsize=256)
+def entity_pattern(entity: str) -> Optional[Pattern]:
+    """Compiled regex matching the entity and its name variants (cached per entity)."""
+    from news_fetcher3 import create_name_pattern
+    pattern, _ = create_name_pattern(entity)
+    return pattern
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in SENTENCE_PATTERN.split(text or '') if s and s.strip()]
+
+
+def score_sentences(entity: str, sentences: List[str]) -> Tuple[List[float], int]:
+    """
+    Score sentences by entity mention and proximity to a mention.
+
+    Returns:
+        Tuple of (score per sentence, number of sentences mentioning the entity)
+    """
+    pattern = entity_pattern(entity)
+    mentions = [i for i, s in enumerate(sentences) if pattern and pattern.search(s)]
+
+    scores = [0.0] * len(sentences)
+    for i in mentions:
+        for distance in range(-PROXIMITY_WINDOW, PROXIMITY_WINDOW + 1):
+            j = i + distance
+            if 0 <= j < len(sentences):
+                scores[j] = max(scores[j], MENTION_SCORE * PROXIMITY_DECAY ** abs(distance))
+    if sentences:
+        scores[0] = max(scores[0], LEAD_SCORE)
+    return scores, len(mentions)
+
+
+def focus_article(entity: str, content: str, max_tokens: int = FOCUS_TOKENS) -> Optional[str]:
+    """
+    Reduce an article to the sentences that matter for an entity.
+
+    Sentences are scored by whether they mention the entity (any variant from
+    create_name_pattern) and by their distance to the nearest mention. The
+    highest-scoring sentences are kept, in article order, until the token
+    budget is reached.
+
+    Args:
+        entity: Company or person the analysis is about
+        content: Full article text
+        max_tokens: Token budget for the result
+
+    Returns:
+        Optional[str]: The focused text, the content unchanged if it already
+        fits the budget, or None if the entity is never mentioned (callers
+        fall back to plain truncation)
+    """
+    content = content or ''
+    if estimate_tokens(content) <= max_tokens:
+        return content
+
+    sentences = split_sentences(content)
+    scores, mention_count = score_sentences(entity, sentences)
+    if not mention_count:
+        return None
+
+    # Best sentences first; earlier sentences win ties
+    ranked = sorted(range(len(sentences)), key=lambda i: (-scores[i], i))
+    selected, used = [], 0
+    for i in ranked:
+        if scores[i] <= 0:
+            break
+        cost = estimate_tokens(sentences[i]) + 1
+        if used + cost > max_tokens:
+            continue
+        selected.append(i)
+        used += cost
+
+    if not selected:
+        return None
+
+    selected.sort()
+    parts = [sentences[selected[0]]]
+    for previous, current in zip(selected, selected[1:]):
+        parts.append((' ' if current == previous + 1 else GAP) + sentences[current])
+    return ''.join(parts)
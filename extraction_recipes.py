@@ -0,0 +1,209 @@
+import os
+import json
+import time
+import atexit
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Any
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+# Recipes are stored next to the other caches so they survive restarts
+RECIPE_FILE = Path("./cache/extraction_recipes.json")
+
+# Every Nth page from a host ignores its recipe and runs the full scan,
+# so a publisher redesign is picked up even if the old selector still matches
+REVALIDATE_EVERY = 20
+
+# Write the file at most every N pages, recipe changes included (flushed at exit too)
+FLUSH_EVERY = 10
+
+# Parts of an extraction that a recipe remembers
+COMPONENTS = ('content', 'image', 'date')
+
+_lock = threading.Lock()
+_state: Optional[Dict[str, Any]] = None
+_pending_writes = 0
+
+
+def _empty_state() -> Dict[str, Any]:
+    return {
+        'hosts': {},
+        'stats': {
+            'pages': 0,
+            'revalidations': 0,
+            'relearned': 0,
+            'attempts_saved': 0,
+            **{component: {'hits': 0, 'misses': 0} for component in COMPONENTS}
+        }
+    }
+
+
+def _load() -> Dict[str, Any]:
+    """Load recipes from disk once per process. Caller must hold the lock."""
+    global _state
+    if _state is not None:
+        return _state
+
+    _state = _empty_state()
+    if RECIPE_FILE.exists():
+        try:
+            with open(RECIPE_FILE, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            _state['hosts'].update(data.get('hosts', {}))
+            for key, value in data.get('stats', {}).items():
+                if isinstance(value, dict):
+                    _state['stats'].setdefault(key, {}).update(value)
+                else:
+                    _state['stats'][key] = value
+        except Exception as e:
+            logger.warning(f"Error reading recipe file {RECIPE_FILE}: {e}")
+    return _state
+
+
+def _save() -> None:
+    """Write recipes to disk atomically. Caller must hold the lock."""
+    global _pending_writes
+    if _state is None:
+        return
+    try:
+        RECIPE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = RECIPE_FILE.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(_state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, RECIPE_FILE)
+        _pending_writes = 0
+    except Exception as e:
+        logger.warning(f"Error writing recipe file {RECIPE_FILE}: {e}")
+
+
+def flush() -> None:
+    """Persist any recipe updates that have not been written yet."""
+    with _lock:
+        if _pending_writes:
+            _save()
+
+
+atexit.register(flush)
+
+
+def normalize_host(url_or_host: str) -> str:
+    """Reduce a URL or netloc to the host a recipe is stored under."""
+    host = url_or_host
+    if '://' in host:
+        host = host.split('://', 1)[1]
+    host = host.split('/', 1)[0].split(':', 1)[0].lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def get_recipe(host: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the extraction recipe for a host.
+
+    Args:
+        host: Host name or URL of the page being extracted
+
+    Returns:
+        Optional[Dict[str, Any]]: Copy of the recipe with 'content', 'image' and
+        'date' strategies plus a 'revalidate' flag, or None if the host is new
+    """
+    host = normalize_host(host)
+    with _lock:
+        recipe = _load()['hosts'].get(host)
+        if not recipe:
+            return None
+        recipe = dict(recipe)
+    recipe['revalidate'] = recipe.get('uses', 0) % REVALIDATE_EVERY == REVALIDATE_EVERY - 1
+    return recipe
+
+
+def record_extraction(host: str, recipe: Optional[Dict[str, Any]], winners: Dict[str, Optional[str]],
+                      attempts: Dict[str, int], baseline_attempts: Dict[str, int]) -> None:
+    """
+    Record what worked for a page and update the host's recipe.
+
+    Args:
+        host: Host name or URL of the extracted page
+        recipe: The recipe that was applied (as returned by get_recipe), or None
+        winners: Winning strategy per component, None if nothing matched
+        attempts: Number of attempts actually made per component
+        baseline_attempts: Number of attempts the default order needs per component
+    """
+    global _pending_writes
+    host = normalize_host(host)
+
+    with _lock:
+        state = _load()
+        stats = state['stats']
+        stats['pages'] += 1
+
+        previous = state['hosts'].get(host, {})
+
+        if recipe and recipe.get('revalidate'):
+            stats['revalidations'] += 1
+            if any(winners.get(c) and winners.get(c) != previous.get(c) for c in COMPONENTS):
+                stats['relearned'] += 1
+                logger.info(f"Relearned extraction recipe for {host}: {winners}")
+        elif recipe:
+            for component in COMPONENTS:
+                if not recipe.get(component):
+                    continue
+                won = winners.get(component) == recipe[component]
+                stats[component]['hits' if won else 'misses'] += 1
+                # Without a winner there is no baseline to compare the attempts with
+                if winners.get(component) and component in baseline_attempts and component in attempts:
+                    stats['attempts_saved'] += baseline_attempts[component] - attempts[component]
+
+        updated = dict(previous)
+        for component in COMPONENTS:
+            if winners.get(component) and winners[component] != previous.get(component):
+                updated[component] = winners[component]
+        updated['uses'] = previous.get('uses', 0) + 1
+        updated['updated_at'] = time.time()
+        state['hosts'][host] = updated
+
+        _pending_writes += 1
+        if _pending_writes >= FLUSH_EVERY:
+            _save()
+
+
+def get_recipe_stats() -> Dict[str, Any]:
+    """
+    Get counters describing how well the learned recipes perform.
+
+    Returns:
+        Dict[str, Any]: Number of hosts and pages, hit rate per component,
+        overall hit rate, revalidations and selector attempts saved
+    """
+    with _lock:
+        state = _load()
+        stats = json.loads(json.dumps(state['stats']))
+        hosts = len(state['hosts'])
+
+    hits = sum(stats[c]['hits'] for c in COMPONENTS)
+    misses = sum(stats[c]['misses'] for c in COMPONENTS)
+    for component in COMPONENTS:
+        total = stats[component]['hits'] + stats[component]['misses']
+        stats[component]['hit_rate'] = stats[component]['hits'] / total if total else 0.0
+
+    stats['hosts'] = hosts
+    stats['hit_rate'] = hits / (hits + misses) if hits + misses else 0.0
+    return stats
+
+
+def reset_recipes(host: Optional[str] = None) -> None:
+    """Forget the recipe for one host, or all recipes and counters."""
+    global _state
+    with _lock:
+        if host is None:
+            _state = _empty_state()
+        else:
+            _load()['hosts'].pop(normalize_host(host), None)
+        _save()
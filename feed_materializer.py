@@ -0,0 +1,315 @@
+import os
+import json
+import time
+import socket
+import logging
+import argparse
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from pymongo import UpdateOne
+
+import llm_scheduler
+from models import canonical_url, acquire_lease
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+# Minutes between materializations started by the app; 0 leaves it to `python feed_materializer.py --every N`
+FEED_REFRESH_MINUTES = float(os.getenv("FEED_REFRESH_MINUTES", "30"))
+
+# Articles fetched per interest on each run, as the live feed page fetches them
+FETCH_ARTICLES = 20
+
+# Articles kept per interest in each materialized feed, newest first
+MAX_FEED_ARTICLES = 50
+
+# Fields stored for each card; the extracted article body is cut down to a preview
+CARD_FIELDS = ('title', 'url', 'source', 'author', 'publish_date', 'domain', 'image_url', 'has_image',
+               'sentiment', 'sentiment_score', 'summary', 'materialized_at')
+PREVIEW_CHARS = 500
+
+# Card summaries requested at the same time; each is one LLM call at background priority
+SUMMARY_WORKERS = int(os.getenv("FEED_SUMMARY_WORKERS", "4"))
+
+# How far back an interest's first materialization looks (days)
+FIRST_RUN_DAYS = 30
+
+# Longest a run may hold the lease before another process may start one (seconds)
+RUN_LEASE_SECONDS = 2 * 3600
+
+LEASE_NAME = "feed_materializer"
+
+# LLM calls of the job are charged to this scheduler user
+JOB_USER = "feed-materializer"
+
+_lock = threading.Lock()
+_thread: Optional[threading.Thread] = None
+
+
+def _summarize(domain: str, article: Dict[str, Any]) -> Optional[str]:
+    """Card summary, asked for the same way as app_cache.analyze_feed_article."""
+    from summarizer import summarize_article
+    return summarize_article(domain, {
+        'url': article['url'],
+        'title': article.get('title', ''),
+        'summary': article['content'][:500],
+        'sentiment_score': 0
+    })
+
+
+def _card(article: Dict[str, Any]) -> Dict[str, Any]:
+    """The fields a feed card shows; everything else stays out of the stored feeds."""
+    card = {field: article[field] for field in CARD_FIELDS if field in article}
+    card['preview'] = (article['preview'] if 'preview' in article else article.get('content') or '')[:PREVIEW_CHARS]
+    return card
+
+
+def enrich_articles(domain: str, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Image, sentiment and card summary for articles new to an interest.
+
+    Images are looked up and card summaries written concurrently (one LLM
+    call per article, SUMMARY_WORKERS at a time) while sentiment is analyzed
+    in batches; all LLM calls run at background priority, so a
+    materialization never takes the quota searches and open feed pages need.
+
+    Returns:
+        Cards of the articles (CARD_FIELDS and 'preview', the first
+        PREVIEW_CHARS of the content) with 'domain', 'image_url', 'has_image',
+        'sentiment' (analysis result or None), 'sentiment_score', 'summary'
+        and 'materialized_at' set
+    """
+    if not articles:
+        return []
+    from enhanced_image_extractor import prefetch_images
+    from sentiment_analysis import analyze_sentiment_batch
+
+    image_futures = prefetch_images(articles)
+    llm_scheduler.set_user(JOB_USER)
+    with llm_scheduler.priority("background"), \
+            ThreadPoolExecutor(max_workers=SUMMARY_WORKERS, thread_name_prefix="feed-summary") as pool:
+        # Each call carries this context, so it is charged to JOB_USER at background priority
+        summary_futures = {
+            article['url']: pool.submit(contextvars.copy_context().run, _summarize, domain, article)
+            for article in articles if article.get('content')
+        }
+        try:
+            sentiments = analyze_sentiment_batch(
+                domain,
+                {article['url']: article['content'] for article in articles if article.get('content')},
+                titles={article['url']: article.get('title', '') for article in articles}
+            )
+        except Exception as e:
+            logger.warning(f"Sentiment analysis failed for {domain}: {e}")
+            sentiments = {}
+
+        now = datetime.utcnow()
+        enriched = []
+        for article in articles:
+            summary = None
+            if article['url'] in summary_futures:
+                try:
+                    summary = summary_futures[article['url']].result()
+                except Exception as e:
+                    logger.warning(f"Summary failed for {article['url']}: {e}")
+            try:
+                image_url = image_futures[article['url']].result() if article['url'] in image_futures else None
+            except Exception as e:
+                logger.warning(f"Image lookup failed for {article['url']}: {e}")
+                image_url = None
+            sentiment = sentiments.get(article['url'])
+            enriched.append(_card({
+                **article,
+                'domain': domain,
+                'image_url': image_url,
+                'has_image': bool(image_url),
+                'sentiment': sentiment,
+                'sentiment_score': float(sentiment['Score']) if sentiment else 0.0,
+                'summary': summary,
+                'materialized_at': now
+            }))
+    return enriched
+
+
+def materialize_feeds(refresh: bool = True) -> Dict[str, Any]:
+    """
+    Bring every active user's materialized Personalized Feed up to date.
+
+    The interests of all active users are crawled together, once
+    (news_fetcher3.get_news_for_domains). Only articles an interest has not
+    seen before are enriched, and each user's document only gets those new
+    articles pushed onto its lists, so a run costs in proportion to new
+    content. A user's list for an interest is copied whole from the interest's
+    `feed_domains` document only when the interest is new to them.
+
+    Args:
+        refresh: Crawl the feeds even if news_fetcher3 has cached results
+
+    Returns:
+        Dict[str, Any]: 'users', 'interests', 'new_articles' per interest,
+        'users_updated' and 'seconds'
+    """
+    from models import users_collection, user_feeds_collection, feed_domains_collection
+    from news_fetcher3 import get_news_for_domains
+
+    started = time.time()
+    users = list(users_collection.find(
+        {"is_active": {"$ne": False}, "interests.0": {"$exists": True}},
+        {"username": 1, "interests": 1}
+    ))
+    domains = sorted({domain for user in users for domain in user['interests']})
+    stored = {doc['domain']: doc for doc in feed_domains_collection.find({"domain": {"$in": domains}})}
+
+    # Articles published before the oldest previous run were seen then,
+    # unless an interest has never been materialized
+    if domains and all(domain in stored for domain in domains):
+        since = min(stored[domain]['materialized_at'] for domain in domains)
+    else:
+        since = datetime.utcnow() - timedelta(days=FIRST_RUN_DAYS)
+    news = get_news_for_domains(domains, max_articles=FETCH_ARTICLES,
+                                start_date=since.strftime('%Y-%m-%d'), refresh=refresh) if domains else {}
+
+    now = datetime.utcnow()
+    new_articles, domain_articles = {}, {}
+    for domain in domains:
+        previous = stored.get(domain, {}).get('articles', [])
+        known = {canonical_url(article['url']) for article in previous}
+        fresh = []
+        for article in news.get(domain, []):
+            key = canonical_url(article['url']) if article.get('url') else None
+            if key and key not in known:
+                known.add(key)
+                fresh.append(article)
+        new_articles[domain] = enrich_articles(domain, fresh)
+        # Cards stored before bodies were left out are trimmed on the way
+        domain_articles[domain] = [_card(article) for article in new_articles[domain] + previous][:MAX_FEED_ARTICLES]
+        feed_domains_collection.update_one(
+            {"domain": domain},
+            {"$set": {"articles": domain_articles[domain], "materialized_at": now}},
+            upsert=True
+        )
+
+    # Per user, only what changed: new articles, interests added or removed
+    feeds = {doc['user_id']: set(doc.get('interests', []))
+             for doc in user_feeds_collection.find({}, {"user_id": 1, "interests": 1})}
+    operations = []
+    for user in users:
+        user_id = str(user['_id'])
+        had = feeds.get(user_id, set())
+        update = {"$set": {}, "$push": {}}
+        for domain in user['interests']:
+            if domain not in had:
+                update["$set"][f"domains.{domain}"] = domain_articles[domain]
+            elif new_articles[domain]:
+                update["$push"][f"domains.{domain}"] = {
+                    "$each": new_articles[domain],
+                    "$position": 0,
+                    "$slice": MAX_FEED_ARTICLES
+                }
+        removed = had - set(user['interests'])
+        if removed:
+            update["$unset"] = {f"domains.{domain}": "" for domain in removed}
+        if not update["$set"] and not update["$push"] and not removed:
+            continue
+        update["$set"].update({"username": user.get('username'), "interests": user['interests'], "updated_at": now})
+        if not update["$push"]:
+            del update["$push"]
+        operations.append(UpdateOne({"user_id": user_id}, update, upsert=True))
+    if operations:
+        user_feeds_collection.bulk_write(operations, ordered=False)
+
+    # Feeds of users who were deactivated or dropped all their interests
+    user_feeds_collection.delete_many({"user_id": {"$nin": [str(user['_id']) for user in users]}})
+
+    stats = {
+        'users': len(users),
+        'interests': len(domains),
+        'new_articles': {domain: len(articles) for domain, articles in new_articles.items()},
+        'users_updated': len(operations),
+        'seconds': time.time() - started
+    }
+    logger.info(f"Materialized feeds of {stats['users']} users: {sum(stats['new_articles'].values())} new articles "
+                f"over {stats['interests']} interests, {stats['users_updated']} users updated "
+                f"in {stats['seconds']:.1f}s")
+    return stats
+
+
+def run_scheduled(minutes: float) -> Optional[Dict[str, Any]]:
+    """
+    One materialization, unless another process ran one in the last `minutes`.
+
+    Returns:
+        The run's stats, or None if it was skipped
+    """
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    if not acquire_lease(LEASE_NAME, owner, RUN_LEASE_SECONDS):
+        logger.info("Feed materialization is due in another process; skipping")
+        return None
+    try:
+        return materialize_feeds()
+    finally:
+        # The next run, in whichever process, is due one interval from now
+        acquire_lease(LEASE_NAME, owner, minutes * 60)
+
+
+def _loop(minutes: float) -> None:
+    while True:
+        try:
+            run_scheduled(minutes)
+        except Exception as e:
+            logger.error(f"Feed materialization failed: {e}", exc_info=True)
+        time.sleep(minutes * 60)
+
+
+def start_scheduler(minutes: float = FEED_REFRESH_MINUTES) -> bool:
+    """
+    Materialize feeds every `minutes` in a background thread, started once per process.
+
+    Returns:
+        bool: True if the scheduler is running (False when disabled with minutes <= 0)
+    """
+    global _thread
+    if minutes <= 0:
+        return False
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_loop, args=(minutes,), name="feed-materializer", daemon=True)
+            _thread.start()
+            logger.info(f"Materializing Personalized Feeds every {minutes:g} minutes")
+    return True
+
+
+def get_user_feed(user_id: str) -> Optional[Dict[str, Any]]:
+    """
+    A user's materialized feed.
+
+    Returns:
+        Dict with 'interests', 'domains' (articles per interest, newest first)
+        and 'updated_at'; None if the feed has not been materialized yet
+    """
+    from models import user_feeds_collection
+    try:
+        return user_feeds_collection.find_one({"user_id": str(user_id)}, {"_id": 0})
+    except Exception as e:
+        logger.warning(f"Could not load the materialized feed of {user_id}: {e}")
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Materialize users' Personalized Feeds into the user_feeds collection.")
+    parser.add_argument("--every", type=float, default=0, help="Minutes between runs; run once if not given")
+    args = parser.parse_args()
+
+    if args.every > 0:
+        _loop(args.every)
+    else:
+        print(json.dumps(materialize_feeds(), indent=2))
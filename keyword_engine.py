@@ -0,0 +1,243 @@
+import os
+import json
+import atexit
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from lexicon_sentiment import STOPWORDS, TOKEN_PATTERN
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+# Document frequencies of every article seen so far, stored next to the other
+# caches so IDF weights keep improving across searches and restarts
+DF_FILE = Path("./cache/keyword_df.json")
+
+# Write the table at most every N newly ingested articles
+FLUSH_EVERY = 50
+
+# Content hashes remembered so re-fetched articles are only counted once
+MAX_SEEN = 50000
+
+# When the table grows past this many terms, terms seen in a single article are dropped
+MAX_TERMS = 100000
+
+KEYWORDS_PER_ARTICLE = 5
+TOP_TOPICS = 5
+
+# Two-word phrases are kept only if they occur this often across the batch,
+# and then weigh a bit more than single words
+MIN_PHRASE_COUNT = 2
+PHRASE_BOOST = 1.5
+
+# Topics must be shared by this many articles (when the batch is big enough)
+MIN_TOPIC_ARTICLES = 2
+
+_lock = threading.Lock()
+_state: Optional[Dict[str, Any]] = None
+_seen: Optional[set] = None
+_pending_docs = 0
+
+
+def _load() -> Dict[str, Any]:
+    """Load the DF table from disk once per process. Caller must hold the lock."""
+    global _state, _seen
+    if _state is not None:
+        return _state
+
+    _state = {'documents': 0, 'df': {}, 'seen': []}
+    if DF_FILE.exists():
+        try:
+            with open(DF_FILE, 'r', encoding='utf-8') as f:
+                _state.update(json.load(f))
+        except Exception as e:
+            logger.warning(f"Error reading keyword table {DF_FILE}: {e}")
+    _seen = set(_state['seen'])
+    return _state
+
+
+def _save() -> None:
+    """Write the DF table to disk atomically. Caller must hold the lock."""
+    global _pending_docs
+    if _state is None:
+        return
+    try:
+        DF_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = DF_FILE.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(_state, f, ensure_ascii=False)
+        os.replace(tmp_file, DF_FILE)
+        _pending_docs = 0
+    except Exception as e:
+        logger.warning(f"Error writing keyword table {DF_FILE}: {e}")
+
+
+def flush() -> None:
+    """Persist articles ingested since the last write."""
+    with _lock:
+        if _pending_docs:
+            _save()
+
+
+atexit.register(flush)
+
+
+def _terms(text: str, excluded: set) -> List[str]:
+    """Content words and two-word phrases of adjacent content words, in text order."""
+    tokens = TOKEN_PATTERN.findall((text or '').lower())
+    keep = [len(t) > 3 and t not in excluded and "'" not in t for t in tokens]
+    terms = [t for t, ok in zip(tokens, keep) if ok]
+    terms += [f"{a} {b}" for a, b, ok_a, ok_b in zip(tokens, tokens[1:], keep, keep[1:]) if ok_a and ok_b]
+    return terms
+
+
+def _label(term: str) -> str:
+    return ' '.join(word.capitalize() for word in term.split())
+
+
+def _pick(ranked_terms: List[str], limit: int) -> List[str]:
+    """Best terms first, skipping words already covered by a chosen phrase (and vice versa)."""
+    chosen, covered = [], set()
+    for term in ranked_terms:
+        words = set(term.split())
+        if words <= covered or any(set(c.split()) <= words for c in chosen):
+            continue
+        chosen.append(term)
+        covered |= words
+        if len(chosen) >= limit:
+            break
+    return chosen
+
+
+def ingest(doc_terms: Dict[str, List[str]]) -> int:
+    """
+    Add articles to the document-frequency table.
+
+    Args:
+        doc_terms: Terms per article, keyed by a hash of the article text
+
+    Returns:
+        int: Number of articles that were new to the table
+    """
+    global _pending_docs
+    added = 0
+    with _lock:
+        state = _load()
+        df = state['df']
+        for doc_hash, terms in doc_terms.items():
+            if doc_hash in _seen:
+                continue
+            _seen.add(doc_hash)
+            state['seen'].append(doc_hash)
+            state['documents'] += 1
+            for term in set(terms):
+                df[term] = df.get(term, 0) + 1
+            added += 1
+
+        if len(state['seen']) > MAX_SEEN:
+            dropped = state['seen'][:len(state['seen']) - MAX_SEEN]
+            state['seen'] = state['seen'][len(dropped):]
+            _seen.difference_update(dropped)
+        if len(df) > MAX_TERMS:
+            state['df'] = {term: count for term, count in df.items() if count > 1}
+
+        _pending_docs += added
+        if _pending_docs >= FLUSH_EVERY:
+            _save()
+    return added
+
+
+def extract_keywords(entity: str, articles: Dict[str, str], titles: Optional[Dict[str, str]] = None,
+                     limit: int = KEYWORDS_PER_ARTICLE, top_topics: int = TOP_TOPICS,
+                     update: bool = True) -> Tuple[Dict[str, List[str]], List[Tuple[str, int]]]:
+    """
+    Per-article keywords and the result set's top topics in one vectorized TF-IDF pass.
+
+    Term frequencies come from the batch; inverse document frequencies come
+    from the persistent table of every article ingested so far, so words
+    common to all news ("market", "shares") rank below what is specific to
+    these articles. Single words and two-word phrases are both candidates;
+    the entity's own name is excluded.
+
+    Args:
+        entity: Company or person searched for
+        articles: Article content keyed by a caller-chosen id (e.g. URL)
+        titles: Article titles by the same ids (optional, counted as content)
+        limit: Keywords per article
+        top_topics: Number of corpus-level topics
+        update: Add these articles to the DF table after scoring
+
+    Returns:
+        Tuple of (keywords per article id, list of (topic, number of articles
+        it is a keyword candidate in), best topic first)
+    """
+    keys = list(articles.keys())
+    titles = titles or {}
+    excluded = STOPWORDS | set(entity.lower().split())
+    texts = [f"{titles.get(key) or ''}\n{articles[key] or ''}" for key in keys]
+    doc_terms = [_terms(text, excluded) for text in texts]
+
+    vocab: Dict[str, int] = {}
+    doc_idx = np.fromiter((i for i, terms in enumerate(doc_terms) for _ in terms), dtype=np.int64)
+    term_idx = np.fromiter((vocab.setdefault(t, len(vocab)) for terms in doc_terms for t in terms), dtype=np.int64)
+    if not vocab:
+        return {key: [] for key in keys}, []
+    terms = list(vocab)
+    n_terms = len(terms)
+
+    # Sparse (article, term) counts
+    pairs, counts = np.unique(doc_idx * n_terms + term_idx, return_counts=True)
+    d, t = pairs // n_terms, pairs % n_terms
+
+    with _lock:
+        state = _load()
+        documents = state['documents']
+        df = np.array([state['df'].get(term, 0) for term in terms], dtype=np.float64)
+
+    idf = np.log((1 + documents) / (1 + df)) + 1
+    is_phrase = np.array([' ' in term for term in terms])
+    batch_counts = np.bincount(t, weights=counts, minlength=n_terms)
+    boost = np.where(is_phrase, np.where(batch_counts >= MIN_PHRASE_COUNT, PHRASE_BOOST, 0.0), 1.0)
+
+    weights = (1 + np.log(counts)) * idf[t] * boost[t]
+    norms = np.sqrt(np.bincount(d, weights=weights ** 2, minlength=len(keys)))
+    weights = weights / np.where(norms > 0, norms, 1.0)[d]
+
+    # Per article: terms by descending weight
+    order = np.lexsort((-weights, d))
+    bounds = np.searchsorted(d[order], np.arange(len(keys) + 1))
+    keywords = {}
+    for i, key in enumerate(keys):
+        rows = order[bounds[i]:bounds[i + 1]]
+        ranked = [terms[j] for j, w in zip(t[rows], weights[rows]) if w > 0]
+        keywords[key] = [_label(term) for term in _pick(ranked, limit)]
+
+    # Corpus topics: summed weight across articles, shared by several articles
+    topic_scores = np.bincount(t, weights=weights, minlength=n_terms)
+    article_counts = np.bincount(t, minlength=n_terms)
+    if len(keys) >= 3:
+        topic_scores[article_counts < MIN_TOPIC_ARTICLES] = 0
+    ranked = [terms[j] for j in np.argsort(-topic_scores, kind='stable') if topic_scores[j] > 0]
+    topics = [(_label(term), int(article_counts[vocab[term]])) for term in _pick(ranked, top_topics)]
+
+    if update:
+        ingest({hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]: article_terms
+                for text, article_terms in zip(texts, doc_terms)})
+    return keywords, topics
+
+
+def get_table_stats() -> Dict[str, int]:
+    """Size of the document-frequency table."""
+    with _lock:
+        state = _load()
+        return {'documents': state['documents'], 'terms': len(state['df'])}
@@ -0,0 +1,254 @@
+import re
+import logging
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+# Business/news polarity lexicon, weights in [-1, +1]
+LEXICON = {
+    # Positive
+    'gain': 0.6, 'gains': 0.6, 'gained': 0.6, 'growth': 0.6, 'grow': 0.5, 'grows': 0.5, 'growing': 0.5,
+    'profit': 0.6, 'profits': 0.6, 'profitable': 0.7, 'record': 0.4, 'surge': 0.7, 'surged': 0.7,
+    'surges': 0.7, 'soar': 0.8, 'soared': 0.8, 'soars': 0.8, 'rally': 0.6, 'rallied': 0.6, 'jump': 0.5,
+    'jumped': 0.5, 'rise': 0.4, 'rises': 0.4, 'rose': 0.4, 'rising': 0.4, 'beat': 0.5, 'beats': 0.5,
+    'exceeded': 0.6, 'exceeds': 0.6, 'strong': 0.5, 'stronger': 0.5, 'strongest': 0.6, 'boost': 0.6,
+    'boosted': 0.6, 'boosts': 0.6, 'success': 0.7, 'successful': 0.7, 'win': 0.6, 'wins': 0.6, 'won': 0.6,
+    'award': 0.5, 'awarded': 0.5, 'innovative': 0.5, 'innovation': 0.5, 'breakthrough': 0.8,
+    'launch': 0.3, 'launched': 0.3, 'launches': 0.3, 'expand': 0.5, 'expands': 0.5, 'expansion': 0.5,
+    'partnership': 0.4, 'partner': 0.3, 'deal': 0.3, 'agreement': 0.3, 'upgrade': 0.6, 'upgraded': 0.6,
+    'outperform': 0.7, 'outperformed': 0.7, 'bullish': 0.7, 'optimistic': 0.6, 'optimism': 0.6,
+    'improve': 0.5, 'improved': 0.5, 'improves': 0.5, 'improvement': 0.5, 'approval': 0.5,
+    'approved': 0.5, 'praise': 0.6, 'praised': 0.6, 'positive': 0.5, 'upbeat': 0.6, 'robust': 0.5,
+    'recovery': 0.5, 'recovered': 0.5, 'milestone': 0.5, 'leading': 0.3, 'leader': 0.3,
+    'efficient': 0.4, 'dividend': 0.3, 'hire': 0.3, 'hiring': 0.3, 'invest': 0.3, 'investment': 0.3,
+    'celebrate': 0.5, 'celebrated': 0.5, 'best': 0.5, 'top': 0.3, 'good': 0.4, 'great': 0.6,
+    'excellent': 0.7, 'impressive': 0.6, 'favorable': 0.5, 'benefit': 0.4, 'benefits': 0.4,
+    # Negative
+    'loss': -0.6, 'losses': -0.6, 'lose': -0.5, 'lost': -0.5, 'decline': -0.5, 'declined': -0.5,
+    'declines': -0.5, 'drop': -0.5, 'dropped': -0.5, 'drops': -0.5, 'fall': -0.5, 'fell': -0.5,
+    'falls': -0.5, 'plunge': -0.8, 'plunged': -0.8, 'plunges': -0.8, 'slump': -0.7, 'slumped': -0.7,
+    'crash': -0.8, 'crashed': -0.8, 'tumble': -0.7, 'tumbled': -0.7, 'miss': -0.4, 'missed': -0.5,
+    'weak': -0.5, 'weaker': -0.5, 'weakness': -0.5, 'cut': -0.4, 'cuts': -0.4, 'layoff': -0.7,
+    'layoffs': -0.7, 'fired': -0.6, 'lawsuit': -0.7, 'lawsuits': -0.7, 'sued': -0.7, 'sue': -0.6,
+    'fine': -0.3, 'fined': -0.7, 'penalty': -0.6, 'probe': -0.6, 'investigation': -0.6,
+    'investigated': -0.6, 'fraud': -0.9, 'scandal': -0.9, 'recall': -0.6, 'recalls': -0.6,
+    'recalled': -0.6, 'downgrade': -0.6, 'downgraded': -0.6, 'bearish': -0.7, 'concern': -0.4,
+    'concerns': -0.4, 'worry': -0.5, 'worries': -0.5, 'risk': -0.3, 'risks': -0.3, 'crisis': -0.8,
+    'bankruptcy': -0.9, 'bankrupt': -0.9, 'debt': -0.3, 'delay': -0.4, 'delayed': -0.4, 'delays': -0.4,
+    'fail': -0.6, 'failed': -0.6, 'failure': -0.7, 'fails': -0.6, 'criticism': -0.6, 'criticized': -0.6,
+    'criticised': -0.6, 'controversy': -0.6, 'controversial': -0.5, 'ban': -0.6, 'banned': -0.6,
+    'warning': -0.5, 'warns': -0.5, 'warned': -0.5, 'negative': -0.5, 'struggle': -0.5,
+    'struggles': -0.5, 'struggling': -0.5, 'resign': -0.5, 'resigned': -0.5, 'resignation': -0.5,
+    'breach': -0.7, 'hack': -0.6, 'hacked': -0.7, 'outage': -0.6, 'accident': -0.6, 'crashes': -0.7,
+    'death': -0.6, 'dead': -0.6, 'killed': -0.7, 'injured': -0.6, 'strike': -0.4, 'protest': -0.4,
+    'protests': -0.4, 'boycott': -0.7, 'volatile': -0.3, 'volatility': -0.3, 'uncertainty': -0.4,
+    'slowdown': -0.5, 'shortage': -0.5, 'bad': -0.5, 'worst': -0.7, 'poor': -0.5, 'disappointing': -0.6,
+    'disappointed': -0.6, 'angry': -0.5, 'accused': -0.6, 'allegations': -0.6, 'alleged': -0.4,
+}
+
+# Words that flip the polarity of the next NEGATION_WINDOW tokens
+NEGATORS = {'not', 'no', 'never', "n't", 'without', 'neither', 'nor', 'hardly', 'barely'}
+NEGATION_WINDOW = 3
+
+# Sentiment words in sentences that name the entity count this many times more
+ENTITY_SENTENCE_WEIGHT = 2.0
+
+# Scores inside (-NEUTRAL_BAND, NEUTRAL_BAND) are labelled Neutral
+NEUTRAL_BAND = 0.1
+
+# Additive smoothing on the polarity mass so one word cannot produce +/-1
+SMOOTHING = 3.0
+
+# Polarity mass that counts as full evidence, and the mass below which an
+# article is treated as carrying no sentiment at all
+EVIDENCE_MASS = 6.0
+MIN_EVIDENCE = 1.0
+
+# Word count at which an article without sentiment words is confidently neutral
+NEUTRAL_LENGTH = 150
+
+STOPWORDS = {
+    'the', 'and', 'for', 'that', 'with', 'this', 'from', 'have', 'has', 'had', 'was', 'were', 'are',
+    'will', 'would', 'could', 'should', 'been', 'being', 'their', 'they', 'them', 'there', 'than',
+    'then', 'which', 'what', 'when', 'where', 'while', 'who', 'whom', 'about', 'after', 'before',
+    'into', 'over', 'under', 'also', 'said', 'says', 'more', 'most', 'some', 'such', 'only', 'other',
+    'its', 'our', 'your', 'his', 'her', 'she', 'him', 'but', 'not', 'can', 'may', 'one', 'two',
+    'new', 'year', 'years', 'company', 'companies', 'news', 'according', 'just', 'like', 'these',
+    'those', 'each', 'many', 'much', 'very', 'both', 'through', 'during', 'between', 'against',
+    'because', 'since', 'until', 'does', 'did', 'doing', 'made', 'make', 'makes', 'first', 'last',
+    'week', 'month', 'time', 'people', 'including', 'however', 'still', 'even', 'back', 'told',
+    'reported', 'report', 'reports', 'percent', 'million', 'billion', 'truncated',
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z]+(?:'[a-z]+)?|n't")
+SENTENCE_PATTERN = re.compile(r'(?<=[.!?])\s+')
+
+_vocab = {word: i for i, word in enumerate(LEXICON)}
+_weights = np.array(list(LEXICON.values()), dtype=np.float64)
+
+
+def _tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower().replace("n't", " n't"))
+
+
+def _entity_terms(entity: str) -> List[str]:
+    """Lower-cased strings whose presence marks a sentence as being about the entity."""
+    name = ' '.join(entity.strip().strip('"\'').lower().split())
+    if not name:
+        return []
+    parts = name.split()
+    # The last name alone ("Musk") is how most articles refer back to a person
+    return [name] + ([parts[-1]] if len(parts) > 1 and len(parts[-1]) > 2 else [])
+
+
+def _flatten(entity: str, texts: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, List[List[str]]]:
+    """
+    Turn a batch of texts into flat arrays of lexicon hits.
+
+    Returns:
+        doc index, lexicon index and multiplier (negation sign times entity
+        weight) per hit, word count per document, and the tokens per document
+    """
+    terms = _entity_terms(entity)
+    doc_idx, lex_idx, multiplier, lengths, all_tokens = [], [], [], [], []
+
+    for doc, text in enumerate(texts):
+        doc_tokens = []
+        for sentence in SENTENCE_PATTERN.split(text or ''):
+            tokens = _tokenize(sentence)
+            doc_tokens.extend(tokens)
+            lowered = sentence.lower()
+            weight = ENTITY_SENTENCE_WEIGHT if any(term in lowered for term in terms) else 1.0
+            negated_until = -1
+            for position, token in enumerate(tokens):
+                if token in NEGATORS:
+                    negated_until = position + NEGATION_WINDOW
+                    continue
+                index = _vocab.get(token)
+                if index is None:
+                    continue
+                doc_idx.append(doc)
+                lex_idx.append(index)
+                multiplier.append(-weight if position <= negated_until else weight)
+        lengths.append(len(doc_tokens))
+        all_tokens.append(doc_tokens)
+
+    return (np.array(doc_idx, dtype=np.int64), np.array(lex_idx, dtype=np.int64),
+            np.array(multiplier, dtype=np.float64), np.array(lengths, dtype=np.float64), all_tokens)
+
+
+def score_texts(entity: str, texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score a batch of articles for an entity.
+
+    Args:
+        entity: Company or person the sentiment is about
+        texts: Article texts
+
+    Returns:
+        Tuple of arrays (score in [-1, 1], confidence in [0, 1]), one value per text
+    """
+    doc_idx, lex_idx, multiplier, lengths, _ = _flatten(entity, texts)
+    return _score_arrays(doc_idx, lex_idx, multiplier, lengths)
+
+
+def _score_arrays(doc_idx: np.ndarray, lex_idx: np.ndarray, multiplier: np.ndarray,
+                  lengths: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    n = len(lengths)
+    if not n:
+        return np.zeros(0), np.zeros(0)
+
+    contributions = _weights[lex_idx] * multiplier if len(lex_idx) else np.zeros(0)
+
+    positive = np.bincount(doc_idx, weights=np.clip(contributions, 0, None), minlength=n)
+    negative = np.bincount(doc_idx, weights=np.clip(-contributions, 0, None), minlength=n)
+    mass = positive + negative
+
+    scores = (positive - negative) / (mass + SMOOTHING)
+
+    # Confidence: how one-sided the evidence is times how much of it there is.
+    # Long articles with almost no sentiment words are confidently neutral.
+    agreement = np.divide(np.abs(positive - negative), mass, out=np.zeros(n), where=mass > 0)
+    evidence = np.minimum(1.0, mass / EVIDENCE_MASS)
+    neutral_confidence = np.minimum(1.0, lengths / NEUTRAL_LENGTH) * 0.9
+    confidence = np.where(
+        mass < MIN_EVIDENCE,
+        np.where(np.abs(scores) < NEUTRAL_BAND, neutral_confidence, 0.3),
+        agreement * evidence
+    )
+
+    return np.round(scores, 2), np.round(confidence, 2)
+
+
+def _label(score: float) -> str:
+    if score >= NEUTRAL_BAND:
+        return "Positive"
+    if score <= -NEUTRAL_BAND:
+        return "Negative"
+    return "Neutral"
+
+
+def _keywords(entity: str, tokens: List[str], limit: int = 5) -> List[str]:
+    """Most frequent content words, excluding the entity's own name."""
+    excluded = STOPWORDS | set(entity.lower().split())
+    candidates = np.array([t for t in tokens if len(t) > 3 and t not in excluded and "'" not in t])
+    if not len(candidates):
+        return []
+    words, counts = np.unique(candidates, return_counts=True)
+    # Stable sort keeps alphabetical order among ties so results are deterministic
+    order = np.argsort(-counts, kind='stable')[:limit]
+    return [str(words[i]).capitalize() for i in order]
+
+
+def _summary(entity: str, text: str, limit: int = 2) -> str:
+    """Lead sentences about the entity, or the article lead if none name it."""
+    terms = _entity_terms(entity)
+    sentences = [s.strip() for s in SENTENCE_PATTERN.split(text or '') if len(s.strip()) > 20]
+    relevant = [s for s in sentences if any(term in s.lower() for term in terms)]
+    summary = ' '.join((relevant or sentences)[:limit])
+    return summary[:400] + ('...' if len(summary) > 400 else '')
+
+
+def analyze_lexicon_batch(entity: str, articles: Dict[str, str]) -> Dict[str, Dict]:
+    """
+    Analyze many articles locally in one vectorized pass.
+
+    Args:
+        entity: Company or person the sentiment is about
+        articles: Article content keyed by a caller-chosen id (e.g. URL)
+
+    Returns:
+        Dict[str, Dict]: Per article id a result with the same Score, Sentiment,
+        Summary and Keywords fields as the LLM analysis, plus 'Confidence' and
+        'Engine' ('lexicon')
+    """
+    keys = list(articles.keys())
+    texts = [articles[key] or '' for key in keys]
+    doc_idx, lex_idx, multiplier, lengths, tokens = _flatten(entity, texts)
+    scores, confidence = _score_arrays(doc_idx, lex_idx, multiplier, lengths)
+
+    results = {}
+    for i, key in enumerate(keys):
+        score = float(scores[i])
+        results[key] = {
+            "Score": score,
+            "Sentiment": _label(score),
+            "Summary": _summary(entity, texts[i]),
+            "Keywords": _keywords(entity, tokens[i]),
+            "Confidence": float(confidence[i]),
+            "Engine": "lexicon"
+        }
+    return results
+
+
+def analyze_lexicon(entity: str, article_content: str) -> Dict:
+    """Analyze a single article locally; see analyze_lexicon_batch."""
+    return analyze_lexicon_batch(entity, {'article': article_content})['article']
@@ -0,0 +1,200 @@
+import os
+import logging
+import threading
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+import llm_scheduler
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+# Model used for every task unless a task-specific LLM_MODEL_<TASK> is set,
+# e.g. LLM_MODEL_SUMMARY_MAP=llama3-8b-8192 for cheaper map-step summaries
+DEFAULT_MODEL = os.getenv("LLM_MODEL", "llama3-70b-8192")
+
+# Request timeout in seconds, overridable per task with LLM_TIMEOUT_<TASK>
+DEFAULT_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "30"))
+
+# Retries done by the client library itself (connection errors, 429, 5xx)
+CLIENT_MAX_RETRIES = int(os.getenv("LLM_CLIENT_MAX_RETRIES", "2"))
+
+# Tasks that call the LLM; each can be routed to its own model and timeout
+TASKS = ("sentiment", "summary", "summary_map")
+
+_lock = threading.Lock()
+_client = None
+_async_client = None
+
+
+def get_model(task: str) -> str:
+    """Model for a task: LLM_MODEL_<TASK>, else LLM_MODEL."""
+    return os.getenv(f"LLM_MODEL_{task.upper()}", DEFAULT_MODEL)
+
+
+def get_timeout(task: str) -> float:
+    """Timeout in seconds for a task: LLM_TIMEOUT_<TASK>, else LLM_TIMEOUT."""
+    value = os.getenv(f"LLM_TIMEOUT_{task.upper()}")
+    return float(value) if value else DEFAULT_TIMEOUT
+
+
+def get_base_url() -> Optional[str]:
+    """
+    LLM_BASE_URL points the clients at any Groq/OpenAI-compatible endpoint,
+    e.g. the local stub in mock_llm_server.py; unset means the Groq cloud API.
+    """
+    return os.getenv("LLM_BASE_URL") or None
+
+
+def _client_options() -> Dict[str, Any]:
+    api_key = os.getenv("GROQ_API_KEY")
+    if not api_key:
+        if not get_base_url():
+            raise ValueError("GROQ_API_KEY not found in environment variables")
+        # Local stub servers do not check the key
+        api_key = "local"
+    return {
+        "api_key": api_key,
+        "base_url": get_base_url(),
+        "timeout": DEFAULT_TIMEOUT,
+        "max_retries": CLIENT_MAX_RETRIES,
+    }
+
+
+def get_client():
+    """Shared synchronous client, created on first use."""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                from groq import Groq
+                _client = Groq(**_client_options())
+                logger.info(f"Initialized LLM client ({get_base_url() or 'Groq cloud'})")
+    return _client
+
+
+def get_async_client():
+    """Shared asyncio client, created on first use."""
+    global _async_client
+    if _async_client is None:
+        with _lock:
+            if _async_client is None:
+                from groq import AsyncGroq
+                _async_client = AsyncGroq(**_client_options())
+    return _async_client
+
+
+class _SlotStream:
+    """Stream of completion chunks that frees its scheduler slot once exhausted or closed."""
+
+    def __init__(self, stream, release: Callable[[], None]):
+        self._stream = stream
+        self._chunks = iter(stream)
+        self._release: Optional[Callable[[], None]] = release
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._chunks)
+        except BaseException:
+            # StopIteration included: the stream is done either way
+            self.close()
+            raise
+
+    def close(self) -> None:
+        release, self._release = self._release, None
+        if release is None:
+            return
+        try:
+            close = getattr(self._stream, "close", None)
+            if close:
+                close()
+        finally:
+            release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __del__(self):
+        # A consumer that stops reading without closing still frees the slot
+        self.close()
+
+
+def complete(task: str, messages: List[Dict[str, str]], **kwargs: Any):
+    """
+    Create a chat completion routed by task.
+
+    The request waits for admission by the shared llm_scheduler (priority
+    class from the task or llm_scheduler.priority, fair share per user), and
+    the provider's rate-limit headers are fed back to it.
+
+    Args:
+        task: One of TASKS; selects the model and timeout
+        messages: Chat messages
+        **kwargs: Passed through to chat.completions.create (temperature,
+            max_tokens, response_format, stream, ...)
+
+    Returns:
+        The completion, or a stream of chunks when stream=True
+    """
+    kwargs.setdefault("model", get_model(task))
+    kwargs.setdefault("timeout", get_timeout(task))
+    scheduler = llm_scheduler.get_scheduler()
+    tokens = llm_scheduler.estimate_request_tokens(messages, kwargs.get("max_tokens"))
+    with ExitStack() as stack:
+        stack.enter_context(scheduler.slot(task, tokens))
+        try:
+            raw = get_client().chat.completions.with_raw_response.create(messages=messages, **kwargs)
+        except Exception as e:
+            scheduler.observe_error(e)
+            raise
+        scheduler.observe(raw.headers)
+        response = raw.parse()
+        if not kwargs.get("stream"):
+            return response
+        # Chunks are read after this returns; the request is in flight until the stream ends
+        return _SlotStream(response, stack.pop_all().close)
+
+
+async def acomplete(task: str, messages: List[Dict[str, str]], **kwargs: Any):
+    """Async version of complete."""
+    kwargs.setdefault("model", get_model(task))
+    kwargs.setdefault("timeout", get_timeout(task))
+    scheduler = llm_scheduler.get_scheduler()
+    tokens = llm_scheduler.estimate_request_tokens(messages, kwargs.get("max_tokens"))
+    async with scheduler.aslot(task, tokens):
+        try:
+            raw = await get_async_client().chat.completions.with_raw_response.create(messages=messages, **kwargs)
+        except Exception as e:
+            scheduler.observe_error(e)
+            raise
+        scheduler.observe(raw.headers)
+        return await raw.parse()
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """True for a 429 from the provider; checked by status so callers need not import groq."""
+    return getattr(error, "status_code", None) == 429
+
+
+def reset_clients() -> None:
+    """Drop the shared clients so the next call builds new ones (e.g. after changing settings)."""
+    global _client, _async_client
+    with _lock:
+        _client = None
+        _async_client = None
@@ -0,0 +1,365 @@
+import os
+import time
+import logging
+import asyncio
+import threading
+import contextvars
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from rate_limiter import TokenBucket, REQUESTS_PER_MINUTE, TOKENS_PER_MINUTE, parse_duration, retry_after_seconds
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+# Priority classes, highest first
+PRIORITIES = ("interactive", "visible", "background")
+
+# Class used when the caller does not pick one: summaries are read while the
+# user waits, sentiment fills cards already on screen
+TASK_PRIORITIES = {
+    "summary": "interactive",
+    "summary_map": "interactive",
+    "sentiment": "visible",
+}
+
+# Share of each budget a class has to leave untouched for the classes above it,
+# so a background prefetch can never use up the quota an interactive summary needs
+RESERVES = {
+    "interactive": 0.0,
+    "visible": 0.1,
+    "background": 0.3,
+}
+
+# Requests allowed in flight at once across all sessions
+MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+
+# Same rough estimate used everywhere else for prompt sizes
+CHARS_PER_TOKEN = 4
+
+ANONYMOUS = "anonymous"
+
+_user = contextvars.ContextVar("llm_user", default=ANONYMOUS)
+_priority = contextvars.ContextVar("llm_priority", default=None)
+
+_lock = threading.Lock()
+_scheduler = None
+
+
+def set_user(user_id: Optional[str]) -> None:
+    """Attribute LLM calls made from the current context (session, task) to a user."""
+    _user.set(str(user_id) if user_id else ANONYMOUS)
+
+
+@contextmanager
+def priority(name: str) -> Iterator[None]:
+    """Run the calls made inside the block in priority class `name`."""
+    if name not in PRIORITIES:
+        raise ValueError(f"Unknown priority {name!r}, expected one of {PRIORITIES}")
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority(task: str) -> str:
+    return _priority.get() or TASK_PRIORITIES.get(task, "visible")
+
+
+def estimate_request_tokens(messages: List[Dict[str, str]], max_tokens: Optional[int] = None) -> int:
+    """Prompt tokens plus the completion budget, the amount a request can charge to the TPM quota."""
+    prompt = sum(len(m.get('content') or '') for m in messages) // CHARS_PER_TOKEN
+    return max(1, prompt + (max_tokens or 0))
+
+
+class _Waiter:
+    """One queued request; woken through an Event (threads) or a Future (asyncio)."""
+
+    def __init__(self, priority: str, user: str, tokens: int, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.priority = priority
+        self.user = user
+        self.tokens = tokens
+        self.enqueued = time.monotonic()
+        self.granted = False
+        self.released = False
+        self.loop = loop
+        if loop:
+            self.future = loop.create_future()
+        else:
+            self.event = threading.Event()
+
+    def wake(self, release: Callable[["_Waiter"], None]) -> None:
+        """Hand the granted slot over; `release` frees it if nobody is left to use it."""
+        if self.loop:
+            try:
+                self.loop.call_soon_threadsafe(self._resolve, release)
+            except RuntimeError:
+                # Loop already closed, so its task will never run to free the slot
+                release(self)
+        else:
+            self.event.set()
+
+    def _resolve(self, release: Callable[["_Waiter"], None]) -> None:
+        if self.future.done():
+            # Cancelled after the grant was made; the task may never get to abandon it
+            release(self)
+        else:
+            self.future.set_result(True)
+
+
+class _Quota:
+    """What the provider's latest x-ratelimit-* headers said about one budget."""
+
+    def __init__(self):
+        self.limit: Optional[float] = None
+        self.remaining: Optional[float] = None
+        self.reset_at = 0.0
+        # Charged by requests granted since the headers were read
+        self.spent = 0.0
+
+    def available(self, now: float) -> Optional[float]:
+        if self.remaining is None or now >= self.reset_at:
+            return None
+        return self.remaining - self.spent
+
+
+class LLMScheduler:
+    """
+    Process-wide admission queue for LLM requests.
+
+    Every Streamlit session runs in the same process, so one scheduler sees
+    all users' calls. Requests wait in one queue per priority class; within a
+    class, users are served round-robin so a 50-article search cannot starve
+    someone else's single summary. A request is admitted when:
+
+    - fewer than `max_concurrency` requests are in flight,
+    - the local RPM/TPM buckets (rate_limiter settings) have room, and
+    - the provider's remaining-requests/-tokens from the last response
+      headers cover it, after leaving the class's reserve for higher classes.
+
+    Admission is strictly by class: while the head of a higher class is
+    waiting, lower classes wait too.
+    """
+
+    def __init__(self, requests_per_minute: int = REQUESTS_PER_MINUTE,
+                 tokens_per_minute: int = TOKENS_PER_MINUTE, max_concurrency: int = MAX_CONCURRENCY):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.quota = {'requests': _Quota(), 'tokens': _Quota()}
+        self.paused_until = 0.0
+        self.in_flight = 0
+        self.queues: Dict[str, "OrderedDict[str, deque]"] = {p: OrderedDict() for p in PRIORITIES}
+        self.stats = {p: {'granted': 0, 'in_flight': 0, 'total_wait': 0.0, 'max_wait': 0.0} for p in PRIORITIES}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    # Queue management
+
+    def _enqueue(self, waiter: _Waiter) -> _Waiter:
+        with self._cond:
+            self.queues[waiter.priority].setdefault(waiter.user, deque()).append(waiter)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="llm-scheduler", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return waiter
+
+    def _next_waiter(self) -> Optional[_Waiter]:
+        """Head of the highest non-empty class, taking users in turn."""
+        for name in PRIORITIES:
+            users = self.queues[name]
+            if users:
+                return users[next(iter(users))][0]
+        return None
+
+    def _pop(self, waiter: _Waiter) -> None:
+        users = self.queues[waiter.priority]
+        queue = users[waiter.user]
+        queue.popleft()
+        if queue:
+            # This user had a turn; the others go first next time
+            users.move_to_end(waiter.user)
+        else:
+            del users[waiter.user]
+
+    def _admission_delay(self, waiter: _Waiter) -> Optional[float]:
+        """Seconds until `waiter` may start, 0 if it can start now, None if it waits for a release."""
+        if self.in_flight >= self.max_concurrency:
+            return None
+
+        now = time.monotonic()
+        reserve = RESERVES[waiter.priority]
+        delays = [self.paused_until - now]
+        for kind, bucket, amount in (('requests', self.requests, 1), ('tokens', self.tokens, waiter.tokens)):
+            delays.append(bucket.wait_time(amount + reserve * bucket.capacity))
+            quota = self.quota[kind]
+            available = quota.available(now)
+            if available is not None and available - amount < reserve * (quota.limit or 0):
+                delays.append(quota.reset_at - now)
+        return max(0.0, *delays)
+
+    def _grant(self, waiter: _Waiter) -> None:
+        self._pop(waiter)
+        waiter.granted = True
+        self.in_flight += 1
+        self.requests.take(1)
+        self.tokens.take(waiter.tokens)
+        for kind, amount in (('requests', 1), ('tokens', waiter.tokens)):
+            self.quota[kind].spent += amount
+
+        waited = time.monotonic() - waiter.enqueued
+        stats = self.stats[waiter.priority]
+        stats['granted'] += 1
+        stats['in_flight'] += 1
+        stats['total_wait'] += waited
+        stats['max_wait'] = max(stats['max_wait'], waited)
+        waiter.wake(self._release)
+
+    def _run(self) -> None:
+        with self._cond:
+            while True:
+                waiter = self._next_waiter()
+                delay = self._admission_delay(waiter) if waiter else None
+                if waiter and delay == 0:
+                    self._grant(waiter)
+                    continue
+                self._cond.wait(delay)
+
+    def _release(self, waiter: _Waiter) -> None:
+        with self._cond:
+            # Both the waiter and its abandoning caller may free the same slot
+            if waiter.released:
+                return
+            waiter.released = True
+            self.in_flight -= 1
+            self.stats[waiter.priority]['in_flight'] -= 1
+            self._cond.notify()
+
+    def _abandon(self, waiter: _Waiter) -> None:
+        """Caller gave up (e.g. its task was cancelled): drop it from the queue or free its slot."""
+        with self._cond:
+            if not waiter.granted:
+                queue = self.queues[waiter.priority].get(waiter.user)
+                if queue and waiter in queue:
+                    queue.remove(waiter)
+                    if not queue:
+                        del self.queues[waiter.priority][waiter.user]
+                self._cond.notify()
+                return
+        self._release(waiter)
+
+    # Public API
+
+    @contextmanager
+    def slot(self, task: str, tokens: int) -> Iterator[None]:
+        """Block until a request for `task` is admitted; the slot is freed on exit."""
+        waiter = self._enqueue(_Waiter(current_priority(task), _user.get(), tokens))
+        try:
+            waiter.event.wait()
+        except BaseException:
+            self._abandon(waiter)
+            raise
+        try:
+            yield
+        finally:
+            self._release(waiter)
+
+    @asynccontextmanager
+    async def aslot(self, task: str, tokens: int):
+        """Async version of slot; waiting does not block the event loop."""
+        waiter = self._enqueue(_Waiter(current_priority(task), _user.get(), tokens, asyncio.get_running_loop()))
+        try:
+            await waiter.future
+        except BaseException:
+            self._abandon(waiter)
+            raise
+        try:
+            yield
+        finally:
+            self._release(waiter)
+
+    def observe(self, headers: Any) -> None:
+        """
+        Update the provider quota from response headers.
+
+        Args:
+            headers: Response headers (anything with .get), e.g. from a
+                raw response or a 429 error
+        """
+        now = time.monotonic()
+        with self._cond:
+            for kind, quota in self.quota.items():
+                remaining = headers.get(f'x-ratelimit-remaining-{kind}')
+                if remaining is None:
+                    continue
+                try:
+                    quota.remaining = float(remaining)
+                    quota.limit = float(headers.get(f'x-ratelimit-limit-{kind}') or quota.limit or 0)
+                except ValueError:
+                    continue
+                reset = parse_duration(headers.get(f'x-ratelimit-reset-{kind}') or '')
+                quota.reset_at = now + (reset if reset is not None else 60.0)
+                quota.spent = 0.0
+            self._cond.notify()
+
+    def observe_error(self, error: Exception) -> None:
+        """Read quota headers from a failed request; on 429 hold everyone back until Retry-After."""
+        response = getattr(error, 'response', None)
+        headers = getattr(response, 'headers', None)
+        if headers is not None:
+            self.observe(headers)
+        if getattr(response, 'status_code', None) == 429:
+            seconds = retry_after_seconds(error)
+            with self._cond:
+                self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+                self._cond.notify()
+            logger.warning(f"Rate limited by provider, pausing LLM scheduler for {seconds:.1f} seconds")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Queue depth and wait times per priority class, plus the provider quota.
+
+        Returns:
+            Dict with per-class 'queued', 'users', 'in_flight', 'granted',
+            'avg_wait' and 'max_wait' (seconds), and 'quota' with the last
+            known remaining requests/tokens
+        """
+        now = time.monotonic()
+        with self._cond:
+            classes = {}
+            for name in PRIORITIES:
+                stats = self.stats[name]
+                waiting = [w for queue in self.queues[name].values() for w in queue]
+                classes[name] = {
+                    'queued': len(waiting),
+                    'users': len(self.queues[name]),
+                    'in_flight': stats['in_flight'],
+                    'granted': stats['granted'],
+                    'avg_wait': stats['total_wait'] / stats['granted'] if stats['granted'] else 0.0,
+                    'max_wait': stats['max_wait'],
+                    'oldest_wait': max((now - w.enqueued for w in waiting), default=0.0),
+                }
+            quota = {kind: q.available(now) for kind, q in self.quota.items()}
+            return {'classes': classes, 'quota': quota, 'paused_for': max(0.0, self.paused_until - now)}
+
+
+def get_scheduler() -> LLMScheduler:
+    """Shared scheduler for the process, created on first use."""
+    global _scheduler
+    if _scheduler is None:
+        with _lock:
+            if _scheduler is None:
+                _scheduler = LLMScheduler()
+    return _scheduler
+
+
+def get_scheduler_stats() -> Dict[str, Any]:
+    return get_scheduler().get_stats()
@@ -0,0 +1,311 @@
+"""
+OpenAI-compatible stub LLM server for offline load tests and benchmarks.
+
+Answers /v1/chat/completions (and Groq's /openai/v1/chat/completions) with
+plausible sentiment JSON, batched sentiment results or summary text, with a
+configurable latency, error and rate-limit profile. Nothing leaves the
+machine and a fixed --seed makes runs reproducible.
+
+Usage:
+    python mock_llm_server.py --profile groq --port 8765
+    LLM_BASE_URL=http://127.0.0.1:8765 streamlit run app.py
+
+Profiles (individual flags override them):
+    fast   no rate limits, ~50 ms responses
+    groq   free-tier like limits (30 requests / 6000 tokens per minute)
+    flaky  slow responses with jitter and 10% server errors
+"""
+import re
+import json
+import time
+import uuid
+import random
+import hashlib
+import argparse
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from rate_limiter import TokenBucket
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+PROFILES = {
+    'fast': {'latency': 0.05, 'jitter': 0.0, 'tokens_per_second': 5000, 'error_rate': 0.0, 'rpm': 0, 'tpm': 0},
+    'groq': {'latency': 0.35, 'jitter': 0.15, 'tokens_per_second': 300, 'error_rate': 0.0, 'rpm': 30, 'tpm': 6000},
+    'flaky': {'latency': 0.6, 'jitter': 0.6, 'tokens_per_second': 150, 'error_rate': 0.1, 'rpm': 0, 'tpm': 0},
+}
+
+CHARS_PER_TOKEN = 4
+
+WORDS = ("growth", "revenue", "outlook", "regulation", "partnership", "earnings", "demand", "leadership",
+         "expansion", "guidance", "market share", "investors", "costs", "product launch", "competition")
+
+
+class MockLLM:
+    """Request accounting, rate limits and canned completions shared by all handler threads."""
+
+    def __init__(self, latency: float = 0.05, jitter: float = 0.0, tokens_per_second: float = 5000,
+                 error_rate: float = 0.0, rpm: int = 0, tpm: int = 0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'completed': 0, 'rate_limited': 0, 'errors': 0,
+                      'prompt_tokens': 0, 'completion_tokens': 0}
+
+    def admit(self, prompt_tokens: int) -> Tuple[Optional[float], Dict[str, str]]:
+        """
+        Apply the rate limits to one request.
+
+        Returns:
+            Tuple of (seconds to wait if rejected, else None; rate-limit headers)
+        """
+        with self.lock:
+            self.stats['requests'] += 1
+            retry_after = 0.0
+            for bucket, amount in ((self.requests, 1), (self.tokens, prompt_tokens)):
+                if bucket:
+                    retry_after = max(retry_after, bucket.wait_time(amount))
+            if retry_after <= 0:
+                if self.requests:
+                    self.requests.take(1)
+                if self.tokens:
+                    self.tokens.take(prompt_tokens)
+            else:
+                self.stats['rate_limited'] += 1
+            headers = self._headers()
+        return (retry_after if retry_after > 0 else None), headers
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {}
+        for name, bucket in (('requests', self.requests), ('tokens', self.tokens)):
+            if not bucket:
+                continue
+            reset = (bucket.capacity - bucket.level) / bucket.rate
+            headers[f'x-ratelimit-limit-{name}'] = str(int(bucket.capacity))
+            headers[f'x-ratelimit-remaining-{name}'] = str(max(0, int(bucket.level)))
+            headers[f'x-ratelimit-reset-{name}'] = f"{reset:.2f}s"
+        return headers
+
+    def roll_error(self) -> bool:
+        with self.lock:
+            failed = self.random.random() < self.error_rate
+            if failed:
+                self.stats['errors'] += 1
+            return failed
+
+    def first_token_delay(self) -> float:
+        with self.lock:
+            return max(0.0, self.latency + self.jitter * self.random.random())
+
+    def record(self, prompt_tokens: int, completion_tokens: int) -> None:
+        with self.lock:
+            self.stats['completed'] += 1
+            self.stats['prompt_tokens'] += prompt_tokens
+            self.stats['completion_tokens'] += completion_tokens
+
+
+def _seeded(text: str) -> random.Random:
+    """Random generator seeded by the text, so the same prompt gets the same answer."""
+    return random.Random(hashlib.sha256(text.encode('utf-8')).hexdigest())
+
+
+def _sentiment(rng: random.Random) -> Dict[str, Any]:
+    score = round(rng.uniform(-1, 1), 2)
+    label = "Positive" if score > 0.1 else "Negative" if score < -0.1 else "Neutral"
+    return {
+        "Score": score,
+        "Sentiment": label,
+        "Summary": f"The article is {label.lower()} for the company, mainly about {rng.choice(WORDS)}."
+    }
+
+
+def generate_content(messages: List[Dict[str, str]], json_mode: bool) -> str:
+    """Canned answer matching what the app expects for this kind of prompt."""
+    text = "\n".join(m.get('content') or '' for m in messages)
+    rng = _seeded(text)
+
+    if json_mode:
+        ids = re.findall(r'^### Article (\S+)', text, flags=re.MULTILINE)
+        if ids:
+            return json.dumps({"results": [dict(id=article_id, **_sentiment(rng)) for article_id in ids]})
+        return json.dumps(_sentiment(rng))
+
+    subject = re.search(r'about ([^.\n,]+)', text)
+    subject = subject.group(1).strip() if subject else "the company"
+    sentences = [
+        f"Coverage of {subject} centred on {rng.choice(WORDS)} and {rng.choice(WORDS)}.",
+        f"Several reports pointed to {rng.choice(WORDS)} as the main driver of sentiment.",
+        f"Analysts highlighted {rng.choice(WORDS)}, while concerns remained about {rng.choice(WORDS)}.",
+        f"Overall, the news flow for {subject} was mixed with a slight tilt towards {rng.choice(['optimism', 'caution'])}."
+    ]
+    return " ".join(sentences)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    llm: MockLLM = None
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def _send_json(self, status: int, payload: Dict, headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self):
+        path = self.path.replace('/openai', '', 1)
+        if path == '/v1/models':
+            self._send_json(200, {"object": "list", "data": [{"id": "mock", "object": "model"}]})
+        elif path == '/stats':
+            with self.llm.lock:
+                self._send_json(200, dict(self.llm.stats))
+        else:
+            self._send_json(404, {"error": {"message": "Not found"}})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            request = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self._send_json(400, {"error": {"message": "Invalid JSON body"}})
+            return
+
+        if self.path.replace('/openai', '', 1) != '/v1/chat/completions':
+            self._send_json(404, {"error": {"message": "Not found"}})
+            return
+
+        messages = request.get('messages', [])
+        prompt_tokens = sum(len(m.get('content') or '') for m in messages) // CHARS_PER_TOKEN
+
+        retry_after, headers = self.llm.admit(prompt_tokens)
+        if retry_after is not None:
+            headers['retry-after'] = f"{retry_after:.2f}"
+            self._send_json(429, {"error": {"message": "Rate limit reached, please retry later",
+                                            "type": "requests", "code": "rate_limit_exceeded"}}, headers)
+            return
+
+        time.sleep(self.llm.first_token_delay())
+        if self.llm.roll_error():
+            self._send_json(503, {"error": {"message": "Service temporarily unavailable",
+                                            "type": "internal_server_error"}}, headers)
+            return
+
+        json_mode = (request.get('response_format') or {}).get('type') == 'json_object'
+        content = generate_content(messages, json_mode)
+        completion_tokens = max(1, len(content) // CHARS_PER_TOKEN)
+        model = request.get('model', 'mock')
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                 "total_tokens": prompt_tokens + completion_tokens}
+
+        if request.get('stream'):
+            self._stream(content, completion_id, created, model, headers)
+        else:
+            time.sleep(completion_tokens / self.llm.tokens_per_second)
+            self._send_json(200, {
+                "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                             "finish_reason": "stop"}],
+                "usage": usage
+            }, headers)
+        self.llm.record(prompt_tokens, completion_tokens)
+
+    def _stream(self, content: str, completion_id: str, created: int, model: str, headers: Dict[str, str]) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+
+        def event(delta: Dict, finish_reason: Optional[str] = None) -> bytes:
+            chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                     "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+            return f"data: {json.dumps(chunk)}\n\n".encode('utf-8')
+
+        self._write_chunk(event({"role": "assistant", "content": ""}))
+        # Roughly one token per piece, paced at tokens_per_second
+        pieces = re.findall(r'\S+\s*', content)
+        for piece in pieces:
+            self._write_chunk(event({"content": piece}))
+            time.sleep(max(1, len(piece) // CHARS_PER_TOKEN) / self.llm.tokens_per_second)
+        self._write_chunk(event({}, "stop"))
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._write_chunk(b"")
+
+
+def make_server(host: str = "127.0.0.1", port: int = 8765, **profile: Any) -> ThreadingHTTPServer:
+    """Build a server; port 0 picks a free port (see server.server_address)."""
+    handler = type("MockHandler", (Handler,), {"llm": MockLLM(**profile)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_thread(profile: str = "fast", **overrides: Any) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Run a server in a background thread, e.g. from a benchmark script.
+
+    Returns:
+        Tuple of (server, base URL to use as LLM_BASE_URL); call
+        server.shutdown() when done
+    """
+    options = dict(PROFILES[profile], **overrides)
+    server = make_server(port=options.pop('port', 0), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="fast")
+    parser.add_argument("--latency", type=float, help="Seconds before the first token")
+    parser.add_argument("--jitter", type=float, help="Extra random latency, up to this many seconds")
+    parser.add_argument("--tokens-per-second", type=float, help="Completion generation speed")
+    parser.add_argument("--error-rate", type=float, help="Share of requests answered with 503")
+    parser.add_argument("--rpm", type=int, help="Requests per minute before 429 (0 = unlimited)")
+    parser.add_argument("--tpm", type=int, help="Prompt tokens per minute before 429 (0 = unlimited)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for latency jitter and errors")
+    args = parser.parse_args()
+
+    options = dict(PROFILES[args.profile])
+    for name in options:
+        value = getattr(args, name)
+        if value is not None:
+            options[name] = value
+
+    server = make_server(args.host, args.port, seed=args.seed, **options)
+    logger.info(f"Mock LLM server ({args.profile}: {options}) listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -1,54 +1,21 @@
 import os
-from datetime import datetime
-from pymongo import MongoClient, IndexModel, ASCENDING
+from datetime import datetime, timedelta
+from pymongo import MongoClient, IndexModel, UpdateOne, ASCENDING
 from pymongo.errors import DuplicateKeyError
 import bcrypt
 from dotenv import load_dotenv
 from typing import List, Optional, Tuple, Dict, Any
-from datetime import datetime
-
-# Load environment variables
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 
 from pathlib import Path
 
-# Get the directory where this script is located
-script_dir = Path(__file__).parent
-print(f"Script directory: {script_dir}")
-print(f"Files in script directory: {os.listdir(script_dir)}")
+from sentiment_cache import normalize_entity
 
 # Load .env file from the same directory as this script
-env_path = script_dir / '.env'
-print(f"Loading .env file from: {env_path}")
-
-# Check if .env file exists and is readable
-if not env_path.exists():
-    print("❌ Error: .env file does not exist at the expected location")
-    print(f"Current directory: {os.getcwd()}")
-    print(f"Directory contents: {os.listdir(script_dir)}")
-else:
-    print(f"✅ .env file exists at: {env_path}")
-    try:
-        with open(env_path, 'r') as f:
-            print("🔒 .env file contents (first 3 lines):")
-            for i, line in enumerate(f):
-                if i < 3:  # Only show first 3 lines for security
-                    print(f"   {line.strip()}")
-                if i == 2 and len(f.readlines()) > 3:
-                    print("   ... (more lines not shown for security)")
-                    break
-    except Exception as e:
-        print(f"❌ Error reading .env file: {e}")
-
-# Load environment variables
+env_path = Path(__file__).parent / '.env'
 load_dotenv(env_path, override=True)
 
-# Debug: Print environment variables
-print("Environment variables loaded:", os.environ.get('MONGODB_URI') is not None)
-if os.environ.get('MONGODB_URI'):
-    print("MongoDB URI found in environment variables")
-else:
-    print("MongoDB URI NOT found in environment variables")
-
 # Available domains for user interests
 AVAILABLE_DOMAINS = [
     'Technology', 'Business', 'Science', 'Health',
@@ -56,25 +23,83 @@ AVAILABLE_DOMAINS = [
     'Environment', 'Finance', 'Travel', 'Food', 'Fashion'
 ]
 
-# MongoDB connection
+# MongoDB connection, opened on first use (see __getattr__ below) so importing
+# this module costs no network round trips
 MONGODB_URI = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/')
-client = MongoClient(MONGODB_URI)
-db = client['news_scraper_db']
-users_collection = db['users']
-search_history_collection = db['search_history']
-rss_feeds_collection = db['rss_feeds']
+DB_NAME = 'news_scraper_db'
+
+# Module attribute -> collection name; `from models import users_collection` still works
+COLLECTIONS = {
+    'users_collection': 'users',
+    'search_history_collection': 'search_history',
+    'rss_feeds_collection': 'rss_feeds',
+    'sentiment_cache_collection': 'sentiment_cache',
+    'cache_stats_collection': 'cache_stats',
+    'article_analyses_collection': 'article_analyses',
+    'user_feeds_collection': 'user_feeds',
+    'feed_domains_collection': 'feed_domains',
+}
+
+# Query parameters that only track where a click came from; dropped from canonical URLs
+TRACKING_PARAMS = {'fbclid', 'gclid', 'mc_cid', 'mc_eid', 'ocid', 'cmpid', 'ref', 'rss'}
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client() -> MongoClient:
+    """Shared MongoClient; the first call also creates indexes and the admin user."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = MongoClient(MONGODB_URI)
+                _initialize_database(_client[DB_NAME])
+    return _client
+
+def get_collection(name: str):
+    """Collection `name` of the app database."""
+    return get_client()[DB_NAME][name]
+
+def _initialize_database(db) -> None:
+    """One-time setup that used to run at import: indexes and the default admin user."""
+    try:
+        # Create indexes for RSS feeds
+        db['rss_feeds'].create_index([("url", ASCENDING)], unique=True)
+        db['rss_feeds'].create_index([("is_active", ASCENDING)])
+
+        # Create indexes
+        db['users'].create_index('username', unique=True)
+        db['users'].create_index('email', unique=True)
+
+        # Sentiment results shared across users; entries expire after 30 days
+        db['sentiment_cache'].create_index('key', unique=True)
+        db['sentiment_cache'].create_index('created_at', expireAfterSeconds=30 * 86400)
+
+        # One analysis per (entity, article) shared by every user's searches
+        db['article_analyses'].create_index([("entity", ASCENDING), ("url", ASCENDING)], unique=True)
+        db['article_analyses'].create_index([("updated_at", ASCENDING)])
+        db['search_history'].create_index([("user_id", ASCENDING), ("timestamp", ASCENDING)])
+
+        # Materialized Personalized Feeds: one document per user and per interest
+        db['user_feeds'].create_index('user_id', unique=True)
+        db['feed_domains'].create_index('domain', unique=True)
+    except Exception as e:
+        print(f"Error creating indexes: {str(e)}")
 
-# Create indexes for RSS feeds
-rss_feeds_collection.create_index([("url", ASCENDING)], unique=True)
-rss_feeds_collection.create_index([("is_active", ASCENDING)])
+    create_admin_user()
 
-# Create indexes
-users_collection.create_index('username', unique=True)
-users_collection.create_index('email', unique=True)
+def __getattr__(name: str):
+    if name == 'client':
+        return get_client()
+    if name == 'db':
+        return get_client()[DB_NAME]
+    if name in COLLECTIONS:
+        return get_collection(COLLECTIONS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def get_user(username: str):
     """Retrieve a user by username."""
-    return users_collection.find_one({"$or": [{"username": username}, {"email": username}]})
+    return get_collection('users').find_one({"$or": [{"username": username}, {"email": username}]})
 
 def verify_user(username: str, password: str):
     """Verify user credentials.
@@ -124,7 +149,7 @@ def create_user(username: str, email: str, password: str, role: str = 'user', in
     """
     try:
         # Check if username or email already exists
-        if users_collection.find_one({"$or": [{"username": username}, {"email": email}]}):
+        if get_collection('users').find_one({"$or": [{"username": username}, {"email": email}]}):
             return None, "Username or email already exists"
             
         # Validate interests if provided
@@ -150,7 +175,7 @@ def create_user(username: str, email: str, password: str, role: str = 'user', in
         }
         
         # Insert into database
-        result = users_collection.insert_one(user)
+        result = get_collection('users').insert_one(user)
         print(f"User created: {username}")
         return str(result.inserted_id), None
         
@@ -160,8 +185,90 @@ def create_user(username: str, email: str, password: str, role: str = 'user', in
         print(f"Error creating user {username}: {str(e)}")
         return None, str(e)
 
+def canonical_url(url: str) -> str:
+    """URL with tracking parameters, fragment, default port and trailing slash removed.
+    
+    The same article linked from different feeds maps to one canonical URL,
+    which keys its entry in `article_analyses`.
+    """
+    parts = urlsplit((url or '').strip())
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if not k.lower().startswith('utm_') and k.lower() not in TRACKING_PARAMS]
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower() or 'https', host, path, urlencode(sorted(query)), ''))
+
+def get_article_analyses(entity: str, urls: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Stored analyses for many articles with a single `$in` query.
+    
+    Args:
+        entity: Company or person the articles were analyzed for
+        urls: Article URLs as the caller has them (canonicalized here)
+        
+    Returns:
+        dict: Analysis document per caller URL that has one
+    """
+    by_canonical = {}
+    for url in urls:
+        if url:
+            by_canonical.setdefault(canonical_url(url), []).append(url)
+    if not by_canonical:
+        return {}
+    try:
+        docs = get_collection('article_analyses').find(
+            {"entity": normalize_entity(entity), "url": {"$in": list(by_canonical)}}
+        )
+        return {url: doc for doc in docs for url in by_canonical.get(doc['url'], [])}
+    except Exception as e:
+        print(f"Error fetching article analyses: {str(e)}")
+        return {}
+
+def save_article_analyses(entity: str, articles: List[Dict[str, Any]]) -> bool:
+    """Insert or update shared article analyses in one bulk write.
+    
+    Only the fields present on each article are written, so metadata saved
+    when a search is logged and the sentiment saved after analysis end up in
+    the same document.
+    
+    Args:
+        entity: Company or person the articles were analyzed for
+        articles: Dicts with 'url' and any of 'title', 'source',
+            'publish_date', 'content', 'sentiment' and 'version'
+        
+    Returns:
+        bool: True if the write succeeded
+    """
+    now = datetime.utcnow()
+    operations = []
+    for article in articles:
+        if not article.get('url'):
+            continue
+        fields = {field: article[field] for field in
+                  ('title', 'source', 'publish_date', 'content', 'sentiment', 'version') if field in article}
+        if hasattr(fields.get('publish_date'), 'isoformat'):
+            fields['publish_date'] = fields['publish_date'].isoformat()
+        fields['updated_at'] = now
+        key = {"entity": normalize_entity(entity), "url": canonical_url(article['url'])}
+        operations.append(UpdateOne(key, {"$set": fields, "$setOnInsert": {"created_at": now}}, upsert=True))
+    if not operations:
+        return True
+    try:
+        get_collection('article_analyses').bulk_write(operations, ordered=False)
+        return True
+    except Exception as e:
+        print(f"Error saving article analyses: {str(e)}")
+        return False
+
 def log_search(user_id: str, query: str, results_count: int, articles: list = None):
-    """Log a search query with optional article details.
+    """Log a search query with references to the articles it returned.
+    
+    Article content and analyses live once in `article_analyses`, keyed by
+    entity and canonical URL; the search history entry only keeps the URL
+    and title of each article (see resolve_search_articles).
     
     Args:
         user_id: ID of the user who performed the search
@@ -173,37 +280,77 @@ def log_search(user_id: str, query: str, results_count: int, articles: list = No
         search_log = {
             "user_id": user_id,
             "query": query,
+            "entity": normalize_entity(query),
             "results_count": results_count,
             "timestamp": datetime.utcnow(),
             "articles": []
         }
         
-        # Add article details if provided
+        # Add article references if provided
         if articles:
-            # Clean up articles to store only necessary fields and make them JSON serializable
-            for article in articles:
-                # Create a clean article object with only the fields we want to store
-                clean_article = {
-                    'title': article.get('title', ''),
-                    'url': article.get('url', ''),
-                    'source': article.get('source', ''),
-                    'publish_date': article.get('publish_date', ''),
-                    'summary': article.get('summary', ''),
-                    'content': article.get('content', ''),
-                    'sentiment': article.get('sentiment', {})
-                }
-                # Convert datetime objects to string if they exist
-                if 'publish_date' in article and hasattr(article['publish_date'], 'isoformat'):
-                    clean_article['publish_date'] = article['publish_date'].isoformat()
-                
-                search_log['articles'].append(clean_article)
+            articles = [article for article in articles if article.get('url')]
+            save_article_analyses(query, [
+                {field: article.get(field, '') for field in ('url', 'title', 'source', 'publish_date', 'content')}
+                for article in articles
+            ])
+            search_log['articles'] = [
+                {'url': canonical_url(article['url']), 'title': article.get('title', '')}
+                for article in articles
+            ]
         
-        search_history_collection.insert_one(search_log)
+        get_collection('search_history').insert_one(search_log)
         return True
     except Exception as e:
         print(f"Error logging search: {str(e)}")
         return False
 
+def resolve_search_articles(searches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Replace article references in search history entries with the stored details.
+    
+    All referenced analyses are fetched with one query. Entries logged before
+    references were introduced carry full copies and are left as they are.
+    
+    Args:
+        searches: Search history documents
+        
+    Returns:
+        list: The same documents, each article with title, url, source,
+            publish_date, summary and sentiment ({'label', 'score'})
+    """
+    wanted = {}
+    for search in searches:
+        if 'entity' in search:
+            wanted.setdefault(search['entity'], set()).update(a['url'] for a in search.get('articles', []))
+    if not wanted:
+        return searches
+    try:
+        docs = get_collection('article_analyses').find(
+            {"$or": [{"entity": entity, "url": {"$in": list(urls)}} for entity, urls in wanted.items()]},
+            {"content": 0}
+        )
+        analyses = {(doc['entity'], doc['url']): doc for doc in docs}
+    except Exception as e:
+        print(f"Error resolving search articles: {str(e)}")
+        return searches
+
+    for search in searches:
+        if 'entity' not in search:
+            continue
+        resolved = []
+        for reference in search.get('articles', []):
+            doc = analyses.get((search['entity'], reference['url']), {})
+            sentiment = doc.get('sentiment') or {}
+            resolved.append({
+                'title': doc.get('title') or reference.get('title', ''),
+                'url': reference['url'],
+                'source': doc.get('source', ''),
+                'publish_date': doc.get('publish_date', ''),
+                'summary': sentiment.get('Summary', ''),
+                'sentiment': {'label': sentiment['Sentiment'], 'score': float(sentiment['Score'])} if sentiment else {}
+            })
+        search['articles'] = resolved
+    return searches
+
 def get_search_history(user_id: str, limit: int = 10):
     """Retrieve search history for a user.
     
@@ -215,7 +362,7 @@ def get_search_history(user_id: str, limit: int = 10):
         list: List of search history entries, most recent first
     """
     try:
-        return list(search_history_collection
+        return list(get_collection('search_history')
                   .find({"user_id": user_id})
                   .sort("timestamp", -1)
                   .limit(limit))
@@ -231,7 +378,7 @@ def create_admin_user():
         admin_password = os.getenv('ADMIN_PASSWORD', 'admin123')
         
         # Check if admin user already exists
-        if not users_collection.find_one({"username": admin_username}):
+        if not get_collection('users').find_one({"username": admin_username}):
             user_id, error = create_user(
                 username=admin_username,
                 email=admin_email,
@@ -265,7 +412,7 @@ def add_rss_feed(url: str, is_active: bool = True) -> Tuple[Optional[str], Optio
             return None, "Invalid URL. Must start with http:// or https://"
             
         # Check if URL already exists
-        if rss_feeds_collection.find_one({"url": url}):
+        if get_collection('rss_feeds').find_one({"url": url}):
             return None, "This RSS feed URL already exists"
             
         feed = {
@@ -276,7 +423,7 @@ def add_rss_feed(url: str, is_active: bool = True) -> Tuple[Optional[str], Optio
             "last_error": None
         }
         
-        result = rss_feeds_collection.insert_one(feed)
+        result = get_collection('rss_feeds').insert_one(feed)
         return str(result.inserted_id), None
         
     except Exception as e:
@@ -303,14 +450,14 @@ def update_rss_feed(feed_id: str, **updates) -> Tuple[bool, Optional[str]]:
                 return False, "Invalid URL. Must start with http:// or https://"
                 
             # Check if URL is already used by another feed
-            existing = rss_feeds_collection.find_one({
+            existing = get_collection('rss_feeds').find_one({
                 "url": updates['url'],
                 "_id": {"$ne": ObjectId(feed_id)}
             })
             if existing:
                 return False, "This URL is already used by another feed"
             
-        result = rss_feeds_collection.update_one(
+        result = get_collection('rss_feeds').update_one(
             {"_id": ObjectId(feed_id)},
             {"$set": updates}
         )
@@ -333,7 +480,7 @@ def delete_rss_feed(feed_id: str) -> Tuple[bool, Optional[str]]:
         tuple: (success, error_message)
     """
     try:
-        result = rss_feeds_collection.delete_one({"_id": ObjectId(feed_id)})
+        result = get_collection('rss_feeds').delete_one({"_id": ObjectId(feed_id)})
         if result.deleted_count == 0:
             return False, "Feed not found"
         return True, None
@@ -351,7 +498,7 @@ def get_rss_feeds(active_only: bool = False) -> List[Dict[str, Any]]:
     """
     try:
         query = {"is_active": True} if active_only else {}
-        feeds = list(rss_feeds_collection.find(query, {"url": 1, "is_active": 1, "_id": 1}))
+        feeds = list(get_collection('rss_feeds').find(query, {"url": 1, "is_active": 1, "_id": 1}))
         
         # Convert ObjectId to string for JSON serialization
         for feed in feeds:
@@ -362,5 +509,31 @@ def get_rss_feeds(active_only: bool = False) -> List[Dict[str, Any]]:
         print(f"Error getting RSS feeds: {str(e)}")
         return []
 
-# Create admin user on module import
-create_admin_user()
+def acquire_lease(name: str, owner: str, seconds: float) -> bool:
+    """Hold the named lease for `seconds` unless another owner holds it and it has not expired.
+    
+    Lets every app process schedule the same periodic job while only one of
+    them runs it; the owner renews by acquiring again.
+    
+    Args:
+        name: Lease name, one per job
+        owner: Identifies the process taking the lease
+        seconds: How long the lease is held from now
+        
+    Returns:
+        bool: True if `owner` holds the lease now
+    """
+    now = datetime.utcnow()
+    try:
+        get_collection('job_leases').update_one(
+            {"_id": name, "$or": [{"owner": owner}, {"expires_at": {"$lt": now}}]},
+            {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=seconds)}},
+            upsert=True
+        )
+        return True
+    except DuplicateKeyError:
+        # Held by someone else: the upsert tried to insert a second document with the same _id
+        return False
+    except Exception as e:
+        print(f"Error acquiring lease {name}: {str(e)}")
+        return False
@@ -11,11 +11,12 @@ import re
 import json
 import os
 import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from pymongo import MongoClient
-
-# Ensure cache directory exists
-os.makedirs('cache/rss_cache', exist_ok=True)
+from urllib3.util.retry import Retry
+import extraction_recipes
 
 # Configure logging
 logging.basicConfig(
@@ -26,10 +27,16 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Cache configuration
-CACHE_DIR = Path("./cache/rss_cache")
-CACHE_DIR.mkdir(parents=True, exist_ok=True)
+CACHE_DIR = Path("./cache/rss_cache")  # Created on first write
 CACHE_TTL = timedelta(hours=24)  # Cache for 24 hours
 
+# Entries read from each feed per search
+MAX_ENTRIES_PER_FEED = 20
+
+# Feeds downloaded and articles extracted at the same time by get_news_for_domains
+FEED_FETCH_WORKERS = int(os.getenv("FEED_FETCH_WORKERS", "8"))
+ARTICLE_EXTRACT_WORKERS = int(os.getenv("ARTICLE_EXTRACT_WORKERS", "8"))
+
 # User agent for requests
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 
@@ -799,10 +806,7 @@ def extract_article_content_with_robust_images(url: str) -> Optional[dict]:
             'DNT': '1',
         }
         
-        session = requests.Session()
-        session.headers.update(headers)
-        
-        response = session.get(url, timeout=15)
+        response = get_http_session().get(url, headers=headers, timeout=15)
         response.raise_for_status()
         
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -887,46 +891,89 @@ def save_to_cache(cache_key: str, data: List[Dict]) -> None:
     """Save data to cache"""
     try:
         cache_file = CACHE_DIR / f"{cache_key}.json"
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
         with open(cache_file, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
     except Exception as e:
         logger.warning(f"Error writing to cache file {cache_file}: {e}")
 
-# Database connection
-try:
-    DB_URI = os.getenv('MONGODB_URI')
-    if not DB_URI:
-        raise ValueError("MONGODB_URI environment variable is not set")
-        
-    client = MongoClient(
-        DB_URI,
-        serverSelectionTimeoutMS=5000,  # 5 second timeout
-        socketTimeoutMS=30000,
-        connectTimeoutMS=10000,
-        retryWrites=True,
-        w='majority'
-    )
-    
-    # Test the connection
-    client.admin.command('ping')
-    logger.info("✅ Successfully connected to MongoDB")
-    
-    db = client.get_database('news_scraper_db')
-    rss_feeds_collection = db['rss_feeds']
-    
-except Exception as e:
-    logger.error(f"❌ Failed to connect to MongoDB: {str(e)}")
-    logger.warning("⚠️ Running in limited mode - RSS feed timestamps won't be updated")
-    # Create a dummy client to prevent further errors
-    class DummyMongoClient:
-        def __getattr__(self, name):
-            return self
-        def __call__(self, *args, **kwargs):
-            return None
-    
-    client = DummyMongoClient()
-    db = client
-    rss_feeds_collection = DummyMongoClient()
+# Database connection, checked on the first feed update instead of at import
+class DummyMongoClient:
+    """Stand-in used when MongoDB is unreachable, so feed updates become no-ops."""
+    def __getattr__(self, name):
+        return self
+    def __call__(self, *args, **kwargs):
+        return None
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+def get_http_session() -> requests.Session:
+    """
+    Session shared by article extraction, with retries and a connection pool,
+    so repeated requests to the same publisher reuse their connection.
+    """
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=20,
+                pool_maxsize=20,
+                max_retries=Retry(
+                    total=3,
+                    status_forcelist=[408, 429, 500, 502, 503, 504],
+                    allowed_methods=["GET", "POST"],
+                    backoff_factor=1
+                )
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _http_session = session
+    return _http_session
+
+_rss_feeds_collection = None
+_rss_feeds_lock = threading.Lock()
+
+def get_rss_feeds_collection():
+    """
+    rss_feeds collection for last_checked/last_error updates.
+
+    The first call connects with a short server-selection timeout and pings
+    the server; if that fails the fetcher runs in limited mode for the rest
+    of the process.
+    """
+    global _rss_feeds_collection
+    with _rss_feeds_lock:
+        if _rss_feeds_collection is None:
+            _rss_feeds_collection = _connect_rss_feeds_collection()
+    return _rss_feeds_collection
+
+def _connect_rss_feeds_collection():
+    try:
+        DB_URI = os.getenv('MONGODB_URI')
+        if not DB_URI:
+            raise ValueError("MONGODB_URI environment variable is not set")
+            
+        client = MongoClient(
+            DB_URI,
+            serverSelectionTimeoutMS=5000,  # 5 second timeout
+            socketTimeoutMS=30000,
+            connectTimeoutMS=10000,
+            retryWrites=True,
+            w='majority'
+        )
+        
+        # Test the connection
+        client.admin.command('ping')
+        logger.info("✅ Successfully connected to MongoDB")
+        
+        return client.get_database('news_scraper_db')['rss_feeds']
+        
+    except Exception as e:
+        logger.error(f"❌ Failed to connect to MongoDB: {str(e)}")
+        logger.warning("⚠️ Running in limited mode - RSS feed timestamps won't be updated")
+        return DummyMongoClient()
 
 def get_active_rss_feeds():
     """Fetch active RSS feeds from the database"""
@@ -962,7 +1009,10 @@ def clean_url(url: str) -> str:
     except:
         return url
 
-def get_article_image(soup, base_url):
+# Content "selector" name used when text density analysis found the article body
+DENSITY_STRATEGY = '__density__'
+
+def get_article_image(soup, base_url, preferred_strategy: Optional[str] = None, trace: Optional[Dict[str, Any]] = None):
     """
     Enhanced and reliable image extraction for articles with multiple fallback strategies.
     Returns the first valid image URL found, or None if no suitable image is found.
@@ -970,6 +1020,10 @@ def get_article_image(soup, base_url):
     Args:
         soup: BeautifulSoup object of the page
         base_url: Base URL for resolving relative URLs
+        preferred_strategy: Name of a strategy to try before the default order
+            (e.g. 'meta:0', 'content'), usually taken from the host's recipe
+        trace: Optional dict that receives the winning 'strategy' and the
+            number of 'attempts' made
         
     Returns:
         str: Absolute URL of the best image found, or None
@@ -1106,15 +1160,16 @@ def get_article_image(soup, base_url):
         {'rel': 'shortcut icon'}
     ]
     
-    # Try meta tags first
-    for meta in meta_sources:
-        img_url = get_image_from_meta(soup, meta, 'content')
+    def try_meta(index):
+        """Strategy: a single Open Graph / Twitter meta tag"""
+        img_url = get_image_from_meta(soup, meta_sources[index], 'content')
         if img_url:
-            logger.debug(f"✅ Found image via meta {meta}: {img_url}")
-            return img_url
+            logger.debug(f"✅ Found image via meta {meta_sources[index]}: {img_url}")
+        return img_url
     
-    # Try link tags
-    for link in link_sources:
+    def try_link(index):
+        """Strategy: a single <link> tag"""
+        link = link_sources[index]
         try:
             element = soup.find('link', attrs=link)
             if element and element.get('href'):
@@ -1127,119 +1182,156 @@ def get_article_image(soup, base_url):
                         return abs_url
         except Exception as e:
             logger.debug(f"Error processing link tag: {e}")
-            continue
+        return None
     
-    # 2. Try to find any image in the article content
-    article = soup.find('article') or soup.find('div', class_=lambda x: x and any(cls in (x or '').lower() for cls in ['article', 'post', 'content', 'main', 'entry', 'story', 'news', 'body']))
-    if not article:
-        # Try to find any div that might contain article content
-        article = soup.find('div', id=lambda x: x and any(cls in x.lower() for cls in ['content', 'main', 'article', 'post', 'story', 'news', 'body']))
+    def try_content():
+        # 2. Try to find any image in the article content
+        article = soup.find('article') or soup.find('div', class_=lambda x: x and any(cls in (x or '').lower() for cls in ['article', 'post', 'content', 'main', 'entry', 'story', 'news', 'body']))
+        if not article:
+            # Try to find any div that might contain article content
+            article = soup.find('div', id=lambda x: x and any(cls in x.lower() for cls in ['content', 'main', 'article', 'post', 'story', 'news', 'body']))
     
-    content = article if article else soup
+        content = article if article else soup
     
-    # Look for all images in the content
-    imgs = content.find_all('img')
-    logger.debug(f"Found {len(imgs)} potential images in content")
+        # Look for all images in the content
+        imgs = content.find_all('img')
+        logger.debug(f"Found {len(imgs)} potential images in content")
     
-    # If no images found in article, try to find any image in the page
-    if not imgs:
-        imgs = soup.find_all('img')
-        logger.debug(f"No images in article, found {len(imgs)} images in entire page")
-        for img in imgs:
-            try:
-                if not img.get('src'):
-                    continue
-                    
-                img_url = img['src'].strip()
-                if not is_image_valid(img_url):
-                    # Try data-src or other common lazy-loading attributes
-                    for attr in ['data-src', 'data-lazy-src', 'data-original', 'data-srcset']:
-                        if img.get(attr):
-                            img_url = img[attr].split(' ')[0].strip()  # Handle srcset
-                            if is_image_valid(img_url):
-                                break
-                    else:
+        # If no images found in article, try to find any image in the page
+        if not imgs:
+            imgs = soup.find_all('img')
+            logger.debug(f"No images in article, found {len(imgs)} images in entire page")
+            for img in imgs:
+                try:
+                    if not img.get('src'):
                         continue
+                    
+                    img_url = img['src'].strip()
+                    if not is_image_valid(img_url):
+                        # Try data-src or other common lazy-loading attributes
+                        for attr in ['data-src', 'data-lazy-src', 'data-original', 'data-srcset']:
+                            if img.get(attr):
+                                img_url = img[attr].split(' ')[0].strip()  # Handle srcset
+                                if is_image_valid(img_url):
+                                    break
+                        else:
+                            continue
                 
-                abs_url = make_absolute_url(img_url, base_url)
-                if abs_url and validate_image_url_robust(abs_url):
-                    # Check image dimensions if available
-                    width = int(img.get('width', 0) or 0)
-                    height = int(img.get('height', 0) or 0)
+                    abs_url = make_absolute_url(img_url, base_url)
+                    if abs_url and validate_image_url_robust(abs_url):
+                        # Check image dimensions if available
+                        width = int(img.get('width', 0) or 0)
+                        height = int(img.get('height', 0) or 0)
                     
-                    # Prefer larger images but not too large (likely banners)
-                    if 200 < width < 2000 and 200 < height < 2000:
-                        logger.debug(f"✅ Found content image: {abs_url} ({width}x{height})")
-                        return abs_url
+                        # Prefer larger images but not too large (likely banners)
+                        if 200 < width < 2000 and 200 < height < 2000:
+                            logger.debug(f"✅ Found content image: {abs_url} ({width}x{height})")
+                            return abs_url
                     
-                    # If no dimensions, still consider it
-                    if width == 0 and height == 0:
-                        logger.debug(f"✅ Found content image (no dimensions): {abs_url}")
-                        return abs_url
+                        # If no dimensions, still consider it
+                        if width == 0 and height == 0:
+                            logger.debug(f"✅ Found content image (no dimensions): {abs_url}")
+                            return abs_url
                         
-            except Exception as e:
-                logger.debug(f"Error processing image: {e}")
-                continue
-    
-    # 3. Try to find any image in the page
-    all_imgs = soup.find_all('img')
-    logger.debug(f"Found {len(all_imgs)} total images on page")
-    
-    # Log first 5 images for debugging
-    for i, img in enumerate(all_imgs[:5]):
-        src = img.get('src', 'no-src')
-        classes = ' '.join(img.get('class', [])) if img.get('class') else 'no-class'
-        logger.debug(f"Image {i+1}: src='{src}', classes='{classes}'")
-        for img in all_imgs:
-            try:
-                if not img.get('src'):
+                except Exception as e:
+                    logger.debug(f"Error processing image: {e}")
                     continue
+        return None
+    
+    def try_page():
+        # 3. Try to find any image in the page
+        all_imgs = soup.find_all('img')
+        logger.debug(f"Found {len(all_imgs)} total images on page")
+    
+        # Log first 5 images for debugging
+        for i, img in enumerate(all_imgs[:5]):
+            src = img.get('src', 'no-src')
+            classes = ' '.join(img.get('class', [])) if img.get('class') else 'no-class'
+            logger.debug(f"Image {i+1}: src='{src}', classes='{classes}'")
+            for img in all_imgs:
+                try:
+                    if not img.get('src'):
+                        continue
                     
-                img_url = img['src'].strip()
-                if not is_image_valid(img_url):
-                    continue
+                    img_url = img['src'].strip()
+                    if not is_image_valid(img_url):
+                        continue
                     
-                abs_url = make_absolute_url(img_url, base_url)
-                if abs_url and validate_image_url_robust(abs_url):
-                    logger.debug(f"✅ Found page image: {abs_url}")
-                    return abs_url
+                    abs_url = make_absolute_url(img_url, base_url)
+                    if abs_url and validate_image_url_robust(abs_url):
+                        logger.debug(f"✅ Found page image: {abs_url}")
+                        return abs_url
                     
-            except Exception as e:
-                logger.debug(f"Error processing page image: {e}")
-                continue
+                except Exception as e:
+                    logger.debug(f"Error processing page image: {e}")
+                    continue
+        return None
     
-    # 4. Try to find background images in CSS
-    try:
-        for element in soup.find_all(style=True):
-            style = element['style']
-            if 'background' in style and 'url(' in style:
-                # Extract URL from background style
-                start = style.find('url(') + 4
-                end = style.find(')', start)
-                if start > 3 and end > start:
-                    img_url = style[start:end].strip('"\'')
-                    if is_image_valid(img_url):
-                        abs_url = make_absolute_url(img_url, base_url)
+    def try_background():
+        # 4. Try to find background images in CSS
+        try:
+            for element in soup.find_all(style=True):
+                style = element['style']
+                if 'background' in style and 'url(' in style:
+                    # Extract URL from background style
+                    start = style.find('url(') + 4
+                    end = style.find(')', start)
+                    if start > 3 and end > start:
+                        img_url = style[start:end].strip('"\'')
+                        if is_image_valid(img_url):
+                            abs_url = make_absolute_url(img_url, base_url)
+                            if abs_url and validate_image_url_robust(abs_url):
+                                logger.debug(f"✅ Found background image: {abs_url}")
+                                return abs_url
+        except Exception as e:
+            logger.debug(f"Error finding background images: {e}")
+        return None
+    
+    def try_head():
+        # 5. Last resort: Try to find any image in the head section
+        try:
+            head = soup.find('head')
+            if head:
+                # Look for meta tags with image URLs
+                for meta in head.find_all('meta', content=True):
+                    content = meta['content'].strip()
+                    if is_image_valid(content):
+                        abs_url = make_absolute_url(content, base_url)
                         if abs_url and validate_image_url_robust(abs_url):
-                            logger.debug(f"✅ Found background image: {abs_url}")
+                            logger.debug(f"✅ Found image in head meta: {abs_url}")
                             return abs_url
-    except Exception as e:
-        logger.debug(f"Error finding background images: {e}")
+        except Exception as e:
+            logger.debug(f"Error checking head section: {e}")
     
-    # 5. Last resort: Try to find any image in the head section
-    try:
-        head = soup.find('head')
-        if head:
-            # Look for meta tags with image URLs
-            for meta in head.find_all('meta', content=True):
-                content = meta['content'].strip()
-                if is_image_valid(content):
-                    abs_url = make_absolute_url(content, base_url)
-                    if abs_url and validate_image_url_robust(abs_url):
-                        logger.debug(f"✅ Found image in head meta: {abs_url}")
-                        return abs_url
-    except Exception as e:
-        logger.debug(f"Error checking head section: {e}")
+        return None
+
+    # Strategies in their default order. The names are what extraction
+    # recipes remember per host (see extraction_recipes.py).
+    strategies = [(f"meta:{i}", lambda i=i: try_meta(i)) for i in range(len(meta_sources))]
+    strategies += [(f"link:{i}", lambda i=i: try_link(i)) for i in range(len(link_sources))]
+    strategies += [
+        ('content', try_content),
+        ('page', try_page),
+        ('background', try_background),
+        ('head', try_head)
+    ]
+    
+    default_rank = {name: rank for rank, (name, _) in enumerate(strategies, 1)}
+    
+    # Try the strategy that worked last time for this host first,
+    # the rest keep their default order as fallback
+    if preferred_strategy:
+        strategies.sort(key=lambda s: s[0] != preferred_strategy)
+    
+    for attempt, (name, strategy) in enumerate(strategies, 1):
+        img_url = strategy()
+        if img_url:
+            if trace is not None:
+                trace.update({'strategy': name, 'attempts': attempt, 'rank': default_rank[name]})
+            return img_url
+    
+    if trace is not None:
+        trace.update({'strategy': None, 'attempts': len(strategies)})
     
     # Log all image sources for debugging
     logger.debug("\n" + "="*50 + "\nALL IMAGE SOURCES FOUND:\n" + "="*50)
@@ -1293,13 +1385,17 @@ def make_absolute_url(image_url, base_url):
         logger.error(f"❌ Error making URL absolute: {str(e)}\nBase URL: {base_url}\nImage URL: {image_url}")
         return image_url
 
-def _extract_publish_date(self, soup, result):
+def _extract_publish_date(soup, result, preferred_strategy: Optional[str] = None, trace: Optional[Dict[str, Any]] = None):
     """
     Extract the publish date from various meta tags and content patterns
     
     Args:
         soup: BeautifulSoup object of the page
         result: Dictionary to store the extracted date
+        preferred_strategy: Name of a date selector to try first (e.g. 'date:0'),
+            usually taken from the host's recipe
+        trace: Optional dict that receives the winning 'strategy' and the
+            number of 'attempts' made
     """
     # Common date selectors in order of preference
     date_selectors = [
@@ -1323,54 +1419,65 @@ def _extract_publish_date(self, soup, result):
         ('div', {'class': 'timestamp'}),
     ]
     
-    # Try to extract date from meta tags first
-    for tag, attrs in date_selectors[:7]:  # Just the meta tags
-        element = soup.find(tag, attrs)
+    # Try to parse common date formats
+    date_formats = [
+        '%Y-%m-%dT%H:%M:%S%z',  # ISO 8601 with timezone
+        '%Y-%m-%dT%H:%M:%S',     # ISO 8601 without timezone
+        '%Y-%m-%d',              # Simple date
+        '%B %d, %Y',             # Month day, Year
+        '%b %d, %Y',             # Abbreviated month
+        '%d %B %Y',              # Day Month Year
+        '%d %b %Y',              # Day Abbreviated Month Year
+        '%m/%d/%Y',              # MM/DD/YYYY
+        '%d/%m/%Y',              # DD/MM/YYYY
+        '%Y/%m/%d',              # YYYY/MM/DD
+    ]
+    
+    def parse_meta(element):
         if element and element.get('content'):
             date_str = element['content'].strip()
             try:
                 # Try to parse the date string
-                date_obj = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                result['publish_date'] = date_obj.isoformat()
-                logger.info(f"Found publish date in meta: {result['publish_date']}")
-                return
+                return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
             except (ValueError, AttributeError):
-                continue
+                return None
+        return None
     
-    # If no meta date found, try to find date in content
-    for tag, attrs in date_selectors[7:]:  # The rest of the selectors
-        element = soup.find(tag, attrs)
+    def parse_content(element):
         if element and element.get_text(strip=True):
             date_str = element.get_text(strip=True)
-            # Try to parse common date formats
-            date_formats = [
-                '%Y-%m-%dT%H:%M:%S%z',  # ISO 8601 with timezone
-                '%Y-%m-%dT%H:%M:%S',     # ISO 8601 without timezone
-                '%Y-%m-%d',              # Simple date
-                '%B %d, %Y',             # Month day, Year
-                '%b %d, %Y',             # Abbreviated month
-                '%d %B %Y',              # Day Month Year
-                '%d %b %Y',              # Day Abbreviated Month Year
-                '%m/%d/%Y',              # MM/DD/YYYY
-                '%d/%m/%Y',              # DD/MM/YYYY
-                '%Y/%m/%d',              # YYYY/MM/DD
-            ]
-            
             for fmt in date_formats:
                 try:
-                    date_obj = datetime.strptime(date_str, fmt)
-                    result['publish_date'] = date_obj.isoformat()
-                    logger.info(f"Found publish date in content: {result['publish_date']}")
-                    return
+                    return datetime.strptime(date_str, fmt)
                 except ValueError:
                     continue
+        return None
+    
+    # Meta tags first, then dates in content. A recipe's selector goes first.
+    order = list(range(len(date_selectors)))
+    if preferred_strategy and preferred_strategy.startswith('date:'):
+        order.sort(key=lambda i: f"date:{i}" != preferred_strategy)
+    
+    for attempt, index in enumerate(order, 1):
+        tag, attrs = date_selectors[index]
+        element = soup.find(tag, attrs)
+        date_obj = parse_meta(element) if index < 7 else parse_content(element)
+        if date_obj:
+            result['publish_date'] = date_obj.isoformat()
+            logger.info(f"Found publish date in {'meta' if index < 7 else 'content'}: {result['publish_date']}")
+            if trace is not None:
+                trace.update({'strategy': f"date:{index}", 'attempts': attempt})
+            return
+    
+    if trace is not None:
+        trace.update({'strategy': None, 'attempts': len(order)})
     
     # If still no date found, use current time as fallback
-    if 'publish_date' not in result:
+    if not result.get('publish_date'):
         result['publish_date'] = datetime.utcnow().isoformat() + 'Z'
         logger.warning("No publish date found, using current time")
 
-def _clean_article(self, article):
+def _clean_article(article):
     """
     Clean up the article content by removing unnecessary elements
     
@@ -1452,21 +1559,9 @@ def extract_article_content(url: str) -> Optional[Dict[str, str]]:
             'Cache-Control': 'max-age=0',
         }
         
-        # Create a session with retry mechanism and timeout
-        session = requests.Session()
-        session.headers.update(headers)
-        
-        # Configure retry strategy
-        retry_strategy = requests.adapters.HTTPAdapter(
-            max_retries=3,
-            status_forcelist=[408, 429, 500, 502, 503, 504],
-            allowed_methods=["GET", "POST"],
-            backoff_factor=1
-        )
-        session.mount("http://", retry_strategy)
-        session.mount("https://", retry_strategy)
+        # Shared session with retry mechanism; headers are sent per request
         logger.info(f"Fetching URL: {url}")
-        response = session.get(url, timeout=15)
+        response = get_http_session().get(url, headers=headers, timeout=15)
         response.raise_for_status()
         
         # Check if the response is HTML
@@ -1540,12 +1635,28 @@ def extract_article_content(url: str) -> Optional[Dict[str, str]]:
             'div#article-body'
         ]
         
-        # Try each selector until we find a match
-        for selector in content_selectors:
-            if not article:
+        # Use what worked for this host before, unless it is due for revalidation
+        host = extraction_recipes.normalize_host(url)
+        recipe = extraction_recipes.get_recipe(host)
+        preferred = recipe if recipe and not recipe.get('revalidate') else {}
+        winners, attempts, baseline_attempts = {}, {}, {}
+        
+        # Try the recipe's selector first, then each selector in order until we find a match
+        selector_order = list(content_selectors)
+        if preferred.get('content') in content_selectors:
+            selector_order.sort(key=lambda s: s != preferred['content'])
+        
+        skip_selectors = preferred.get('content') == DENSITY_STRATEGY
+        attempts['content'] = 0
+        if not skip_selectors:
+            for selector in selector_order:
+                attempts['content'] += 1
                 article = soup.select_one(selector)
                 if article:
                     logger.info(f"Found content using selector: {selector}")
+                    winners['content'] = selector
+                    baseline_attempts['content'] = content_selectors.index(selector) + 1
+                    break
         
         # If no specific content found, try to find the main content area with text density analysis
         if not article:
@@ -1578,6 +1689,19 @@ def extract_article_content(url: str) -> Optional[Dict[str, str]]:
                 candidates.sort(reverse=True, key=lambda x: x[0])
                 article = candidates[0][1]
                 logger.info(f"Found content using text density analysis (score: {candidates[0][0]:.2f})")
+                winners['content'] = DENSITY_STRATEGY
+                baseline_attempts['content'] = len(content_selectors) + 1
+                attempts['content'] += 1
+        
+        # The recipe said no selector matches this host, but density found nothing either
+        if not article and skip_selectors:
+            for selector in content_selectors:
+                attempts['content'] += 1
+                article = soup.select_one(selector)
+                if article:
+                    winners['content'] = selector
+                    baseline_attempts['content'] = content_selectors.index(selector) + 1
+                    break
         
         # Fall back to body if no better content found
         if not article:
@@ -1589,7 +1713,7 @@ def extract_article_content(url: str) -> Optional[Dict[str, str]]:
             return None
         
         # Clean up the article content
-        self._clean_article(article)
+        _clean_article(article)
         
         # Extract text content
         paragraphs = []
@@ -1612,7 +1736,12 @@ def extract_article_content(url: str) -> Optional[Dict[str, str]]:
         result['content'] = '\n\n'.join(clean_text(p) for p in paragraphs if p.strip())
         
         # Extract image using our enhanced function
-        image_url = get_article_image(soup, url)
+        image_trace = {}
+        image_url = get_article_image(soup, url, preferred_strategy=preferred.get('image'), trace=image_trace)
+        if image_trace.get('strategy'):
+            winners['image'] = image_trace['strategy']
+            attempts['image'] = image_trace['attempts']
+            baseline_attempts['image'] = image_trace['rank']
         if image_url:
             logger.info(f"✅ Found article image: {image_url}")
             result['image_url'] = image_url
@@ -1624,7 +1753,15 @@ def extract_article_content(url: str) -> Optional[Dict[str, str]]:
                 image_url = make_absolute_url(img['src'].strip(), url)
         
         # Extract publish date using our helper method
-        self._extract_publish_date(soup, result)
+        date_trace = {}
+        _extract_publish_date(soup, result, preferred_strategy=preferred.get('date'), trace=date_trace)
+        if date_trace.get('strategy'):
+            winners['date'] = date_trace['strategy']
+            attempts['date'] = date_trace['attempts']
+            baseline_attempts['date'] = int(date_trace['strategy'].split(':')[1]) + 1
+        
+        # Remember what worked so the next page from this host goes straight to it
+        extraction_recipes.record_extraction(host, recipe, winners, attempts, baseline_attempts)
         
         # Extract author if available
         author = None
@@ -1758,6 +1895,129 @@ def create_name_pattern(name: str) -> Tuple[re.Pattern, List[str]]:
         logger.error(f"Error compiling regex pattern: {e}")
         return None, search_terms
 
+def _parse_feed(feed_url: str):
+    """
+    Download and parse one feed and record the check on its rss_feeds document.
+
+    Returns:
+        The parsed feed, or None if it could not be read
+    """
+    try:
+        logger.info(f"Searching in feed: {feed_url}")
+        feed = feedparser.parse(feed_url, request_headers=HEADERS, agent=USER_AGENT)
+        if hasattr(feed, 'bozo_exception'):
+            logger.warning(f"Error parsing feed {feed_url}: {feed.bozo_exception}")
+            return None
+            
+        # Update last_checked timestamp in database
+        try:
+            get_rss_feeds_collection().update_one(
+                {"url": feed_url},
+                {"$set": {"last_checked": datetime.utcnow()}},
+                upsert=False
+            )
+        except Exception as e:
+            logger.warning(f"Could not update last_checked for {feed_url}: {e}")
+        return feed
+        
+    except Exception as e:
+        logger.warning(f"Error processing feed {feed_url}: {e}")
+        # Update error status in database
+        try:
+            get_rss_feeds_collection().update_one(
+                {"url": feed_url},
+                {"$set": {"last_error": str(e), "last_checked": datetime.utcnow()}},
+                upsert=False
+            )
+        except Exception as db_error:
+            logger.warning(f"Could not update error status for {feed_url}: {db_error}")
+        return None
+
+def _entry_search_text(entry) -> str:
+    """Title, description and content of a feed entry, lowercased for matching."""
+    title = entry.get('title', '').lower()
+    description = entry.get('description', '').lower()
+    content = ''
+    if hasattr(entry, 'content'):
+        content = ' '.join([c.get('value', '').lower() for c in entry.content if hasattr(c, 'value')])
+    
+    # Combine all text for searching (lowercase for case-insensitive matching)
+    return f"{title} {description} {content}".lower()
+
+def _entry_to_article(entry, feed, feed_url: str, url: str) -> Dict[str, str]:
+    """Article fields taken from the feed entry itself, without fetching the page."""
+    # Initialize article data with basic info
+    entry_data = {
+        'title': clean_text(entry.get('title', '')),
+        'url': url,
+        'publish_date': '',
+        'content': clean_text(entry.get('description', '')),
+        'source': clean_text(feed.get('feed', {}).get('title', urllib.parse.urlparse(feed_url).netloc)),
+        'author': clean_text(entry.get('author', 'Unknown')),
+        'image_url': None
+    }
+    
+    # Try to extract image from RSS entry first
+    rss_image = extract_image_from_rss_robust(entry)
+    if rss_image:
+        entry_data['image_url'] = clean_url(rss_image)
+        logger.info(f"📸 Found RSS image: {entry_data['image_url']}")
+    
+    # Set publish date from entry if available
+    if hasattr(entry, 'published_parsed') and entry.published_parsed:
+        try:
+            entry_data['publish_date'] = datetime(*entry.published_parsed[:6]).strftime('%Y-%m-%d')
+        except Exception as e:
+            logger.warning(f"Error parsing publish date: {e}")
+    
+    # If no date from published_parsed, try other date fields
+    if not entry_data['publish_date']:
+        for date_field in ['updated', 'published', 'pubDate', 'dc:date']:
+            if hasattr(entry, date_field):
+                entry_data['publish_date'] = clean_text(str(getattr(entry, date_field)))
+                break
+    return entry_data
+
+def _complete_article(entry_data: Dict[str, str], entry) -> Dict[str, str]:
+    """Fill in the article from its page when the entry's text is short, and normalize the image URL."""
+    url = entry_data['url']
+    
+    # Try to extract full article content and image if we don't have enough content
+    if len(entry_data['content']) < 200:  # If content is too short
+        try:
+            article_data = extract_article_content(url)
+            if article_data:
+                # Update entry data with extracted content
+                if article_data.get('content'):
+                    entry_data['content'] = clean_text(article_data['content'])
+                
+                # Use extracted image if we don't have one from RSS
+                if article_data.get('image_url') and not entry_data.get('image_url'):
+                    entry_data['image_url'] = clean_url(article_data['image_url'])
+                    logger.info(f"📸 Added extracted image: {entry_data['image_url']}")
+                
+                # Update publish date if we don't have one
+                if article_data.get('publish_date') and not entry_data.get('publish_date'):
+                    entry_data['publish_date'] = article_data['publish_date']
+        except Exception as e:
+            logger.warning(f"Error extracting article content from {url}: {e}")
+    
+    # Ensure we have some content
+    if not entry_data.get('content'):
+        entry_data['content'] = clean_text(entry.get('description', f"No content available. Please visit the source: {url}"))
+    
+    # Clean up the image URL if it exists
+    if entry_data.get('image_url'):
+        entry_data['image_url'] = clean_url(entry_data['image_url'])
+        
+        # Convert relative URLs to absolute
+        if entry_data['image_url'].startswith('//'):
+            entry_data['image_url'] = f'https:{entry_data["image_url"]}'
+        elif entry_data['image_url'].startswith('/'):
+            parsed_uri = urllib.parse.urlparse(url)
+            entry_data['image_url'] = f"{parsed_uri.scheme}://{parsed_uri.netloc}{entry_data['image_url']}"
+    return entry_data
+
 def search_rss_feeds(query: str, max_articles: int = 20) -> List[Dict[str, str]]:
     """Search for articles across all active RSS feeds with exact name matching"""
     # Create name pattern and get search terms
@@ -1783,144 +2043,42 @@ def search_rss_feeds(query: str, max_articles: int = 20) -> List[Dict[str, str]]
         if len(articles) >= max_articles:
             break
             
-        try:
-            logger.info(f"Searching in feed: {feed_url}")
-            feed = feedparser.parse(feed_url, request_headers=HEADERS, agent=USER_AGENT)
-            if hasattr(feed, 'bozo_exception'):
-                logger.warning(f"Error parsing feed {feed_url}: {feed.bozo_exception}")
-                continue
+        feed = _parse_feed(feed_url)
+        if feed is None:
+            continue
+            
+        for entry in feed.entries[:MAX_ENTRIES_PER_FEED]:
+            if len(articles) >= max_articles:
+                break
                 
-            # Update last_checked timestamp in database
             try:
-                rss_feeds_collection.update_one(
-                    {"url": feed_url},
-                    {"$set": {"last_checked": datetime.utcnow()}},
-                    upsert=False
-                )
-            except Exception as e:
-                logger.warning(f"Could not update last_checked for {feed_url}: {e}")
-            
-            entries = feed.entries[:20]  # Limit entries to process per feed
-            
-            for entry in entries:
-                if len(articles) >= max_articles:
-                    break
+                url = clean_url(entry.get('link', ''))
+                if not url or url in processed_urls:
+                    continue
+                    
+                # Skip this article if it doesn't match the name pattern
+                match = name_pattern.search(_entry_search_text(entry))
+                if not match:
+                    continue
                     
+                # If we get here, we have a match
+                logger.info(f"✅ MATCH FOUND: '{match.group(0)}' in {entry.get('title', 'Untitled')}")
+                
                 try:
-                    url = clean_url(entry.get('link', ''))
-                    if not url or url in processed_urls:
-                        continue
-                        
-                    # Get entry content for searching
-                    title = entry.get('title', '').lower()
-                    description = entry.get('description', '').lower()
-                    content = ''
-                    if hasattr(entry, 'content'):
-                        content = ' '.join([c.get('value', '').lower() for c in entry.content if hasattr(c, 'value')])
+                    entry_data = _complete_article(_entry_to_article(entry, feed, feed_url, url), entry)
                     
-                    # Combine all text for searching (lowercase for case-insensitive matching)
-                    search_text = f"{title} {description} {content}".lower()
+                    # Add the entry data to articles list
+                    articles.append(entry_data)
+                    processed_urls.add(url)
                     
-                    # Skip this article if it doesn't match the name pattern
-                    if not name_pattern or not name_pattern.search(search_text):
-                        continue
-                        
-                    # If we get here, we have a match
-                    match = name_pattern.search(search_text)
-                    logger.info(f"✅ MATCH FOUND: '{match.group(0)}' in {entry.get('title', 'Untitled')}")
+                    logger.info(f"✅ Added article: {entry_data.get('title')} - Image: {entry_data.get('image_url', 'No image')}")
                     
-                    try:
-                        # Initialize article data with basic info
-                        entry_data = {
-                            'title': clean_text(entry.get('title', '')),
-                            'url': url,
-                            'publish_date': '',
-                            'content': clean_text(entry.get('description', '')),
-                            'source': clean_text(feed.get('feed', {}).get('title', urllib.parse.urlparse(feed_url).netloc)),
-                            'author': clean_text(entry.get('author', 'Unknown')),
-                            'image_url': None
-                        }
-                        
-                        # Try to extract image from RSS entry first
-                        rss_image = extract_image_from_rss_robust(entry)
-                        if rss_image:
-                            entry_data['image_url'] = clean_url(rss_image)
-                            logger.info(f"📸 Found RSS image: {entry_data['image_url']}")
-                        
-                        # Set publish date from entry if available
-                        if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                            try:
-                                entry_data['publish_date'] = datetime(*entry.published_parsed[:6]).strftime('%Y-%m-%d')
-                            except Exception as e:
-                                logger.warning(f"Error parsing publish date: {e}")
-                        
-                        # If no date from published_parsed, try other date fields
-                        if not entry_data['publish_date']:
-                            for date_field in ['updated', 'published', 'pubDate', 'dc:date']:
-                                if hasattr(entry, date_field):
-                                    entry_data['publish_date'] = clean_text(str(getattr(entry, date_field)))
-                                    break
-                        
-                        # Try to extract full article content and image if we don't have enough content
-                        if len(entry_data['content']) < 200:  # If content is too short
-                            try:
-                                article_data = extract_article_content(url)
-                                if article_data:
-                                    # Update entry data with extracted content
-                                    if article_data.get('content'):
-                                        entry_data['content'] = clean_text(article_data['content'])
-                                    
-                                    # Use extracted image if we don't have one from RSS
-                                    if article_data.get('image_url') and not entry_data.get('image_url'):
-                                        entry_data['image_url'] = clean_url(article_data['image_url'])
-                                        logger.info(f"📸 Added extracted image: {entry_data['image_url']}")
-                                    
-                                    # Update publish date if we don't have one
-                                    if article_data.get('publish_date') and not entry_data.get('publish_date'):
-                                        entry_data['publish_date'] = article_data['publish_date']
-                            except Exception as e:
-                                logger.warning(f"Error extracting article content from {url}: {e}")
-                        
-                        # Ensure we have some content
-                        if not entry_data.get('content'):
-                            entry_data['content'] = clean_text(entry.get('description', f"No content available. Please visit the source: {url}"))
-                        
-                        # Clean up the image URL if it exists
-                        if entry_data.get('image_url'):
-                            entry_data['image_url'] = clean_url(entry_data['image_url'])
-                            
-                            # Convert relative URLs to absolute
-                            if entry_data['image_url'].startswith('//'):
-                                entry_data['image_url'] = f'https:{entry_data["image_url"]}'
-                            elif entry_data['image_url'].startswith('/'):
-                                parsed_uri = urllib.parse.urlparse(url)
-                                entry_data['image_url'] = f"{parsed_uri.scheme}://{parsed_uri.netloc}{entry_data['image_url']}"
-                        
-                        # Add the entry data to articles list
-                        articles.append(entry_data)
-                        processed_urls.add(url)
-                        
-                        logger.info(f"✅ Added article: {entry_data.get('title')} - Image: {entry_data.get('image_url', 'No image')}")
-                        
-                    except Exception as e:
-                        logger.error(f"Error processing article {url}: {e}", exc_info=True)
-                        
                 except Exception as e:
-                    logger.error(f"Error processing entry: {e}")
-                    continue
+                    logger.error(f"Error processing article {url}: {e}", exc_info=True)
                     
-        except Exception as e:
-            logger.warning(f"Error processing feed {feed_url}: {e}")
-            # Update error status in database
-            try:
-                rss_feeds_collection.update_one(
-                    {"url": feed_url},
-                    {"$set": {"last_error": str(e), "last_checked": datetime.utcnow()}},
-                    upsert=False
-                )
-            except Exception as db_error:
-                logger.warning(f"Could not update error status for {feed_url}: {db_error}")
-            continue
+            except Exception as e:
+                logger.error(f"Error processing entry: {e}")
+                continue
     
     # Cache the results
     if articles:
@@ -1928,41 +2086,9 @@ def search_rss_feeds(query: str, max_articles: int = 20) -> List[Dict[str, str]]
     
     return articles
 
-def get_news_about(query: str, max_articles: int = 50, start_date: str = None, end_date: str = None) -> List[Dict[str, str]]:
-    """
-    Get news articles about a person or company with date range filtering
-    
-    Args:
-        query: Name of the person or company to search for
-        max_articles: Maximum number of articles to return
-        start_date: Start date in YYYY-MM-DD format (optional)
-        end_date: End date in YYYY-MM-DD format (optional)
-        
-    Returns:
-        List of article dictionaries with title, content, url, publish_date, image_url, and source
-    """
-    logger.info(f"Searching for news about: {query}")
-    if start_date and end_date:
-        logger.info(f"Date range: {start_date} to {end_date}")
-    
-    # Generate cache key based on query and date range
-    date_range = f"{start_date or ''}_{end_date or ''}"
-    cache_key = get_cache_key(f"{query}_{date_range}", "news_about")
-    
-    # Try to load from cache first
-    cached_results = load_from_cache(cache_key)
-    if cached_results:
-        logger.info(f"Using cached results for query: {query} (date range: {date_range})")
-        return cached_results[:max_articles]
-    
-    all_articles = []
-    
-    # Search RSS feeds
-    logger.info("Searching RSS feeds...")
-    rss_articles = search_rss_feeds(query, max_articles * 2)  # Get more to account for date filtering
-    all_articles.extend(rss_articles)
-    
-    # Try to fetch from NewsAPI if available
+def _fetch_news_api(query: str, max_articles: int) -> List[Dict[str, str]]:
+    """NewsAPI articles about the query in this module's article format (empty if unavailable)."""
+    articles = []
     try:
         from news_fetcher import fetch_news as fetch_news_api
         logger.info("Trying NewsAPI...")
@@ -1970,7 +2096,7 @@ def get_news_about(query: str, max_articles: int = 50, start_date: str = None, e
         
         # Convert the format to match our structure
         for article in api_articles:
-            all_articles.append({
+            articles.append({
                 'title': article['title'],
                 'content': article['content'],
                 'url': article['url'],
@@ -1980,7 +2106,10 @@ def get_news_about(query: str, max_articles: int = 50, start_date: str = None, e
             })
     except Exception as e:
         logger.warning(f"Error fetching from NewsAPI: {str(e)}")
-    
+    return articles
+
+def _filter_and_sort(all_articles: List[Dict[str, str]], start_date: str = None, end_date: str = None) -> List[Dict[str, str]]:
+    """Drop duplicate URLs and articles outside the date range, newest first."""
     # Remove duplicates based on URL
     seen_urls = set()
     unique_articles = []
@@ -2018,6 +2147,46 @@ def get_news_about(query: str, max_articles: int = 50, start_date: str = None, e
         ),
         reverse=True
     )
+    return unique_articles
+
+def get_news_about(query: str, max_articles: int = 50, start_date: str = None, end_date: str = None) -> List[Dict[str, str]]:
+    """
+    Get news articles about a person or company with date range filtering
+    
+    Args:
+        query: Name of the person or company to search for
+        max_articles: Maximum number of articles to return
+        start_date: Start date in YYYY-MM-DD format (optional)
+        end_date: End date in YYYY-MM-DD format (optional)
+        
+    Returns:
+        List of article dictionaries with title, content, url, publish_date, image_url, and source
+    """
+    logger.info(f"Searching for news about: {query}")
+    if start_date and end_date:
+        logger.info(f"Date range: {start_date} to {end_date}")
+    
+    # Generate cache key based on query and date range
+    date_range = f"{start_date or ''}_{end_date or ''}"
+    cache_key = get_cache_key(f"{query}_{date_range}", "news_about")
+    
+    # Try to load from cache first
+    cached_results = load_from_cache(cache_key)
+    if cached_results:
+        logger.info(f"Using cached results for query: {query} (date range: {date_range})")
+        return cached_results[:max_articles]
+    
+    all_articles = []
+    
+    # Search RSS feeds
+    logger.info("Searching RSS feeds...")
+    rss_articles = search_rss_feeds(query, max_articles * 2)  # Get more to account for date filtering
+    all_articles.extend(rss_articles)
+    
+    # Try to fetch from NewsAPI if available
+    all_articles.extend(_fetch_news_api(query, max_articles))
+    
+    unique_articles = _filter_and_sort(all_articles, start_date, end_date)
     
     # Cache the results if we have any
     if unique_articles:
@@ -2029,6 +2198,106 @@ def get_news_about(query: str, max_articles: int = 50, start_date: str = None, e
     # Return the requested number of articles
     return unique_articles[:max_articles]
 
+def get_news_for_domains(domains: List[str], max_articles: int = 20, start_date: str = None, end_date: str = None,
+                         refresh: bool = False) -> Dict[str, List[Dict[str, str]]]:
+    """
+    Get news for several topics (e.g. a user's interests) with one crawl of the RSS feeds.
+    
+    The active feeds are downloaded once, concurrently, and every entry is
+    matched against all topics in a single pass. Pages of matched entries with
+    too little text are then extracted concurrently, once per URL however many
+    topics match it. Per topic the results are the same as get_news_about's and
+    share its cache, so topics searched recently are not crawled again.
+    
+    Args:
+        domains: Topics to search for
+        max_articles: Maximum number of articles per topic
+        start_date: Start date in YYYY-MM-DD format (optional)
+        end_date: End date in YYYY-MM-DD format (optional)
+        refresh: Crawl for every topic, even those with cached results
+        
+    Returns:
+        Dict mapping each topic, in the given order, to its articles (newest first)
+    """
+    domains = list(dict.fromkeys(domains))
+    date_range = f"{start_date or ''}_{end_date or ''}"
+    results = {}
+    patterns = {}
+    for domain in domains:
+        cached_results = None if refresh else load_from_cache(get_cache_key(f"{domain}_{date_range}", "news_about"))
+        if cached_results:
+            logger.info(f"Using cached results for query: {domain} (date range: {date_range})")
+            results[domain] = cached_results[:max_articles]
+            continue
+        name_pattern, _ = create_name_pattern(domain)
+        if name_pattern:
+            patterns[domain] = name_pattern
+        else:
+            results[domain] = []
+    
+    if patterns:
+        active_feeds = get_active_rss_feeds()
+        logger.info(f"Searching {len(active_feeds)} active RSS feeds once for: {', '.join(patterns)}")
+        with ThreadPoolExecutor(max_workers=FEED_FETCH_WORKERS) as pool:
+            feeds = list(pool.map(_parse_feed, active_feeds))
+        
+        # One pass over the entries, matching each against every topic still short of articles
+        limit = max_articles * 2  # Get more to account for date filtering
+        matches = {domain: [] for domain in patterns}
+        found = {}  # url -> (article fields from the entry, entry) for every matched entry
+        seen_urls = set()
+        for feed_url, feed in zip(active_feeds, feeds):
+            if feed is None:
+                continue
+            for entry in feed.entries[:MAX_ENTRIES_PER_FEED]:
+                try:
+                    url = clean_url(entry.get('link', ''))
+                    if not url or url in seen_urls:
+                        continue
+                    seen_urls.add(url)
+                    
+                    search_text = _entry_search_text(entry)
+                    matched = [domain for domain, name_pattern in patterns.items()
+                               if len(matches[domain]) < limit and name_pattern.search(search_text)]
+                    if not matched:
+                        continue
+                    logger.info(f"✅ MATCH FOUND for {', '.join(matched)} in {entry.get('title', 'Untitled')}")
+                    
+                    found[url] = (_entry_to_article(entry, feed, feed_url, url), entry)
+                    for domain in matched:
+                        matches[domain].append(url)
+                except Exception as e:
+                    logger.error(f"Error processing entry: {e}")
+        
+        def complete(url):
+            entry_data, entry = found[url]
+            try:
+                return url, _complete_article(entry_data, entry)
+            except Exception as e:
+                logger.error(f"Error processing article {url}: {e}", exc_info=True)
+                return url, None
+        
+        # Extract the union of matches; NewsAPI is queried per topic alongside
+        with ThreadPoolExecutor(max_workers=ARTICLE_EXTRACT_WORKERS) as pool:
+            api_futures = {domain: pool.submit(_fetch_news_api, domain, max_articles) for domain in patterns}
+            completed = dict(pool.map(complete, found))
+            api_articles = {domain: future.result() for domain, future in api_futures.items()}
+        logger.info(f"Extracted {len(found)} matched articles for {len(patterns)} topics")
+        
+        for domain in patterns:
+            # Copies, so callers can tag one topic's articles without touching another's
+            all_articles = [dict(completed[url]) for url in matches[domain] if completed.get(url)]
+            all_articles.extend(api_articles[domain])
+            unique_articles = _filter_and_sort(all_articles, start_date, end_date)
+            if unique_articles:
+                try:
+                    save_to_cache(get_cache_key(f"{domain}_{date_range}", "news_about"), unique_articles)
+                except Exception as e:
+                    logger.warning(f"Error saving to cache: {e}")
+            results[domain] = unique_articles[:max_articles]
+    
+    return {domain: results[domain] for domain in domains}
+
 if __name__ == "__main__":
     # Example usage
     name = input("Enter a person or company name: ")
@@ -7,8 +7,9 @@ from bson import ObjectId
 # Add the parent directory to path so we can import from the main app
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from models import users_collection, search_history_collection
+from models import users_collection, search_history_collection, resolve_search_articles
 from auth_ui import get_current_user
+import app_cache
 
 # Set page config
 st.set_page_config(page_title="Admin Dashboard", layout="wide")
@@ -39,8 +40,8 @@ menu = st.sidebar.radio(
 if menu == "User Management":
     st.header("User Management")
     
-    # Get all users
-    users = list(users_collection.find({}, {"password": 0}))  # Exclude passwords
+    # Get all users (cached briefly; cleared when users change)
+    users = app_cache.load_users()
     
     # Display users in a table with actions
     if users:
@@ -109,6 +110,7 @@ if menu == "User Management":
                                 {"_id": ObjectId(user_id)},
                                 {"$set": changes}
                             )
+                            app_cache.invalidate_users()
                             st.success(f"Updated user: {edited_user['Username']}")
                         except Exception as e:
                             st.error(f"Error updating user {edited_user['Username']}: {str(e)}")
@@ -132,6 +134,7 @@ if menu == "User Management":
                         
                     try:
                         users_collection.delete_one({"username": username})
+                        app_cache.invalidate_users()
                         st.success(f"Deleted user: {username}")
                         st.rerun()
                     except Exception as e:
@@ -188,6 +191,7 @@ if menu == "User Management":
                         )
                         
                         if user_id:
+                            app_cache.invalidate_users()
                             st.success(f"User '{new_username}' created successfully!")
                             st.rerun()
                         else:
@@ -204,13 +208,8 @@ elif menu == "Search Analytics":
     with col2:
         end_date = st.date_input("End Date", value=datetime.now())
     
-    # Get search history
-    search_history = list(search_history_collection.find({
-        "timestamp": {
-            "$gte": datetime.combine(start_date, datetime.min.time()),
-            "$lte": datetime.combine(end_date, datetime.max.time())
-        }
-    }).sort("timestamp", -1))
+    # Get search history (cached briefly; cleared when searches are logged or deleted)
+    search_history = app_cache.load_search_history(start_date, end_date)
     
     # Display search statistics
     st.subheader("Search Statistics")
@@ -293,6 +292,7 @@ elif menu == "Search Analytics":
                 
                 try:
                     result = search_history_collection.delete_many(query_filter)
+                    app_cache.invalidate_search_history()
                     st.success(f"Deleted {result.deleted_count} search history entries")
                     st.rerun()
                 except Exception as e:
@@ -306,7 +306,8 @@ elif menu == "Search Analytics":
         else:
             # Display a table of recent searches
             recent_searches = []
-            for s in search_history[:20]:  # Show most recent 20 searches
+            # Articles are stored as references; fetch their details in one query
+            for s in resolve_search_articles(search_history[:20]):  # Show most recent 20 searches
                 user_id = s.get('user_id', 'Anonymous')
                 username = user_map.get(user_id, 'Anonymous')
                 
@@ -388,6 +389,7 @@ elif menu == "RSS Feed Management":
                     )
                     
                     if feed_id:
+                        app_cache.invalidate_news()
                         st.success(f"Added feed: {feed_url}")
                         st.rerun()
                     else:
@@ -395,9 +397,9 @@ elif menu == "RSS Feed Management":
     
     # List of existing feeds with edit/delete options
     st.subheader("Manage Existing Feeds")
-    from models import get_rss_feeds, update_rss_feed, delete_rss_feed
+    from models import update_rss_feed, delete_rss_feed
     
-    feeds = get_rss_feeds(active_only=False)
+    feeds = app_cache.load_rss_feeds()
     
     if not feeds:
         st.info("No RSS feeds found. Add one using the form above.")
@@ -454,6 +456,7 @@ elif menu == "RSS Feed Management":
                                 st.error(f"Error updating {edited['Name']}: {error}")
                     
                     if success_count > 0:
+                        app_cache.invalidate_news()
                         st.success(f"Updated {success_count} feed(s)")
                         st.rerun()
             
@@ -471,6 +474,7 @@ elif menu == "RSS Feed Management":
                     if feed:
                         success, error = delete_rss_feed(feed['id'])
                         if success:
+                            app_cache.invalidate_news()
                             st.success(f"Deleted feed: {feed_url}")
                             st.rerun()
                         else:
@@ -502,24 +506,180 @@ elif menu == "System Status":
         
         # MongoDB stats
         try:
-            from models import client
-            db = client['news_scraper_db']
-            
-            # Get collection stats
-            users_count = db.users.count_documents({})
-            searches_count = db.search_history.count_documents({})
+            db_stats = app_cache.load_database_stats()
             
-            st.write(f"**Users:** {users_count}")
-            st.write(f"**Searches:** {searches_count}")
+            st.write(f"**Users:** {db_stats['users']}")
+            st.write(f"**Searches:** {db_stats['searches']}")
             
             # Database size
-            db_stats = db.command('dbstats')
-            db_size_mb = db_stats['dataSize'] / (1024 * 1024)
-            st.write(f"**Database Size:** {db_size_mb:.2f} MB")
+            st.write(f"**Database Size:** {db_stats['size_mb']:.2f} MB")
             
         except Exception as e:
             st.error(f"Error connecting to database: {str(e)}")
-    
+
+    # Per-host extraction recipes learned by the article extractor
+    st.subheader("Extraction Recipes")
+    from extraction_recipes import get_recipe_stats
+    recipe_stats = get_recipe_stats()
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Hosts Learned", recipe_stats['hosts'])
+    with col2:
+        st.metric("Pages Extracted", recipe_stats['pages'])
+    with col3:
+        st.metric("Recipe Hit Rate", f"{recipe_stats['hit_rate']:.0%}")
+    with col4:
+        st.metric("Selector Attempts Saved", recipe_stats['attempts_saved'])
+
+    st.caption(
+        f"Content {recipe_stats['content']['hit_rate']:.0%} · "
+        f"Image {recipe_stats['image']['hit_rate']:.0%} · "
+        f"Date {recipe_stats['date']['hit_rate']:.0%} · "
+        f"{recipe_stats['revalidations']} revalidations, {recipe_stats['relearned']} relearned"
+    )
+
+    st.subheader("Sentiment Cache")
+    from sentiment_cache import get_cache_stats
+    cache_stats = get_cache_stats()
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Cache Hit Rate", f"{cache_stats['hit_rate']:.0%}")
+    with col2:
+        st.metric("Hits / Misses", f"{cache_stats['hits']} / {cache_stats['misses']}")
+    with col3:
+        st.metric("Tokens Saved", f"{cache_stats['saved_tokens']:,}")
+    with col4:
+        st.metric("Cached Results", cache_stats['entries'])
+
+    st.caption(f"Backend: {cache_stats['backend']} · entries expire after 30 days")
+
+    st.subheader("Sentiment Requests Avoided")
+    from sentiment_analysis import get_usage_stats
+    import relevance
+    usage = get_usage_stats()
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Lexicon Answers", usage['lexicon_answers'])
+    with col2:
+        st.metric("Skipped (Low Relevance)", usage['relevance_skips'])
+    with col3:
+        st.metric("Deferred (Low Relevance)", usage['relevance_deferred'])
+    with col4:
+        st.metric("LLM Requests", usage['requests'])
+
+    st.caption(f"Since server start · relevance threshold {relevance.RELEVANCE_THRESHOLD:.2f}, "
+               f"mode '{relevance.RELEVANCE_MODE}' · {usage['lexicon_fallbacks']} lexicon fallbacks after LLM failures")
+
+    st.subheader("Overall Summaries")
+    from summarizer import get_summary_stats
+    summary_stats = get_summary_stats()
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Exact Cache Hits", summary_stats['exact_hits'])
+    with col2:
+        st.metric("Delta Updates", summary_stats['delta_updates'])
+    with col3:
+        st.metric("Full Regenerations", summary_stats['full_generations'])
+    with col4:
+        st.metric("Delta Update Rate", f"{summary_stats['delta_rate']:.0%}")
+
+    summary_caption = f"{summary_stats['articles_reused']} articles covered by a prior summary instead of being resent"
+    if summary_stats['streams']:
+        summary_caption += (f" · streamed {summary_stats['streams']} summaries, "
+                            f"avg time to first token {summary_stats['avg_ttft']:.2f}s, "
+                            f"avg total {summary_stats['avg_latency']:.2f}s")
+    st.caption(summary_caption)
+
+    st.subheader("Audio Cache")
+    from audio_cache import get_audio_cache_stats
+    audio_stats = get_audio_cache_stats()
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Cache Hit Rate", f"{audio_stats['hit_rate']:.0%}")
+    with col2:
+        st.metric("Hits / Misses", f"{audio_stats['hits']} / {audio_stats['misses']}")
+    with col3:
+        st.metric("Cached Clips", audio_stats['entries'])
+    with col4:
+        st.metric("Store Size", f"{audio_stats['bytes'] / (1024 * 1024):.1f} MB")
+
+    from tts import get_translation_stats
+    translation_stats = get_translation_stats()
+    st.caption(f"Since server start · limit {audio_stats['max_bytes'] / (1024 * 1024):.0f} MB, "
+               f"{audio_stats['evictions']} clips evicted · translated sentences "
+               f"{translation_stats['hit_rate']:.0%} from cache, {translation_stats['requests']} translation requests")
+
+    st.subheader("Audio Jobs")
+    from audio_jobs import get_job_stats
+    job_stats = get_job_stats()
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Queued / Running", f"{job_stats['counts']['queued']} / {job_stats['counts']['running']}")
+    with col2:
+        st.metric("Done / Failed", f"{job_stats['counts']['done']} / {job_stats['counts']['failed']}")
+    with col3:
+        st.metric("Avg Queue Wait", f"{job_stats['avg_wait']:.2f}s")
+    with col4:
+        st.metric("Avg Run Time", f"{job_stats['avg_run']:.2f}s")
+
+    if job_stats['recent']:
+        st.dataframe([
+            {
+                "Submitted": datetime.fromtimestamp(job['submitted_at']).strftime('%H:%M:%S'),
+                "User": job.get('user') or 'Anonymous',
+                "Query": job.get('query', ''),
+                "Status": job['status'],
+                "Wait (s)": round(job['wait'], 2),
+                "Run (s)": round(job['run'], 2) if job['run'] is not None else None,
+                "Error": job['error'] or '',
+            }
+            for job in job_stats['recent']
+        ], use_container_width=True, hide_index=True)
+
+    # Shared LLM queue
+    st.subheader("LLM Scheduler")
+    import pandas as pd
+    from llm_scheduler import get_scheduler_stats
+    scheduler_stats = get_scheduler_stats()
+
+    scheduler_df = pd.DataFrame([
+        {
+            "Class": name.capitalize(),
+            "Queued": stats['queued'],
+            "Users Waiting": stats['users'],
+            "In Flight": stats['in_flight'],
+            "Served": stats['granted'],
+            "Avg Wait (s)": round(stats['avg_wait'], 2),
+            "Max Wait (s)": round(stats['max_wait'], 2),
+            "Oldest Waiting (s)": round(stats['oldest_wait'], 2),
+        }
+        for name, stats in scheduler_stats['classes'].items()
+    ])
+    st.dataframe(scheduler_df, use_container_width=True, hide_index=True)
+
+    quota = scheduler_stats['quota']
+    scheduler_caption = " · ".join(
+        f"provider {kind} remaining: {int(value) if value is not None else 'unknown'}"
+        for kind, value in quota.items()
+    )
+    if scheduler_stats['paused_for']:
+        scheduler_caption += f" · paused for {scheduler_stats['paused_for']:.1f}s after a 429"
+    st.caption(scheduler_caption)
+
+    # Streamlit-level caches of fetched news, feed analyses and admin queries
+    st.subheader("Page Caches")
+    st.caption(f"News kept {app_cache.NEWS_TTL // 60} min · feed analyses {app_cache.ANALYSIS_TTL // 60} min · "
+               f"admin data {app_cache.ADMIN_TTL}s; cleared automatically when feeds, users or searches change")
+    if st.button("Clear Cached Data"):
+        app_cache.invalidate_all()
+        st.success("Cached data cleared")
+
     # Recent logs
     st.subheader("Recent Logs")
     # Note: In a production environment, you would connect to your logging system here
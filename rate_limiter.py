@@ -0,0 +1,140 @@
+import os
+import re
+import time
+import asyncio
+import logging
+from typing import Optional
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+# Groq free-tier limits for the default model; override to match your plan
+REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "30"))
+TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "6000"))
+
+
+class TokenBucket:
+    """
+    Classic token bucket: holds up to `capacity` units and refills continuously
+    at `capacity` units per `period` seconds.
+    """
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` units are available (0 if available now)."""
+        self._refill()
+        # A request larger than the bucket can never fit; let it through on a full bucket
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """
+    Async limiter enforcing both a requests-per-minute and a tokens-per-minute budget.
+
+    Callers `await limiter.acquire(tokens)` before each request. When the
+    provider answers 429, `limiter.pause(retry_after)` holds back every caller
+    until the server says it is safe to retry.
+    """
+
+    def __init__(self, requests_per_minute: int = REQUESTS_PER_MINUTE,
+                 tokens_per_minute: int = TOKENS_PER_MINUTE):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.paused_until = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self, tokens: int = 1) -> float:
+        """
+        Wait until one request carrying `tokens` tokens fits in both budgets.
+
+        Args:
+            tokens: Estimated tokens (prompt plus completion) for the request
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        # Created lazily so the limiter can be built outside a running loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        waited = 0.0
+        async with self._lock:
+            while True:
+                delay = max(
+                    self.paused_until - time.monotonic(),
+                    self.requests.wait_time(1),
+                    self.tokens.wait_time(tokens)
+                )
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+                waited += delay
+            self.requests.take(1)
+            self.tokens.take(tokens)
+        return waited
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all requests for `seconds` (e.g. from a Retry-After header)."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        logger.warning(f"Rate limited by provider, pausing requests for {seconds:.1f} seconds")
+
+
+def retry_after_seconds(error: Exception, default: float = 5.0) -> float:
+    """
+    Read the Retry-After header from a 429 error raised by the Groq/OpenAI client.
+
+    Args:
+        error: Exception raised by the client
+        default: Value to use when the header is missing or unparsable
+
+    Returns:
+        float: Seconds to wait before retrying
+    """
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    for header in ('retry-after', 'x-ratelimit-reset-requests', 'x-ratelimit-reset-tokens'):
+        value = headers.get(header)
+        if not value:
+            continue
+        seconds = parse_duration(value)
+        if seconds is not None:
+            return seconds
+    return default
+
+
+def parse_duration(value: str) -> Optional[float]:
+    """
+    Parse a rate-limit header duration into seconds.
+
+    Accepts plain seconds ("30") and Groq's reset format ("2m59.56s",
+    "7.66s", "120ms"). Returns None when nothing can be parsed.
+    """
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        units = {'h': 3600, 'm': 60, 's': 1, 'ms': 0.001}
+        seconds = sum(float(number) * units[unit]
+                      for number, unit in re.findall(r'([\d.]+)(ms|h|m|s)', value))
+        return seconds or None
@@ -0,0 +1,89 @@
+import os
+import logging
+from typing import Dict, Optional
+
+from entity_focus import entity_pattern, split_sentences
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+# Articles scoring below this are about something else and only mention the
+# entity in passing (sidebars, related-links blocks, one-line asides)
+RELEVANCE_THRESHOLD = float(os.getenv("SENTIMENT_RELEVANCE_THRESHOLD", "0.25"))
+
+# What happens to low-relevance articles before the LLM:
+#   skip          answer with the local lexicon result, no request
+#   deprioritize  still send them, in the scheduler's background class
+#   off           no filtering
+RELEVANCE_MODE = os.getenv("SENTIMENT_RELEVANCE_MODE", "skip")
+RELEVANCE_MODES = ("skip", "deprioritize", "off")
+if RELEVANCE_MODE not in RELEVANCE_MODES:
+    logger.warning(f"Unknown SENTIMENT_RELEVANCE_MODE {RELEVANCE_MODE!r}, using 'skip'")
+    RELEVANCE_MODE = "skip"
+
+# Sentences that count as the lead
+LEAD_SENTENCES = 3
+
+# Score components; they add up to 1.0
+TITLE_WEIGHT = 0.4
+LEAD_WEIGHT = 0.25
+DENSITY_WEIGHT = 0.2
+POSITION_WEIGHT = 0.15
+
+# Share of sentences mentioning the entity at which density counts in full
+FULL_DENSITY = 0.15
+
+
+def score_relevance(entity: str, content: str, title: Optional[str] = None) -> Dict[str, float]:
+    """
+    Estimate how much an article is about an entity, without any request.
+
+    Combines an entity mention in the title, a mention in the lead, the share
+    of sentences that mention the entity and how early the first mention
+    comes. Mentions use the same name variants as entity_focus.
+
+    Args:
+        entity: Company or person the analysis is about
+        content: Extracted article body
+        title: Article title, if known
+
+    Returns:
+        Dict with 'score' (0.0 to 1.0), 'title_mentions', 'lead_mentions',
+        'mentions' (in the body), 'density' and 'first_mention' (position of
+        the first mentioning sentence, 0.0 = first, 1.0 = none)
+    """
+    pattern = entity_pattern(entity)
+    if pattern is None:
+        # Nothing to match against; never filter what cannot be judged
+        return {'score': 1.0, 'title_mentions': 0, 'lead_mentions': 0, 'mentions': 0,
+                'density': 0.0, 'first_mention': 0.0}
+
+    sentences = split_sentences(content)
+    mentioning = [i for i, sentence in enumerate(sentences) if pattern.search(sentence)]
+    title_mentions = len(pattern.findall(title or ''))
+    lead_mentions = sum(len(pattern.findall(sentences[i])) for i in mentioning if i < LEAD_SENTENCES)
+    density = len(mentioning) / len(sentences) if sentences else 0.0
+    first_mention = mentioning[0] / len(sentences) if mentioning else 1.0
+
+    score = (TITLE_WEIGHT * bool(title_mentions)
+             + LEAD_WEIGHT * bool(lead_mentions)
+             + DENSITY_WEIGHT * min(1.0, density / FULL_DENSITY)
+             + POSITION_WEIGHT * (1.0 - first_mention if mentioning else 0.0))
+    return {
+        'score': round(score, 3),
+        'title_mentions': title_mentions,
+        'lead_mentions': lead_mentions,
+        'mentions': sum(len(pattern.findall(sentences[i])) for i in mentioning),
+        'density': round(density, 3),
+        'first_mention': round(first_mention, 3)
+    }
+
+
+def is_relevant(entity: str, content: str, title: Optional[str] = None,
+                threshold: float = RELEVANCE_THRESHOLD) -> bool:
+    return score_relevance(entity, content, title)['score'] >= threshold
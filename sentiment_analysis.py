@@ -1,10 +1,20 @@
 # sentiment_analysis.py
 import os
 import json
+import asyncio
 import logging
-from typing import Dict, Optional
-from groq import Groq
+from contextlib import nullcontext
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
+from rate_limiter import RateLimiter, retry_after_seconds
+import llm_client
+import llm_scheduler
+import sentiment_cache
+import lexicon_sentiment
+import relevance
+import keyword_engine
+from entity_focus import focus_article
 
 # Load environment variables from .env file
 load_dotenv()
@@ -17,51 +27,355 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize Groq client
-try:
-    api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
-        raise ValueError("GROQ_API_KEY not found in environment variables")
-    client = Groq(api_key=api_key)
-except Exception as e:
-    logger.error(f"Failed to initialize Groq client: {str(e)}")
-    raise
+# Truncate article content to reduce token usage (first 2000 characters)
+MAX_ARTICLE_LENGTH = 2000
 
-def analyze_sentiment(company: str, article_content: str) -> Optional[Dict[str, str]]:
-    """
-    Analyze sentiment of a news article for a specific company using Groq Cloud
-    
-    Args:
-        company (str): Name of the company
-        article_content (str): Full text content of the news article
-        
-    Returns:
-        Dict[str, str]: Analysis result with keys: Score, Sentiment, Summary, Keywords
-        None: If analysis fails
-    """
-    import time
-    
-    # Truncate article content to reduce token usage (first 2000 characters)
-    max_article_length = 2000
-    if len(article_content) > max_article_length:
-        article_content = article_content[:max_article_length] + "... [truncated]"
-    
-    system_prompt = """You are a sentiment analysis model and summarizer. The user will give the company name and news article as input. 
+# Rough size of a token for budgeting; llama tokenizers average ~4 chars per token
+CHARS_PER_TOKEN = 4
+
+# Prompt budget for one batched request, and the cap on articles per batch
+MAX_BATCH_TOKENS = 6000
+MAX_BATCH_ARTICLES = 8
+
+# Completion tokens reserved per article in a batch
+BATCH_TOKENS_PER_ARTICLE = 160
+
+# Routed through llm_client; set LLM_MODEL_SENTIMENT to use another model
+SENTIMENT_MODEL = llm_client.get_model("sentiment")
+
+# Bump whenever the prompts, the article preparation or the result contract
+# change so cached results produced the old way are no longer served
+PROMPT_VERSION = "3"
+CACHE_VERSION = f"{SENTIMENT_MODEL}:{PROMPT_VERSION}"
+
+# Articles the local lexicon engine scores with at least this confidence are
+# answered without the LLM. Set above 1 to send every article to the LLM; the
+# lexicon result is still used when the LLM request fails.
+LEXICON_CONFIDENCE = float(os.getenv("SENTIMENT_LEXICON_CONFIDENCE", "0.8"))
+
+SYSTEM_PROMPT = """You are a sentiment analysis model and summarizer. The user will give the company name and news article as input. 
 You have to analyze the news concerning the company to generate the output. You need to determine whether the news affects the company positively or negatively. 
 The output should be in JSON format:
 {
     "Score": , 
     "Sentiment": , 
-    "Summary": , 
-    "Keywords": 
+    "Summary": 
 }
 - Score must be in range [-1,+1] with 2 decimal places
 - Sentiment must be Positive/Neutral/Negative based on score
 - Summary should be 2-3 lines focusing on company impact
-- Keywords should be 3-5 most important topics
 - If the article is not relevant to the company, return neutral sentiment (0.0) and mention in the summary."""
 
+BATCH_SYSTEM_PROMPT = """You are a sentiment analysis model and summarizer. The user will give a company name and several news articles, each starting with a line "### Article <id>".
+For each article, analyze the news concerning the company and determine whether it affects the company positively or negatively. 
+The output should be a JSON object holding an array with one result per article, in any order:
+{
+    "results": [
+        {"id": "<id>", "Score": , "Sentiment": , "Summary": }
+    ]
+}
+- id must be the article id exactly as given
+- Score must be in range [-1,+1] with 2 decimal places
+- Sentiment must be Positive/Neutral/Negative based on score
+- Summary should be 2-3 lines focusing on company impact
+- If an article is not relevant to the company, return neutral sentiment (0.0) and mention in the summary."""
+
+# Requests and tokens spent on sentiment analysis in this process
+usage_stats = {'requests': 0, 'prompt_tokens': 0, 'completion_tokens': 0,
+               'lexicon_answers': 0, 'lexicon_fallbacks': 0,
+               'relevance_skips': 0, 'relevance_deferred': 0}
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate used for batch packing."""
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def truncate_article(article_content: str) -> str:
+    """Cut article content down to MAX_ARTICLE_LENGTH characters."""
+    if len(article_content) > MAX_ARTICLE_LENGTH:
+        return article_content[:MAX_ARTICLE_LENGTH] + "... [truncated]"
+    return article_content
+
+
+@lru_cache(maxsize=1024)
+def prepare_article(company: str, article_content: str) -> str:
+    """
+    Text sent to the model for an article.
+
+    Long articles are cut down to the sentences that mention the company and
+    their neighbours (see entity_focus). Articles that never mention it fall
+    back to the truncated lead.
+    """
+    focused = focus_article(company, article_content)
+    return focused if focused is not None else truncate_article(article_content)
+
+
+def validate_result(result: Dict) -> Dict:
+    """
+    Check an analysis result against the Score/Sentiment/Summary contract.
+    
+    Keywords are extracted locally (see keyword_engine), so the model is no
+    longer asked for them; an empty list is filled in when it has none.
+    
+    Args:
+        result (Dict): Parsed JSON result from the model
+        
+    Returns:
+        Dict: The result with only the contract fields
+        
+    Raises:
+        ValueError: If a field is missing or the score is out of range
+    """
+    if not isinstance(result, dict):
+        raise ValueError("Result is not a JSON object")
+        
+    # Validate required fields
+    required_fields = {"Score", "Sentiment", "Summary"}
+    if not all(field in result for field in required_fields):
+        raise ValueError("Missing required fields in response")
+        
+    # Validate score range
+    score = float(result["Score"])
+    if not -1 <= score <= 1:
+        raise ValueError("Score out of valid range [-1, 1]")
+        
+    validated = {field: result[field] for field in ("Score", "Sentiment", "Summary")}
+    validated["Keywords"] = result.get("Keywords") or []
+    return validated
+
+
+def _record_usage(completion) -> None:
+    usage_stats['requests'] += 1
+    usage = getattr(completion, 'usage', None)
+    if usage:
+        usage_stats['prompt_tokens'] += getattr(usage, 'prompt_tokens', 0) or 0
+        usage_stats['completion_tokens'] += getattr(usage, 'completion_tokens', 0) or 0
+
+
+def get_usage_stats() -> Dict[str, int]:
+    """Requests and tokens spent on sentiment analysis since the process started."""
+    return dict(usage_stats, total_tokens=usage_stats['prompt_tokens'] + usage_stats['completion_tokens'])
+
+
+def _single_messages(company: str, article_content: str) -> List[Dict[str, str]]:
     user_input = f"Company: {company}\nNews Article (truncated if too long):\n{article_content}"
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_input}
+    ]
+
+
+def _batch_messages(company: str, batch: List[Tuple[str, str]]) -> List[Dict[str, str]]:
+    user_input = f"Company: {company}\n\n" + "\n\n".join(
+        f"### Article {article_id}\n{content}" for article_id, content in batch
+    )
+    return [
+        {"role": "system", "content": BATCH_SYSTEM_PROMPT},
+        {"role": "user", "content": user_input}
+    ]
+
+
+def _parse_batch_response(response_text: str) -> Dict[str, Dict]:
+    """Validate every entry of a batch answer; invalid entries are left out."""
+    payload = json.loads(response_text)
+    results = payload.get("results", []) if isinstance(payload, dict) else payload
+    if not isinstance(results, list):
+        raise ValueError("Batch response has no results array")
+    
+    validated = {}
+    for item in results:
+        try:
+            article_id = str(item.get("id"))
+            validated[article_id] = validate_result(item)
+        except Exception as e:
+            logger.warning(f"Invalid batch result {item!r:.80}: {e}")
+    return validated
+
+
+def _cache_key(company: str, prepared_content: str) -> str:
+    return sentiment_cache.make_cache_key(company, prepared_content, CACHE_VERSION)
+
+
+def _split_cached(company: str, articles: Dict[str, str]) -> Tuple[Dict[str, Dict[str, str]], Dict[str, str]]:
+    """
+    Look articles up in the sentiment cache.
+
+    Returns:
+        Tuple of (cached result per article id, uncached content per article id)
+    """
+    cache_keys = {key: _cache_key(company, prepare_article(company, content or '')) for key, content in articles.items()}
+    found = sentiment_cache.lookup(cache_keys.values())
+
+    hits, misses = {}, {}
+    for key, content in articles.items():
+        entry = found.get(cache_keys[key])
+        if entry and entry.get('result'):
+            hits[key] = entry['result']
+        else:
+            misses[key] = content
+    return hits, misses
+
+
+def _store_results(company: str, articles: Dict[str, str], results: Dict[str, Optional[Dict[str, str]]]) -> None:
+    """Save successful results; failed analyses are not cached so they get retried."""
+    entries = []
+    for key, result in results.items():
+        if not result:
+            continue
+        prepared = prepare_article(company, articles[key] or '')
+        entries.append({
+            'key': _cache_key(company, prepared),
+            'entity': sentiment_cache.normalize_entity(company),
+            'content_hash': sentiment_cache.content_hash(prepared),
+            'version': CACHE_VERSION,
+            'result': result,
+            # What a standalone request for this article costs, prompt plus completion
+            'tokens': estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(prepared) + BATCH_TOKENS_PER_ARTICLE
+        })
+    sentiment_cache.store(entries)
+
+
+def _lexicon_tier(company: str, articles: Dict[str, str]) -> Tuple[Dict[str, Dict], Dict[str, str], Dict[str, Dict]]:
+    """
+    Score articles with the local lexicon engine.
+
+    Returns:
+        Tuple of (confident results, articles to escalate to the LLM, lexicon
+        result for every article to fall back on)
+    """
+    lexicon = lexicon_sentiment.analyze_lexicon_batch(company, articles)
+    confident = {key: result for key, result in lexicon.items() if result['Confidence'] >= LEXICON_CONFIDENCE}
+    escalate = {key: content for key, content in articles.items() if key not in confident}
+    usage_stats['lexicon_answers'] += len(confident)
+    return confident, escalate, lexicon
+
+
+def _with_fallback(lexicon: Dict[str, Dict], key: str, result: Optional[Dict[str, str]]) -> Optional[Dict[str, str]]:
+    """Replace a failed LLM analysis with the lexicon result."""
+    if result is None and key in lexicon:
+        usage_stats['lexicon_fallbacks'] += 1
+        logger.warning(f"LLM analysis unavailable, using lexicon result for {key}")
+        return dict(lexicon[key], Fallback=True)
+    return result
+
+
+def is_llm_result(result: Optional[Dict[str, Any]]) -> bool:
+    """
+    Whether a result is an LLM analysis, the only kind worth sharing.
+
+    Lexicon answers (confident, skipped as not relevant, or a fallback after a
+    failed or rate-limited request) are cheap to recompute and must not stand
+    in for the LLM analysis of later searches.
+    """
+    return bool(result) and result.get('Engine') != 'lexicon'
+
+
+def _relevance_tier(company: str, articles: Dict[str, str], lexicon: Dict[str, Dict],
+                    titles: Optional[Dict[str, str]] = None) -> Tuple[Dict[str, Dict], Dict[str, str], Dict[str, str]]:
+    """
+    Hold back articles that only mention the company in passing.
+
+    With SENTIMENT_RELEVANCE_MODE=skip (default) they are answered with their
+    lexicon result; with deprioritize they are still sent, but at background
+    priority after everything else.
+
+    Returns:
+        Tuple of (lexicon results for skipped articles, relevant articles,
+        low-relevance articles to send at background priority)
+    """
+    if relevance.RELEVANCE_MODE == "off" or not articles:
+        return {}, articles, {}
+
+    titles = titles or {}
+    relevant, low, scores = {}, {}, {}
+    for key, content in articles.items():
+        scores[key] = relevance.score_relevance(company, content or '', titles.get(key))['score']
+        if scores[key] >= relevance.RELEVANCE_THRESHOLD:
+            relevant[key] = content
+        else:
+            low[key] = content
+    if not low:
+        return {}, relevant, {}
+
+    logger.info(f"{len(low)} of {len(articles)} articles only mention {company} in passing "
+                f"({relevance.RELEVANCE_MODE})")
+    if relevance.RELEVANCE_MODE == "deprioritize":
+        usage_stats['relevance_deferred'] += len(low)
+        return {}, relevant, low
+    usage_stats['relevance_skips'] += len(low)
+    return {key: dict(lexicon[key], Relevance=scores[key]) for key in low}, relevant, {}
+
+
+def _fill_keywords(company: str, articles: Dict[str, str], results: Dict[str, Optional[Dict]],
+                   titles: Optional[Dict[str, str]] = None,
+                   keywords: Optional[Dict[str, List[str]]] = None) -> Dict[str, Optional[Dict]]:
+    """
+    Add local TF-IDF keywords to results that have none (the LLM is not asked for them).
+
+    Scoring only; the caller decides which articles go into the DF table.
+    Pass precomputed keywords to skip the extraction.
+    """
+    missing = [key for key, result in results.items() if result is not None and not result.get('Keywords')]
+    if not missing:
+        return results
+    if keywords is None:
+        keywords, _ = keyword_engine.extract_keywords(
+            company, {key: articles.get(key) or '' for key in missing}, titles, update=False)
+    return {key: dict(result, Keywords=keywords.get(key, [])) if key in missing else result
+            for key, result in results.items()}
+
+
+def _scheduling(low_relevance: bool):
+    """Scheduler class for LLM calls on deprioritized articles; unchanged otherwise."""
+    return llm_scheduler.priority("background") if low_relevance else nullcontext()
+
+
+def analyze_sentiment(company: str, article_content: str, title: Optional[str] = None) -> Optional[Dict[str, str]]:
+    """
+    Analyze sentiment of a news article for a specific company using Groq Cloud
+    
+    Results are cached by entity and content hash, so an article that was
+    already analyzed for the same company is answered without a request.
+    Articles the local lexicon engine scores confidently are not sent either,
+    and the lexicon result is returned if the LLM request fails. Articles that
+    only mention the company in passing are skipped or deprioritized (see
+    relevance.RELEVANCE_MODE).
+    
+    Args:
+        company (str): Name of the company
+        article_content (str): Full text content of the news article
+        title (str): Article title, used for the relevance check
+    
+    Returns:
+        Dict[str, str]: Analysis result with keys: Score, Sentiment, Summary, Keywords
+        None: If analysis fails
+    """
+    articles = {'article': article_content or ''}
+    hits, _ = _split_cached(company, articles)
+    if hits:
+        return _fill_keywords(company, articles, hits, {'article': title})['article']
+
+    confident, _, lexicon = _lexicon_tier(company, articles)
+    if confident:
+        return confident['article']
+
+    skipped, _, deferred = _relevance_tier(company, articles, lexicon, {'article': title})
+    if skipped:
+        return skipped['article']
+
+    with _scheduling(bool(deferred)):
+        result = _analyze_single(company, article_content or '')
+    _store_results(company, articles, {'article': result})
+    result = _fill_keywords(company, articles, {'article': result}, {'article': title})['article']
+    return _with_fallback(lexicon, 'article', result)
+
+
+def _analyze_single(company: str, article_content: str) -> Optional[Dict[str, str]]:
+    """Analyze one article with a blocking request, bypassing the cache."""
+    import time
+
+    article_content = prepare_article(company, article_content)
 
     max_retries = 3
     retry_delay = 5  # seconds
@@ -72,33 +386,19 @@ The output should be in JSON format:
             if attempt > 0:
                 time.sleep(retry_delay * (attempt + 1))  # Exponential backoff
                 
-            completion = client.chat.completions.create(
-                model="llama3-70b-8192",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_input}
-                ],
+            completion = llm_client.complete(
+                "sentiment",
+                messages=_single_messages(company, article_content),
                 temperature=0.3,
                 max_tokens=512,  # Reduced to save tokens
                 response_format={"type": "json_object"}  # Ensure JSON output
             )
+            _record_usage(completion)
             
             response_text = completion.choices[0].message.content
             
             # Validate and parse JSON response
-            result = json.loads(response_text)
-            
-            # Validate required fields
-            required_fields = {"Score", "Sentiment", "Summary", "Keywords"}
-            if not all(field in result for field in required_fields):
-                raise ValueError("Missing required fields in response")
-                
-            # Validate score range
-            score = float(result["Score"])
-            if not -1 <= score <= 1:
-                raise ValueError("Score out of valid range [-1, 1]")
-                
-            return result
+            return validate_result(json.loads(response_text))
             
         except Exception as e:
             if attempt == max_retries - 1:  # Last attempt
@@ -106,7 +406,8 @@ The output should be in JSON format:
                 return None
             
             if 'rate_limit' in str(e).lower() or '429' in str(e):
-                wait_time = retry_delay * (attempt + 1) * 2  # Exponential backoff
+                # Honour the server's Retry-After, fall back to exponential backoff
+                wait_time = retry_after_seconds(e, default=retry_delay * (attempt + 1) * 2)
                 logger.warning(f"Rate limit hit. Waiting {wait_time} seconds before retry...")
                 time.sleep(wait_time)
             else:
@@ -114,9 +415,350 @@ The output should be in JSON format:
     
     # If we get here, all retries failed
     return None
+
+
+def pack_batches(items: List[Tuple[str, str]], max_tokens: int = MAX_BATCH_TOKENS,
+                 max_articles: int = MAX_BATCH_ARTICLES) -> List[List[Tuple[str, str]]]:
+    """
+    Greedily pack (article_id, prepared_content) pairs into batches under a token budget.
+    
+    Args:
+        items: Article ids with their already prepared content
+        max_tokens: Prompt token budget per batch (system prompt included)
+        max_articles: Maximum number of articles per batch
+        
+    Returns:
+        List of batches, each a list of (article_id, content) pairs
+    """
+    base_tokens = estimate_tokens(BATCH_SYSTEM_PROMPT) + 20
+    batches, current, current_tokens = [], [], base_tokens
+    
+    for article_id, content in items:
+        item_tokens = estimate_tokens(content) + 10
+        if current and (current_tokens + item_tokens > max_tokens or len(current) >= max_articles):
+            batches.append(current)
+            current, current_tokens = [], base_tokens
+        current.append((article_id, content))
+        current_tokens += item_tokens
+        
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _analyze_batch(company: str, batch: List[Tuple[str, str]]) -> Dict[str, Dict]:
+    """
+    Send one batch of articles in a single request.
+    
+    Returns:
+        Dict mapping article id to its validated result. Articles that are
+        missing or fail validation are left out.
+    """
+    import time
+    
+    max_retries = 3
+    retry_delay = 5  # seconds
+    
+    for attempt in range(max_retries):
+        try:
+            if attempt > 0:
+                time.sleep(retry_delay * (attempt + 1))  # Exponential backoff
+                
+            completion = llm_client.complete(
+                "sentiment",
+                messages=_batch_messages(company, batch),
+                temperature=0.3,
+                max_tokens=BATCH_TOKENS_PER_ARTICLE * len(batch) + 64,
+                response_format={"type": "json_object"}
+            )
+            _record_usage(completion)
+            
+            return _parse_batch_response(completion.choices[0].message.content)
+            
+        except Exception as e:
+            if attempt == max_retries - 1:
+                logger.error(f"Batch analysis failed after {max_retries} attempts: {str(e)}")
+                return {}
+            
+            if 'rate_limit' in str(e).lower() or '429' in str(e):
+                # Honour the server's Retry-After, fall back to exponential backoff
+                wait_time = retry_after_seconds(e, default=retry_delay * (attempt + 1) * 2)
+                logger.warning(f"Rate limit hit. Waiting {wait_time} seconds before retry...")
+                time.sleep(wait_time)
+            else:
+                logger.error(f"Batch attempt {attempt + 1} failed: {str(e)}")
+    
+    return {}
+
+
+def analyze_sentiment_batch(company: str, articles: Dict[str, str],
+                            max_batch_tokens: int = MAX_BATCH_TOKENS,
+                            max_batch_articles: int = MAX_BATCH_ARTICLES,
+                            titles: Optional[Dict[str, str]] = None) -> Dict[str, Optional[Dict[str, str]]]:
+    """
+    Analyze many articles with as few requests as possible.
+    
+    Articles are prepared like in analyze_sentiment, packed into batches under
+    a token budget and sent one batch per request. Results that are missing or
+    fail validation are retried one by one. Articles with a cached result for
+    this company are answered from the cache and never sent; so are articles
+    the lexicon engine scores confidently. Failed analyses fall back to the
+    lexicon result. Articles that only mention the company in passing are
+    skipped or sent last at background priority (see relevance.RELEVANCE_MODE).
+
+    Args:
+        company (str): Name of the company
+        articles (Dict[str, str]): Article content keyed by a caller-chosen id (e.g. URL)
+        max_batch_tokens (int): Prompt token budget per request
+        max_batch_articles (int): Maximum number of articles per request
+        titles (Dict[str, str]): Article titles by the same ids, used for the relevance check
         
+    Returns:
+        Dict[str, Optional[Dict[str, str]]]: Result per article id (None if analysis failed)
+    """
+    if not articles:
+        return {}
+
+    # Only relevant articles without a cached result or a confident lexicon score cost a request
+    cached, uncached = _split_cached(company, articles)
+    confident, pending, lexicon = _lexicon_tier(company, uncached)
+    skipped, relevant, deferred = _relevance_tier(company, pending, lexicon, titles)
+    results: Dict[str, Optional[Dict[str, str]]] = {**_fill_keywords(company, articles, cached, titles),
+                                                     **confident, **skipped}
+    pending = {**relevant, **deferred}
+    if not pending:
+        return results
+
+    # Short ids keep the prompt small; map them back to the caller's keys afterwards
+    keys = list(pending.keys())
+    short_ids = {key: str(i) for i, key in enumerate(keys, 1)}
+    groups = [
+        (False, pack_batches([(short_ids[key], prepare_article(company, relevant[key] or '')) for key in relevant],
+                             max_batch_tokens, max_batch_articles)),
+        (True, pack_batches([(short_ids[key], prepare_article(company, deferred[key] or '')) for key in deferred],
+                            max_batch_tokens, max_batch_articles)),
+    ]
+    logger.info(f"Analyzing {len(pending)} articles for {company} in "
+                f"{sum(len(batches) for _, batches in groups)} batched requests "
+                f"({len(cached)} cached, {len(confident)} scored locally, {len(skipped)} skipped as not relevant)")
+
+    for low_relevance, batches in groups:
+        with _scheduling(low_relevance):
+            for batch in batches:
+                validated = _analyze_batch(company, batch) if len(batch) > 1 else {}
+                for short_id, content in batch:
+                    key = keys[int(short_id) - 1]
+                    if short_id in validated:
+                        results[key] = validated[short_id]
+                    else:
+                        # Missing or invalid in the batch answer: retry on its own
+                        results[key] = _analyze_single(company, pending[key] or '')
+
+    _store_results(company, pending, {key: results[key] for key in pending})
+    results = _fill_keywords(company, articles, results, titles)
+    for key in pending:
+        results[key] = _with_fallback(lexicon, key, results[key])
+    return results
+
+
+async def _complete_async(messages: List[Dict[str, str]], max_tokens: int,
+                          limiter: Optional[RateLimiter] = None, max_retries: int = 3) -> Optional[str]:
+    """
+    Run one JSON-mode chat completion.
+    
+    llm_client admits the request through llm_scheduler, which enforces the
+    RPM/TPM budgets and the provider's quota headers and holds every caller
+    back after a 429; that is the authoritative limit. A limiter, if given,
+    is an extra budget on top of it. 429 responses are retried once the
+    scheduler lets the request through again; other errors back off briefly.
+    Returns the response text, or None once the retries are used up.
+    """
+    estimated = sum(estimate_tokens(m["content"]) for m in messages) + max_tokens
+    
+    for attempt in range(max_retries):
+        if limiter:
+            await limiter.acquire(estimated)
+        try:
+            completion = await llm_client.acomplete(
+                "sentiment",
+                messages=messages,
+                temperature=0.3,
+                max_tokens=max_tokens,
+                response_format={"type": "json_object"}
+            )
+            _record_usage(completion)
+            return completion.choices[0].message.content
+            
+        except Exception as e:
+            if llm_client.is_rate_limit_error(e):
+                if limiter:
+                    limiter.pause(retry_after_seconds(e))
+                continue
+            logger.error(f"Attempt {attempt + 1} failed: {str(e)}")
+            if attempt < max_retries - 1:
+                await asyncio.sleep(2 ** attempt)
+    
+    logger.error(f"Request failed after {max_retries} attempts")
     return None
 
+
+async def analyze_sentiment_async(company: str, article_content: str,
+                                  limiter: Optional[RateLimiter] = None,
+                                  title: Optional[str] = None) -> Optional[Dict[str, str]]:
+    """
+    Async version of analyze_sentiment that waits for admission instead of sleeping.
+    
+    Args:
+        company (str): Name of the company
+        article_content (str): Full text content of the news article
+        limiter (RateLimiter): Optional extra budget on top of llm_scheduler, which
+            admits every request and is the authoritative limit
+        title (str): Article title, used for the relevance check
+        
+    Returns:
+        Dict[str, str]: Analysis result with keys: Score, Sentiment, Summary, Keywords
+        None: If analysis fails
+    """
+    articles = {'article': article_content or ''}
+    hits, _ = _split_cached(company, articles)
+    if hits:
+        return _fill_keywords(company, articles, hits, {'article': title})['article']
+
+    confident, _, lexicon = _lexicon_tier(company, articles)
+    if confident:
+        return confident['article']
+
+    skipped, _, deferred = _relevance_tier(company, articles, lexicon, {'article': title})
+    if skipped:
+        return skipped['article']
+
+    with _scheduling(bool(deferred)):
+        result = await _analyze_single_async(company, article_content or '', limiter)
+    _store_results(company, articles, {'article': result})
+    result = _fill_keywords(company, articles, {'article': result}, {'article': title})['article']
+    return _with_fallback(lexicon, 'article', result)
+
+
+async def _analyze_single_async(company: str, article_content: str,
+                                limiter: Optional[RateLimiter] = None) -> Optional[Dict[str, str]]:
+    """Analyze one article, bypassing the cache."""
+    messages = _single_messages(company, prepare_article(company, article_content))
+    
+    for attempt in range(2):
+        response_text = await _complete_async(messages, 512, limiter)
+        if response_text is None:
+            return None
+        try:
+            return validate_result(json.loads(response_text))
+        except Exception as e:
+            logger.warning(f"Invalid analysis result (attempt {attempt + 1}): {e}")
+    return None
+
+
+async def iter_sentiment_results(company: str, articles: Dict[str, str],
+                                 limiter: Optional[RateLimiter] = None,
+                                 max_concurrency: int = 4,
+                                 max_batch_tokens: int = MAX_BATCH_TOKENS,
+                                 max_batch_articles: int = MAX_BATCH_ARTICLES,
+                                 titles: Optional[Dict[str, str]] = None
+                                 ) -> AsyncIterator[Tuple[str, Optional[Dict[str, str]]]]:
+    """
+    Analyze many articles concurrently and yield results as they complete.
+    
+    Articles are packed into batches like analyze_sentiment_batch. Batches run
+    concurrently (up to max_concurrency in flight), each admitted by
+    llm_scheduler under the shared requests-per-minute and tokens-per-minute
+    budgets. Results are yielded in completion order, not input order. Entries that are missing or invalid in a
+    batch answer are retried individually. Cached results and confident
+    lexicon results are yielded first, before any request is made, and only
+    the remaining articles are sent. Failed analyses fall back to the lexicon.
+    Articles that only mention the company in passing are skipped (yielded
+    first with their lexicon result) or queued at background priority, see
+    relevance.RELEVANCE_MODE.
+    
+    Args:
+        company (str): Name of the company
+        articles (Dict[str, str]): Article content keyed by a caller-chosen id (e.g. URL)
+        limiter (RateLimiter): Optional extra budget on top of llm_scheduler, which
+            admits every request and is the authoritative limit
+        max_concurrency (int): Maximum number of requests in flight
+        max_batch_tokens (int): Prompt token budget per request
+        max_batch_articles (int): Maximum number of articles per request
+        titles (Dict[str, str]): Article titles by the same ids, used for the relevance check
+        
+    Yields:
+        Tuple[str, Optional[Dict[str, str]]]: (article id, result or None)
+    """
+    if not articles:
+        return
+        
+    cached, uncached = _split_cached(company, articles)
+    confident, pending, lexicon = _lexicon_tier(company, uncached)
+    skipped, relevant, deferred = _relevance_tier(company, pending, lexicon, titles)
+    for key, result in {**_fill_keywords(company, articles, cached, titles), **confident, **skipped}.items():
+        yield key, result
+    articles = {**relevant, **deferred}
+    if not articles:
+        return
+    # Keywords for everything that may still come back from the LLM, in one pass
+    keywords, _ = keyword_engine.extract_keywords(company, articles, titles, update=False)
+        
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    keys = list(articles.keys())
+    short_ids = {key: str(i) for i, key in enumerate(keys, 1)}
+    relevant_batches = pack_batches([(short_ids[key], prepare_article(company, relevant[key] or '')) for key in relevant],
+                                    max_batch_tokens, max_batch_articles)
+    deferred_batches = pack_batches([(short_ids[key], prepare_article(company, deferred[key] or '')) for key in deferred],
+                                    max_batch_tokens, max_batch_articles)
+    logger.info(f"Analyzing {len(keys)} articles for {company} in "
+                f"{len(relevant_batches) + len(deferred_batches)} concurrent requests "
+                f"({len(cached)} cached, {len(confident)} scored locally, {len(skipped)} skipped as not relevant)")
+    
+    async def run_single(key: str) -> List[Tuple[str, Optional[Dict[str, str]]]]:
+        async with semaphore:
+            return [(key, await _analyze_single_async(company, articles[key] or '', limiter))]
+    
+    async def run_batch(batch: List[Tuple[str, str]]) -> List[Tuple[str, Optional[Dict[str, str]]]]:
+        if len(batch) == 1:
+            done = await run_single(keys[int(batch[0][0]) - 1])
+            _store_results(company, articles, dict(done))
+            return done
+        async with semaphore:
+            response_text = await _complete_async(
+                _batch_messages(company, batch),
+                BATCH_TOKENS_PER_ARTICLE * len(batch) + 64,
+                limiter
+            )
+        try:
+            validated = _parse_batch_response(response_text) if response_text else {}
+        except Exception as e:
+            logger.warning(f"Invalid batch response: {e}")
+            validated = {}
+        
+        done = [(keys[int(short_id) - 1], validated[short_id]) for short_id, _ in batch if short_id in validated]
+        
+        # Missing or invalid in the batch answer: retry those on their own
+        retries = [keys[int(short_id) - 1] for short_id, _ in batch if short_id not in validated]
+        for retried in await asyncio.gather(*(run_single(key) for key in retries)):
+            done.extend(retried)
+        _store_results(company, articles, dict(done))
+        return done
+    
+    tasks = [asyncio.ensure_future(run_batch(batch)) for batch in relevant_batches]
+    # Tasks copy the current context, so these requests queue in the background class
+    with _scheduling(True):
+        tasks += [asyncio.ensure_future(run_batch(batch)) for batch in deferred_batches]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            for key, result in await finished:
+                result = _fill_keywords(company, articles, {key: result}, keywords=keywords)[key]
+                yield key, _with_fallback(lexicon, key, result)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
 # Example usage
 if __name__ == "__main__":
     # Test with sample data
@@ -0,0 +1,236 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Any
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+# "mongo" shares results across every app instance, "file" keeps them on local disk.
+# Defaults to Mongo when a MONGODB_URI is configured.
+CACHE_BACKEND = os.getenv("SENTIMENT_CACHE_BACKEND", "mongo" if os.getenv("MONGODB_URI") else "file")
+
+# Local backend location and entry lifetime (both backends)
+CACHE_DIR = Path("./cache/sentiment")
+CACHE_TTL = 30 * 86400  # 30 days in seconds
+
+STATS_ID = "sentiment_cache"
+
+
+def normalize_entity(name: str) -> str:
+    """Normalize an entity name so 'Elon Musk', '"elon  musk"' and 'ELON MUSK' share entries."""
+    return ' '.join(name.strip().strip('"\'').lower().split())
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 of the article text as sent to the model."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def make_cache_key(entity: str, truncated_content: str, version: str) -> str:
+    """
+    Build the cache key for one analysis.
+
+    Args:
+        entity: Entity name (normalized here)
+        truncated_content: Article content exactly as it is sent to the model
+        version: Model and prompt version; changing it invalidates old entries
+
+    Returns:
+        str: Hex digest identifying the (entity, content, version) triple
+    """
+    key = f"{normalize_entity(entity)}|{content_hash(truncated_content)}|{version}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+class FileSentimentCache:
+    """Sentiment results as JSON files under CACHE_DIR, one file per key."""
+
+    def __init__(self, cache_dir: Path = CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.stats_file = cache_dir / "_stats.json"
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        found = {}
+        for key in keys:
+            cache_file = self._path(key)
+            if not cache_file.exists():
+                continue
+            try:
+                if time.time() - cache_file.stat().st_mtime > CACHE_TTL:
+                    continue
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    found[key] = json.load(f)
+            except Exception as e:
+                logger.warning(f"Error reading cache file {cache_file}: {e}")
+        return found
+
+    def put_many(self, entries: List[Dict[str, Any]]) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        for entry in entries:
+            try:
+                with open(self._path(entry['key']), 'w', encoding='utf-8') as f:
+                    json.dump(entry, f, ensure_ascii=False, default=str)
+            except Exception as e:
+                logger.warning(f"Error writing sentiment cache entry {entry['key']}: {e}")
+
+    def _read_stats(self) -> Dict[str, int]:
+        try:
+            with open(self.stats_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def increment_stats(self, **counters: int) -> None:
+        with self._lock:
+            stats = self._read_stats()
+            for name, value in counters.items():
+                stats[name] = stats.get(name, 0) + value
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                with open(self.stats_file, 'w', encoding='utf-8') as f:
+                    json.dump(stats, f)
+            except Exception as e:
+                logger.warning(f"Error writing sentiment cache stats: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        stats = self._read_stats()
+        stats['entries'] = sum(1 for f in self.cache_dir.glob('*.json') if f != self.stats_file)
+        return stats
+
+
+class MongoSentimentCache:
+    """Sentiment results in the shared `sentiment_cache` collection."""
+
+    def __init__(self):
+        from models import sentiment_cache_collection, cache_stats_collection
+        self.collection = sentiment_cache_collection
+        self.stats_collection = cache_stats_collection
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        keys = list(keys)
+        if not keys:
+            return {}
+        return {doc['key']: doc for doc in self.collection.find({"key": {"$in": keys}}, {"_id": 0})}
+
+    def put_many(self, entries: List[Dict[str, Any]]) -> None:
+        from pymongo import UpdateOne
+        if not entries:
+            return
+        self.collection.bulk_write(
+            [UpdateOne({"key": entry['key']}, {"$set": entry}, upsert=True) for entry in entries],
+            ordered=False
+        )
+
+    def increment_stats(self, **counters: int) -> None:
+        self.stats_collection.update_one({"_id": STATS_ID}, {"$inc": counters}, upsert=True)
+
+    def get_stats(self) -> Dict[str, int]:
+        stats = self.stats_collection.find_one({"_id": STATS_ID}, {"_id": 0}) or {}
+        stats['entries'] = self.collection.estimated_document_count()
+        return stats
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """Return the configured cache backend, falling back to files if Mongo is unavailable."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            if CACHE_BACKEND == "mongo":
+                try:
+                    _backend = MongoSentimentCache()
+                except Exception as e:
+                    logger.warning(f"Mongo sentiment cache unavailable, using local files: {e}")
+            if _backend is None:
+                _backend = FileSentimentCache()
+        return _backend
+
+
+def lookup(keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch cached results and count hits, misses and tokens saved.
+
+    Args:
+        keys: Cache keys built with make_cache_key
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Cache entry per key that was found; each entry
+        holds the analysis under 'result' and its token cost under 'tokens'
+    """
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return {}
+    try:
+        backend = get_backend()
+        found = backend.get_many(keys)
+        backend.increment_stats(
+            hits=len(found),
+            misses=len(keys) - len(found),
+            saved_tokens=sum(int(entry.get('tokens', 0)) for entry in found.values())
+        )
+        return found
+    except Exception as e:
+        logger.warning(f"Sentiment cache lookup failed: {e}")
+        return {}
+
+
+def store(entries: List[Dict[str, Any]]) -> None:
+    """
+    Save analysis results.
+
+    Args:
+        entries: Dicts with 'key', 'entity', 'content_hash', 'version', 'result'
+            and 'tokens' (the estimated cost of producing the result)
+    """
+    if not entries:
+        return
+    now = datetime.utcnow()
+    for entry in entries:
+        entry.setdefault('created_at', now)
+    try:
+        get_backend().put_many(entries)
+    except Exception as e:
+        logger.warning(f"Sentiment cache store failed: {e}")
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """
+    Hit rate and token savings of the sentiment cache.
+
+    Returns:
+        Dict[str, Any]: backend, entries, hits, misses, hit_rate and saved_tokens
+    """
+    try:
+        backend = get_backend()
+        stats = backend.get_stats()
+    except Exception as e:
+        logger.warning(f"Could not read sentiment cache stats: {e}")
+        backend, stats = None, {}
+
+    hits, misses = stats.get('hits', 0), stats.get('misses', 0)
+    return {
+        'backend': 'mongo' if isinstance(backend, MongoSentimentCache) else 'file',
+        'entries': stats.get('entries', 0),
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+        'saved_tokens': stats.get('saved_tokens', 0)
+    }
@@ -1,13 +1,17 @@
 import os
+import re
 import logging
 import time
 import json
 import hashlib
+import threading
+import contextvars
 from pathlib import Path
-from typing import List, Optional, Dict, Tuple, Any
+from typing import Iterable, Iterator, List, Optional, Dict, Tuple, Any
 from functools import lru_cache
-from groq import Groq
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+import llm_client
 
 # Configure logging
 logging.basicConfig(
@@ -21,19 +25,34 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 
 # Cache configuration
-CACHE_DIR = Path("./cache")
-CACHE_DIR.mkdir(exist_ok=True)
+CACHE_DIR = Path("./cache")  # Created on first write
 CACHE_TTL = 86400  # 24 hours in seconds
 
-# Initialize Groq client
-try:
-    api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
-        raise ValueError("GROQ_API_KEY not found in environment variables")
-    client = Groq(api_key=api_key)
-except Exception as e:
-    logger.error(f"Failed to initialize Groq client: {str(e)}")
-    raise
+# Rough size of a token for prompt budgeting
+CHARS_PER_TOKEN = 4
+
+# Above this many prompt tokens of article summaries, "auto" mode switches to
+# map-reduce summarization
+HIERARCHICAL_THRESHOLD_TOKENS = int(os.getenv("SUMMARY_HIERARCHICAL_THRESHOLD", "3000"))
+
+# Token budget of article summaries per map chunk, length of each partial
+# summary, and number of chunks summarized in parallel
+MAP_CHUNK_TOKENS = 1500
+MAP_SUMMARY_WORDS = 120
+MAP_MAX_WORKERS = 4
+
+# Incremental updates: a cached summary is reused as the base for a new
+# article set when it covers at least INCREMENTAL_MIN_OVERLAP of the new set
+# and at most INCREMENTAL_MAX_REMOVED of its own articles have dropped out
+INCREMENTAL_MIN_OVERLAP = 0.5
+INCREMENTAL_MAX_REMOVED = 0.2
+
+# Article sets remembered per company for finding a base summary
+SUMMARY_INDEX_FILE = CACHE_DIR / "summary_index.json"
+SUMMARY_INDEX_SIZE = 20
+
+SUMMARY_STATS_FILE = CACHE_DIR / "summary_stats.json"
+_summary_lock = threading.Lock()
 
 def get_cache_key(*args: Any) -> str:
     """Generate a cache key from function arguments."""
@@ -61,6 +80,7 @@ def save_to_cache(cache_key: str, data: Dict) -> None:
     """Save data to cache file."""
     try:
         cache_file = CACHE_DIR / f"{cache_key}.json"
+        CACHE_DIR.mkdir(exist_ok=True)
         with open(cache_file, 'w', encoding='utf-8') as f:
             json.dump({
                 'data': data,
@@ -79,14 +99,446 @@ def _get_cached_summary(company: str, article_urls: tuple) -> Optional[str]:
     cached = load_from_cache(cache_key)
     return cached.get('data') if cached and 'data' in cached else None
 
-def generate_overall_summary(company: str, articles: List[Dict[str, str]]) -> Optional[str]:
+def _read_json(path: Path) -> Dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+def _write_json(path: Path, data: Dict) -> None:
+    try:
+        tmp_file = path.with_suffix('.tmp')
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_file, path)
+    except Exception as e:
+        logger.warning(f"Error writing {path}: {e}")
+
+def _count(outcome: str, **extra: int) -> None:
+    """Add to the persistent summary counters (exact_hits, delta_updates, full_generations, streams, ...)."""
+    with _summary_lock:
+        stats = _read_json(SUMMARY_STATS_FILE)
+        stats[outcome] = stats.get(outcome, 0) + 1
+        for name, value in extra.items():
+            stats[name] = stats.get(name, 0) + value
+        _write_json(SUMMARY_STATS_FILE, stats)
+
+def get_summary_stats() -> Dict[str, Any]:
+    """
+    How overall summaries were produced.
+    
+    Returns:
+        Dict[str, Any]: exact_hits, delta_updates, full_generations, their total,
+        delta_rate (share of generated summaries that were delta updates),
+        articles_reused (articles covered by a base summary instead of being resent),
+        and for streamed summaries the count with average time to first token
+        and total latency in seconds
+    """
+    stats = _read_json(SUMMARY_STATS_FILE)
+    exact, delta, full = (stats.get(k, 0) for k in ('exact_hits', 'delta_updates', 'full_generations'))
+    return {
+        'exact_hits': exact,
+        'delta_updates': delta,
+        'full_generations': full,
+        'total': exact + delta + full,
+        'delta_rate': delta / (delta + full) if delta + full else 0.0,
+        'articles_reused': stats.get('articles_reused', 0),
+        'streams': stats.get('streams', 0),
+        'avg_ttft': stats.get('ttft_ms', 0) / stats['streams'] / 1000 if stats.get('streams') else None,
+        'avg_latency': stats.get('latency_ms', 0) / stats['streams'] / 1000 if stats.get('streams') else None
+    }
+
+def _remember_article_set(company: str, article_urls: tuple, cache_key: str) -> None:
+    """Add a freshly cached summary to the company's index of article sets."""
+    company_key = company.strip().lower()
+    with _summary_lock:
+        index = _read_json(SUMMARY_INDEX_FILE)
+        entries = [e for e in index.get(company_key, []) if e['key'] != cache_key]
+        entries.append({'key': cache_key, 'urls': list(article_urls), 'timestamp': time.time()})
+        index[company_key] = entries[-SUMMARY_INDEX_SIZE:]
+        _write_json(SUMMARY_INDEX_FILE, index)
+
+def _find_base_summary(company: str, article_urls: tuple) -> Optional[Tuple[str, set]]:
+    """
+    Find the cached summary whose article set overlaps most with article_urls.
+    
+    Returns:
+        Optional[Tuple[str, set]]: (summary, URLs it covers), or None if no
+        cached set is close enough to update incrementally
+    """
+    current = set(article_urls)
+    with _summary_lock:
+        candidates = _read_json(SUMMARY_INDEX_FILE).get(company.strip().lower(), [])
+    
+    best = None
+    for entry in candidates:
+        previous = set(entry['urls'])
+        overlap = len(previous & current)
+        if overlap < INCREMENTAL_MIN_OVERLAP * len(current):
+            continue
+        if len(previous - current) > INCREMENTAL_MAX_REMOVED * len(previous):
+            continue
+        if best is None or overlap > best[0]:
+            best = (overlap, entry)
+    
+    if best is None:
+        return None
+    cached = load_from_cache(best[1]['key'])
+    if not cached or not cached.get('data'):
+        return None
+    return cached['data'], set(best[1]['urls'])
+
+def _delta_prompt(company: str, prior_summary: str, entries: List[str], removed: int) -> str:
+    """Prompt that updates a prior overall summary with newly added articles."""
+    prompt = f"""You are a financial analyst. Below is an existing summary of news articles about {company},
+        followed by new articles that it does not cover yet. Rewrite the summary so it also reflects the new articles.
+        Consider the sentiment of each article and highlight key points, trends, and any significant events mentioned.
+        Focus on facts and avoid speculation. Keep the summary under 200 words.
+        """
+    if removed:
+        prompt += f"""{removed} of the articles behind the existing summary are no longer included; give less weight to points only they support.
+        """
+    prompt += f"""
+        Existing summary:
+        {prior_summary.strip()}
+        
+        New articles:
+        """
+    return prompt + "".join(entries)
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for llama tokenizers)."""
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+def _article_entry(index: int, article: Dict[str, str]) -> str:
+    """Prompt lines for one article: its summary and sentiment score."""
+    entry = f"{index}. Summary: {article.get('summary', '')}\n"
+    if 'sentiment_score' in article:
+        entry += f"   Sentiment: {article['sentiment_score']}\n"
+    return entry + "\n"
+
+def _complete(prompt: str, max_tokens: int = 500, task: str = "summary") -> Optional[str]:
+    """
+    Run one summarization request with retries.
+    
+    Args:
+        prompt: User prompt
+        max_tokens: Completion token limit
+        task: llm_client task used to pick the model and timeout
+    
+    Returns:
+        Optional[str]: The completion text, or None if every attempt failed
+    """
+    max_retries = 3
+    retry_delay = 5  # seconds
+    
+    for attempt in range(max_retries):
+        try:
+            # Add delay between API calls to respect rate limits
+            if attempt > 0:
+                time.sleep(retry_delay * (attempt + 1))  # Exponential backoff
+                
+            response = llm_client.complete(
+                task,
+                messages=[
+                    {"role": "system", "content": "You are a helpful assistant that provides concise and accurate summaries."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.3,
+                max_tokens=max_tokens,
+            )
+            
+            summary = response.choices[0].message.content
+            if summary and isinstance(summary, str) and summary.strip():
+                return summary
+            raise ValueError("Empty summary returned")
+            
+        except Exception as e:
+            if attempt == max_retries - 1:
+                logger.error(f"Failed to generate summary after {max_retries} attempts: {str(e)}")
+                return None
+            wait_time = retry_delay * (attempt + 1) * 2  # Exponential backoff
+            logger.warning(f"Attempt {attempt + 1} failed. Waiting {wait_time} seconds before retry...")
+            time.sleep(wait_time)
+    return None
+
+def _stream_complete(prompt: str, max_tokens: int = 500, task: str = "summary") -> Iterator[str]:
+    """
+    Streaming version of _complete: yield the completion text as it arrives.
+    
+    Time to first token and total latency are logged and added to the summary
+    stats. Failures before the first token are retried; a failure after text
+    has been yielded is raised, since the caller has already shown that text.
+    """
+    max_retries = 3
+    retry_delay = 5  # seconds
+    
+    for attempt in range(max_retries):
+        started = time.perf_counter()
+        first_token = None
+        try:
+            if attempt > 0:
+                time.sleep(retry_delay * (attempt + 1))  # Exponential backoff
+                started = time.perf_counter()
+                
+            stream = llm_client.complete(
+                task,
+                messages=[
+                    {"role": "system", "content": "You are a helpful assistant that provides concise and accurate summaries."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.3,
+                max_tokens=max_tokens,
+                stream=True,
+            )
+            
+            pieces = 0
+            for chunk in stream:
+                piece = chunk.choices[0].delta.content if chunk.choices else None
+                if not piece:
+                    continue
+                if first_token is None:
+                    first_token = time.perf_counter() - started
+                pieces += 1
+                yield piece
+                
+            total = time.perf_counter() - started
+            if first_token is None:
+                raise ValueError("Empty summary returned")
+            logger.info(f"Summary stream finished: time to first token {first_token:.2f}s, "
+                        f"total latency {total:.2f}s, {pieces} chunks")
+            _count('streams', ttft_ms=int(first_token * 1000), latency_ms=int(total * 1000))
+            return
+            
+        except Exception as e:
+            if first_token is not None:
+                raise
+            if attempt == max_retries - 1:
+                logger.error(f"Failed to stream summary after {max_retries} attempts: {str(e)}")
+                return
+            wait_time = retry_delay * (attempt + 1) * 2  # Exponential backoff
+            logger.warning(f"Attempt {attempt + 1} failed. Waiting {wait_time} seconds before retry...")
+            time.sleep(wait_time)
+
+class SentenceSplitter:
+    """
+    Collects streamed text and hands out sentences as soon as they are complete,
+    e.g. to start speech synthesis before the summary is finished.
+    """
+    
+    # Sentence end: punctuation, optional closing quote/bracket, then whitespace
+    BOUNDARY = re.compile(r'(?<=[.!?])\s+|(?<=[.!?]["\')\]])\s+')
+    
+    def __init__(self):
+        self.buffer = ""
+        
+    def feed(self, text: str) -> List[str]:
+        """Add streamed text; return the sentences it completed."""
+        self.buffer += text
+        parts = self.BOUNDARY.split(self.buffer)
+        self.buffer = parts.pop()
+        return [p.strip() for p in parts if p.strip()]
+        
+    def flush(self) -> List[str]:
+        """Return whatever is left once the stream has ended."""
+        rest, self.buffer = self.buffer.strip(), ""
+        return [rest] if rest else []
+
+def iter_sentences(pieces: Iterable[str]) -> Iterator[str]:
+    """Regroup streamed text pieces into complete sentences."""
+    splitter = SentenceSplitter()
+    for piece in pieces:
+        yield from splitter.feed(piece)
+    yield from splitter.flush()
+
+def _final_prompt(company: str, entries: List[str], partial: bool = False) -> str:
+    """Prompt for the overall summary, over article entries or partial summaries."""
+    if partial:
+        source = f"the following partial summaries, each covering a group of news articles about {company}"
+        label = "Partial summaries"
+    else:
+        source = f"the following news articles about {company}"
+        label = "Articles"
+    prompt = f"""You are a financial analyst. Provide a comprehensive summary of {source}.
+        Consider the sentiment of each article and highlight key points, trends, and any significant events mentioned.
+        Focus on facts and avoid speculation. Keep the summary under 200 words.
+        
+        {label}:
+        """
+    return prompt + "".join(entries)
+
+def chunk_entries(entries: List[Tuple[str, str]], max_tokens: int = MAP_CHUNK_TOKENS) -> List[List[Tuple[str, str]]]:
+    """
+    Group (url, entry) pairs into chunks whose entries fit a token budget.
+    
+    Args:
+        entries: Article URL and its prompt entry, in prompt order
+        max_tokens: Token budget for the entries of one chunk
+        
+    Returns:
+        List of chunks; an entry larger than the budget gets a chunk of its own
+    """
+    chunks, current, current_tokens = [], [], 0
+    for url, entry in entries:
+        tokens = estimate_tokens(entry)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append(current)
+            current, current_tokens = [], 0
+        current.append((url, entry))
+        current_tokens += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+def _summarize_chunk(company: str, chunk: List[Tuple[str, str]]) -> Optional[str]:
+    """Map step: summarize one chunk of articles, reusing a cached partial summary if there is one."""
+    cache_key = get_cache_key('chunk_summary', company, *sorted(url for url, _ in chunk))
+    cached = load_from_cache(cache_key)
+    if cached and cached.get('data'):
+        return cached['data']
+        
+    prompt = f"""Summarize the following news articles about {company} for a financial analyst.
+        Keep concrete facts, names, numbers and dates, and note the overall sentiment of the group.
+        Avoid speculation. Keep it under {MAP_SUMMARY_WORDS} words.
+        
+        Articles:
+        """ + "".join(entry for _, entry in chunk)
+    
+    summary = _complete(prompt, max_tokens=MAP_SUMMARY_WORDS * 2, task="summary_map")
+    if summary:
+        save_to_cache(cache_key, summary)
+    return summary
+
+def _map_reduce_prompt(company: str, entries: List[Tuple[str, str]]) -> Optional[str]:
+    """
+    Hierarchical summary: summarize chunks in parallel and return the prompt
+    that reduces the partial summaries. Levels repeat until the partial
+    summaries fit in one final prompt.
+    """
+    level = 0
+    while True:
+        chunks = chunk_entries(entries)
+        logger.info(f"Map-reduce level {level}: summarizing {len(entries)} entries in {len(chunks)} parallel chunks")
+        
+        # Worker threads run in a copy of this context so the LLM scheduler
+        # still attributes the map calls to the requesting user
+        context = contextvars.copy_context()
+        with ThreadPoolExecutor(max_workers=MAP_MAX_WORKERS) as executor:
+            partials = list(executor.map(lambda chunk: context.copy().run(_summarize_chunk, company, chunk), chunks))
+            
+        # A failed chunk only loses its own articles; give up if all failed
+        partial_entries = [
+            ("|".join(sorted(url for url, _ in chunk)), f"{i}. {partial.strip()}\n\n")
+            for i, (chunk, partial) in enumerate(zip(chunks, partials), 1) if partial
+        ]
+        if not partial_entries:
+            return None
+        if len(partial_entries) < len(chunks):
+            logger.warning(f"{len(chunks) - len(partial_entries)} of {len(chunks)} chunk summaries failed")
+            
+        total_tokens = sum(estimate_tokens(entry) for _, entry in partial_entries)
+        if len(partial_entries) == 1 or total_tokens <= HIERARCHICAL_THRESHOLD_TOKENS or len(chunks) == len(entries):
+            return _final_prompt(company, [entry for _, entry in partial_entries], partial=True)
+            
+        entries = partial_entries
+        level += 1
+
+def _summary_prompts(company: str, articles: List[Dict[str, str]], article_urls: tuple,
+                     mode: str, incremental: bool) -> Iterator[Tuple[str, str, Dict[str, int]]]:
+    """
+    Prompts that can produce the overall summary, cheapest first.
+    
+    Yields a delta-update prompt when an overlapping cached summary exists,
+    then the full prompt (flat, or the reduce step of map-reduce). Callers
+    stop at the first prompt that yields a summary, so the map phase only runs
+    when it is needed.
+    
+    Yields:
+        Tuple of (prompt, stats counter to increment, extra counters)
+    """
+    # Create a mapping of URLs to article data
+    article_map = {a.get('url', ''): a for a in articles}
+    
+    base = _find_base_summary(company, article_urls) if incremental else None
+    if base:
+        prior_summary, covered = base
+        added = [url for url in article_urls if url not in covered]
+        removed = len(covered - set(article_urls))
+        delta_entries = [_article_entry(i, article_map.get(url, {})) for i, url in enumerate(added, 1)]
+        if sum(estimate_tokens(entry) for entry in delta_entries) <= HIERARCHICAL_THRESHOLD_TOKENS:
+            logger.info(f"Updating cached summary for {company} with {len(added)} new articles "
+                        f"({len(article_urls) - len(added)} reused, {removed} dropped)")
+            yield (_delta_prompt(company, prior_summary, delta_entries, removed), 'delta_updates',
+                   {'articles_reused': len(article_urls) - len(added)})
+    
+    entries = [(url, _article_entry(i, article_map.get(url, {}))) for i, url in enumerate(article_urls, 1)]
+    prompt_tokens = sum(estimate_tokens(entry) for _, entry in entries)
+    
+    if mode == "hierarchical" or (mode == "auto" and prompt_tokens > HIERARCHICAL_THRESHOLD_TOKENS):
+        prompt = _map_reduce_prompt(company, entries)
+    else:
+        prompt = _final_prompt(company, [entry for _, entry in entries])
+    if prompt:
+        yield prompt, 'full_generations', {}
+
+def _save_summary(company: str, article_urls: tuple, summary: str) -> None:
+    """Cache a finished overall summary and index its article set for delta updates."""
+    try:
+        cache_key = get_cache_key('overall_summary', company, *article_urls)
+        save_to_cache(cache_key, summary)
+        _remember_article_set(company, article_urls, cache_key)
+        # The in-memory lookup remembers the earlier miss for this set
+        _get_cached_summary.cache_clear()
+    except Exception as e:
+        logger.warning(f"Failed to save to cache: {e}")
+
+def summarize_article(company: str, article: Dict[str, str]) -> Optional[str]:
+    """
+    Summary of a single article, e.g. for a feed card.
+    
+    Cached per company, URL and text. Unlike generate_overall_summary it is
+    never a delta update, is not indexed for one and is not counted in
+    get_summary_stats.
+    
+    Args:
+        company (str): Name of the company or interest
+        article (Dict[str, str]): Article with 'url', 'summary' (the text to
+            summarize) and optionally 'sentiment_score'
+        
+    Returns:
+        Optional[str]: Generated summary or None if there was an error
+    """
+    cache_key = get_cache_key('article_summary', company, article.get('url', ''), article.get('summary', ''))
+    cached = load_from_cache(cache_key)
+    if cached and cached.get('data'):
+        return cached['data']
+    
+    summary = _complete(_final_prompt(company, [_article_entry(1, article)]))
+    if summary:
+        save_to_cache(cache_key, summary)
+    return summary
+
+def generate_overall_summary(company: str, articles: List[Dict[str, str]], mode: str = "auto",
+                             incremental: bool = True) -> Optional[str]:
     """
     Generate an overall summary by combining individual summaries and sentiment scores using an LLM API.
     Uses both in-memory and file-based caching to improve performance.
     
+    Large article sets are summarized hierarchically: article summaries are
+    grouped into chunks under a token budget, the chunks are summarized in
+    parallel and the partial summaries are reduced into the final summary.
+    
+    When the exact article set is not cached but a cached summary covers most
+    of it, only that summary and the added articles are sent (a delta update).
+    
     Args:
         company (str): Name of the company
         articles (List[Dict[str, str]]): List of articles, each containing 'summary' and 'sentiment_score'
+        mode (str): "flat" for a single prompt, "hierarchical" for map-reduce, or
+            "auto" to use map-reduce once the prompt exceeds HIERARCHICAL_THRESHOLD_TOKENS
+        incremental (bool): Allow delta updates of an overlapping cached summary
         
     Returns:
         Optional[str]: Generated summary or None if there was an error
@@ -101,74 +553,71 @@ def generate_overall_summary(company: str, articles: List[Dict[str, str]]) -> Op
     cached_summary = _get_cached_summary(company, article_urls)
     if cached_summary:
         logger.info(f"Using cached summary for {company}")
+        _count('exact_hits')
         return cached_summary
         
     logger.info(f"Generating new summary for {company} (not found in cache)")
     
-    # Create a mapping of URLs to article data
-    article_map = {a.get('url', ''): a for a in articles}
-    
-    # Generate the summary using Groq API
     try:
-        # Prepare the prompt
-        prompt = f"""You are a financial analyst. Provide a comprehensive summary of the following news articles about {company}.
-        Consider the sentiment of each article and highlight key points, trends, and any significant events mentioned.
-        Focus on facts and avoid speculation. Keep the summary under 200 words.
-        
-        Articles:
-        """
-        
-        # Add each article's summary and sentiment to the prompt
-        for i, url in enumerate(article_urls, 1):
-            article = article_map.get(url, {})
-            prompt += f"{i}. Summary: {article.get('summary', '')}\n"
-            if 'sentiment_score' in article:
-                prompt += f"   Sentiment: {article['sentiment_score']}\n"
-            prompt += "\n"
-        
-        # Make the API call with retry logic
-        max_retries = 3
-        retry_delay = 5  # seconds
-        
-        for attempt in range(max_retries):
-            try:
-                # Add delay between API calls to respect rate limits
-                if attempt > 0:
-                    time.sleep(retry_delay * (attempt + 1))  # Exponential backoff
-                    
-                response = client.chat.completions.create(
-                    model="llama3-70b-8192",
-                    messages=[
-                        {"role": "system", "content": "You are a helpful assistant that provides concise and accurate summaries."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.3,
-                    max_tokens=500,
-                )
-                
-                summary = response.choices[0].message.content
-                
-                # Save to cache if we got a valid summary
-                if summary and isinstance(summary, str) and len(summary.strip()) > 0:
-                    try:
-                        cache_key = get_cache_key('overall_summary', company, *article_urls)
-                        save_to_cache(cache_key, summary)
-                    except Exception as e:
-                        logger.warning(f"Failed to save to cache: {e}")
+        for prompt, outcome, counters in _summary_prompts(company, articles, article_urls, mode, incremental):
+            summary = _complete(prompt)
+            if summary:
+                _count(outcome, **counters)
+                _save_summary(company, article_urls, summary)
                 return summary
-                
-            except Exception as e:
-                if attempt == max_retries - 1:
-                    logger.error(f"Failed to generate summary after {max_retries} attempts: {str(e)}")
-                    return None
-                wait_time = retry_delay * (attempt + 1) * 2  # Exponential backoff
-                logger.warning(f"Attempt {attempt + 1} failed. Waiting {wait_time} seconds before retry...")
-                time.sleep(wait_time)
+        return None
     
     except Exception as e:
         logger.error(f"Failed to generate summary: {str(e)}")
         return None
 
+def stream_overall_summary(company: str, articles: List[Dict[str, str]], mode: str = "auto",
+                           incremental: bool = True) -> Iterator[str]:
+    """
+    Streaming variant of generate_overall_summary.
+    
+    Yields the summary in pieces as the API produces them; a cached summary is
+    yielded in one piece. The finished summary is cached exactly like
+    generate_overall_summary does. If the stream breaks after text has been
+    yielded the partial summary is not cached.
+    
+    Args:
+        company (str): Name of the company
+        articles (List[Dict[str, str]]): List of articles, each containing 'summary' and 'sentiment_score'
+        mode (str): See generate_overall_summary
+        incremental (bool): Allow delta updates of an overlapping cached summary
+        
+    Yields:
+        str: Consecutive pieces of the summary text
+    """
+    if not articles:
+        return
+        
+    article_urls = tuple(sorted(a.get('url', '') for a in articles))
+    
+    cached_summary = _get_cached_summary(company, article_urls)
+    if cached_summary:
+        logger.info(f"Using cached summary for {company}")
+        _count('exact_hits')
+        yield cached_summary
+        return
+        
+    logger.info(f"Streaming new summary for {company} (not found in cache)")
+    
+    try:
+        for prompt, outcome, counters in _summary_prompts(company, articles, article_urls, mode, incremental):
+            parts = []
+            for piece in _stream_complete(prompt):
+                parts.append(piece)
+                yield piece
+            summary = "".join(parts)
+            if summary.strip():
+                _count(outcome, **counters)
+                _save_summary(company, article_urls, summary)
+                return
+    except Exception as e:
+        logger.error(f"Failed to stream summary: {str(e)}")
+
 # Example usage
 if __name__ == "__main__":
     # Example articles for testing
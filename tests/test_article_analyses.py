@@ -0,0 +1,58 @@
+import pytest
+
+import models
+from models import canonical_url, get_article_analyses
+
+
+@pytest.mark.parametrize("url, expected", [
+    # Tracking parameters, fragment, www and trailing slash are dropped
+    ("https://www.Example.com/news/story/?utm_source=rss&id=2&fbclid=abc#comments",
+     "https://example.com/news/story?id=2"),
+    # Remaining parameters are sorted
+    ("https://example.com/a?b=2&a=1", "https://example.com/a?a=1&b=2"),
+    # Default ports are dropped, others kept
+    ("http://example.com:80/a", "http://example.com/a"),
+    ("https://example.com:443/a", "https://example.com/a"),
+    ("https://example.com:8080/a", "https://example.com:8080/a"),
+    # Host root keeps its slash
+    ("https://example.com", "https://example.com/"),
+    ("  https://EXAMPLE.com/Path  ", "https://example.com/Path"),
+])
+def test_canonical_url(url, expected):
+    assert canonical_url(url) == expected
+
+
+def test_canonical_url_is_idempotent():
+    url = canonical_url("https://www.example.com/story/?ref=home&page=2&utm_medium=feed")
+    assert canonical_url(url) == url
+
+
+class _FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = []
+
+    def find(self, query):
+        self.queries.append(query)
+        return [doc for doc in self.docs
+                if doc['entity'] == query['entity'] and doc['url'] in query['url']['$in']]
+
+
+def test_get_article_analyses_maps_every_caller_url_in_one_query(monkeypatch):
+    stored = {'entity': models.normalize_entity("Tesla"), 'url': "https://example.com/story", 'sentiment': {'Score': 0.4}}
+    collection = _FakeCollection([stored])
+    monkeypatch.setattr(models, "get_collection", lambda name: collection)
+
+    urls = ["https://www.example.com/story/?utm_source=rss", "https://example.com/story", "https://example.com/other", ""]
+    found = get_article_analyses("Tesla", urls)
+
+    assert found == {urls[0]: stored, urls[1]: stored}
+    assert len(collection.queries) == 1
+    assert sorted(collection.queries[0]['url']['$in']) == ["https://example.com/other", "https://example.com/story"]
+
+
+def test_get_article_analyses_without_urls_makes_no_query(monkeypatch):
+    collection = _FakeCollection([])
+    monkeypatch.setattr(models, "get_collection", lambda name: collection)
+    assert get_article_analyses("Tesla", ["", None]) == {}
+    assert collection.queries == []
@@ -0,0 +1,64 @@
+import time
+
+import pytest
+
+import audio_cache
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """Empty audio store of 10 bytes with a one-minute grace period."""
+    monkeypatch.setattr(audio_cache, "AUDIO_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(audio_cache, "AUDIO_CACHE_MAX_BYTES", 10)
+    monkeypatch.setattr(audio_cache, "EVICTION_GRACE_SECONDS", 60)
+    monkeypatch.setattr(audio_cache, "_index", None)
+    return tmp_path
+
+
+def _age(key, seconds):
+    """Pretend `key` was last used `seconds` ago."""
+    with audio_cache._lock:
+        audio_cache._index[key][1] = time.time() - seconds
+
+
+def test_files_used_within_the_grace_period_are_not_evicted(store):
+    audio_cache.put("a", b"123456")
+    audio_cache.put("b", b"123456")
+    # Over the limit, but both were just written
+    assert audio_cache.get_path("a") is not None
+    assert audio_cache.get_path("b") is not None
+    assert audio_cache.get_audio_cache_stats()['bytes'] == 12
+
+
+def test_least_recently_used_file_past_the_grace_period_is_evicted(store):
+    audio_cache.put("a", b"123456")
+    audio_cache.put("b", b"123456")
+    _age("a", 120)
+    _age("b", 90)
+    audio_cache.put("c", b"1234")
+    assert not (store / "a.mp3").exists()
+    assert audio_cache.get_path("a") is None
+    assert (store / "b.mp3").exists()
+    assert audio_cache.get_audio_cache_stats()['bytes'] == 10
+
+
+def test_a_lookup_counts_as_a_use(store):
+    audio_cache.put("a", b"123456")
+    audio_cache.put("b", b"123456")
+    _age("a", 120)
+    _age("b", 90)
+    # Handed out again: now the most recent, and inside the grace period
+    path = audio_cache.get_path("a")
+    audio_cache.put("c", b"1234")
+    assert path.read_bytes() == b"123456"
+    assert not (store / "b.mp3").exists()
+
+
+def test_eviction_stops_at_the_first_recent_file(store):
+    audio_cache.put("a", b"123456")
+    audio_cache.put("b", b"123456")
+    audio_cache.put("c", b"123456")
+    _age("a", 120)
+    audio_cache.put("d", b"1")
+    # Only the old file goes; the store stays over its limit until the others age
+    assert sorted(path.stem for path in store.glob("*.mp3")) == ["b", "c", "d"]
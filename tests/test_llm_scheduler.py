@@ -0,0 +1,174 @@
+import gc
+import time
+import asyncio
+import threading
+from contextlib import nullcontext
+
+import pytest
+
+import llm_client
+import llm_scheduler
+
+
+def _scheduler(max_concurrency=1):
+    # Budgets large enough that only the concurrency limit decides admission
+    return llm_scheduler.LLMScheduler(requests_per_minute=100000, tokens_per_minute=10 ** 8,
+                                      max_concurrency=max_concurrency)
+
+
+def _wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def _queued(sch):
+    with sch._cond:
+        return sum(len(queue) for users in sch.queues.values() for queue in users.values())
+
+
+def _start_waiter(sch, order, label, priority=None, user=None):
+    def run():
+        if user:
+            llm_scheduler.set_user(user)
+        with llm_scheduler.priority(priority) if priority else nullcontext():
+            with sch.slot("sentiment", 10):
+                order.append(label)
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def _admit_in_order(sch, starters):
+    """Queue the waiters behind a held slot, one by one, then let them through."""
+    order = []
+    with sch.slot("sentiment", 10):
+        threads = []
+        for i, start in enumerate(starters, 1):
+            threads.append(start(order))
+            _wait_until(lambda: _queued(sch) == i)
+    for thread in threads:
+        thread.join(5)
+    return order
+
+
+def test_higher_priority_class_is_admitted_first():
+    sch = _scheduler()
+    order = _admit_in_order(sch, [
+        lambda order: _start_waiter(sch, order, "background", "background"),
+        lambda order: _start_waiter(sch, order, "visible", "visible"),
+        lambda order: _start_waiter(sch, order, "interactive", "interactive"),
+    ])
+    assert order == ["interactive", "visible", "background"]
+    assert sch.in_flight == 0
+
+
+def test_users_take_turns_within_a_class():
+    sch = _scheduler()
+    order = _admit_in_order(sch, [
+        lambda order: _start_waiter(sch, order, "a1", user="a"),
+        lambda order: _start_waiter(sch, order, "a2", user="a"),
+        lambda order: _start_waiter(sch, order, "a3", user="a"),
+        lambda order: _start_waiter(sch, order, "b1", user="b"),
+    ])
+    assert order == ["a1", "b1", "a2", "a3"]
+
+
+def test_unknown_priority_is_rejected():
+    with pytest.raises(ValueError):
+        with llm_scheduler.priority("urgent"):
+            pass
+
+
+class _FakeStream:
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.closed = False
+
+    def __iter__(self):
+        return self.chunks
+
+    def close(self):
+        self.closed = True
+
+
+class _FakeRaw:
+    headers = {}
+
+    def __init__(self, parsed):
+        self.parsed = parsed
+
+    def parse(self):
+        return self.parsed
+
+
+class _FakeClient:
+    """Just enough of the Groq client for llm_client.complete."""
+
+    def __init__(self, parsed):
+        self.chat = self
+        self.completions = self
+        self.with_raw_response = self
+        self.parsed = parsed
+
+    def create(self, **kwargs):
+        return _FakeRaw(self.parsed)
+
+
+@pytest.fixture
+def streaming(monkeypatch):
+    """Scheduler and upstream stream behind llm_client.complete(..., stream=True)."""
+    sch = _scheduler(max_concurrency=2)
+    upstream = _FakeStream(["a", "b", "c"])
+    monkeypatch.setattr(llm_scheduler, "_scheduler", sch)
+    monkeypatch.setattr(llm_client, "get_client", lambda: _FakeClient(upstream))
+    return sch, upstream
+
+
+def _open_stream():
+    return llm_client.complete("summary", [{"role": "user", "content": "hi"}], stream=True)
+
+
+def test_stream_holds_its_slot_until_fully_read(streaming):
+    sch, upstream = streaming
+    stream = _open_stream()
+    assert sch.in_flight == 1
+    assert next(stream) == "a"
+    assert sch.in_flight == 1
+    assert list(stream) == ["b", "c"]
+    assert sch.in_flight == 0
+    assert upstream.closed
+
+
+def test_closing_a_stream_early_frees_its_slot_once(streaming):
+    sch, upstream = streaming
+    stream = _open_stream()
+    next(stream)
+    stream.close()
+    stream.close()
+    assert sch.in_flight == 0
+    assert upstream.closed
+
+
+def test_dropped_stream_frees_its_slot(streaming):
+    sch, _ = streaming
+    stream = _open_stream()
+    assert sch.in_flight == 1
+    del stream
+    gc.collect()
+    assert sch.in_flight == 0
+
+
+def test_grant_to_a_closed_event_loop_is_released():
+    sch = _scheduler()
+    loop = asyncio.new_event_loop()
+    with sch.slot("summary", 10):
+        sch._enqueue(llm_scheduler._Waiter("interactive", "someone", 10, loop))
+        loop.close()
+    # The grant goes to the closed loop's waiter, which cannot use or free it
+    _wait_until(lambda: sch.in_flight == 0 and _queued(sch) == 0)
+
+    with sch.slot("summary", 10):
+        assert sch.in_flight == 1
+    assert sch.in_flight == 0
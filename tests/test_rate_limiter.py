@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+import rate_limiter
+from rate_limiter import RateLimiter, TokenBucket, parse_duration
+
+
+class _Clock:
+    """time.monotonic stand-in; the limiter's sleeps advance it instead of waiting."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", clock.sleep)
+    return clock
+
+
+def test_bucket_refills_continuously(clock):
+    bucket = TokenBucket(60, period=60)  # One unit per second
+    bucket.take(60)
+    assert bucket.wait_time(1) == pytest.approx(1.0)
+    clock.now += 0.5
+    assert bucket.wait_time(1) == pytest.approx(0.5)
+    clock.now += 0.5
+    assert bucket.wait_time(1) == 0
+
+
+def test_bucket_never_holds_more_than_its_capacity(clock):
+    bucket = TokenBucket(10, period=60)
+    clock.now += 3600
+    bucket.take(10)
+    assert bucket.wait_time(1) == pytest.approx(6.0)
+
+
+def test_request_larger_than_the_bucket_passes_on_a_full_bucket(clock):
+    bucket = TokenBucket(100, period=60)
+    assert bucket.wait_time(500) == 0
+    bucket.take(500)
+    assert bucket.wait_time(100) == pytest.approx(60.0)
+
+
+def test_acquire_waits_for_the_request_budget(clock):
+    limiter = RateLimiter(requests_per_minute=2, tokens_per_minute=10 ** 6)
+
+    async def three():
+        return [await limiter.acquire(1) for _ in range(3)]
+
+    assert asyncio.run(three()) == [0, 0, pytest.approx(30.0)]
+
+
+def test_acquire_waits_for_the_token_budget(clock):
+    limiter = RateLimiter(requests_per_minute=1000, tokens_per_minute=600)  # 10 tokens per second
+
+    async def two():
+        return [await limiter.acquire(500), await limiter.acquire(200)]
+
+    assert asyncio.run(two()) == [0, pytest.approx(10.0)]
+
+
+def test_pause_holds_back_the_next_request(clock):
+    limiter = RateLimiter(requests_per_minute=1000, tokens_per_minute=10 ** 6)
+    limiter.pause(7.5)
+    assert asyncio.run(limiter.acquire(1)) == pytest.approx(7.5)
+
+
+@pytest.mark.parametrize("value, seconds", [
+    ("30", 30.0),
+    ("2m59.56s", 179.56),
+    ("7.66s", 7.66),
+    ("120ms", 0.12),
+    ("1h", 3600.0),
+    ("soon", None),
+])
+def test_parse_duration(value, seconds):
+    assert parse_duration(value) == (pytest.approx(seconds) if seconds is not None else None)
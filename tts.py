@@ -1,9 +1,19 @@
 import os
+import json
+import time
+import atexit
+import shutil
 import asyncio
-from googletrans import Translator
-from gtts import gTTS
+import hashlib
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, CancelledError, TimeoutError as FutureTimeoutError
 import logging
-from typing import Optional
+from typing import Any, Dict, List, Optional
+
+import audio_cache
+import tts_backends
+from entity_focus import split_sentences
 
 # Configure logging
 logging.basicConfig(
@@ -13,12 +23,165 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize translator
-translator = Translator()
+# Long texts are cut at sentence boundaries into chunks of about this many
+# characters, which are synthesized in parallel and joined frame by frame
+TTS_CHUNK_CHARS = int(os.getenv("TTS_CHUNK_CHARS", "300"))
+
+# Chunks synthesized at the same time per text
+TTS_MAX_WORKERS = int(os.getenv("TTS_MAX_WORKERS", "4"))
+
+# Sentence translations, kept across restarts so boilerplate such as
+# "Overall sentiment score is ..." is translated once per language
+TRANSLATION_CACHE_FILE = Path("./cache/translations.json")
+TRANSLATION_CACHE_MAX = 20000
+
+# Write the file at most every N new translations
+TRANSLATION_FLUSH_EVERY = 50
+
+# Sentences are sent in requests of up to this many characters, a few at a time
+TRANSLATE_BATCH_CHARS = 2000
+TRANSLATE_CONCURRENCY = 3
+
+_translation_lock = threading.Lock()
+_translations: Optional[Dict[str, str]] = None
+_pending_translations = 0
+_translation_stats = {'hits': 0, 'misses': 0, 'requests': 0}
+
+def _translation_key(sentence: str, src: str, dest: str) -> str:
+    """Cache key of one sentence translation: target language and sentence hash."""
+    digest = hashlib.sha256(f"{src}|{sentence}".encode('utf-8')).hexdigest()[:32]
+    return f"{dest}:{digest}"
+
+def _load_translations() -> Dict[str, str]:
+    """Load cached translations once per process. Caller must hold the lock."""
+    global _translations
+    if _translations is None:
+        _translations = {}
+        if TRANSLATION_CACHE_FILE.exists():
+            try:
+                with open(TRANSLATION_CACHE_FILE, 'r', encoding='utf-8') as f:
+                    _translations.update(json.load(f))
+            except Exception as e:
+                logger.warning(f"Error reading translation cache {TRANSLATION_CACHE_FILE}: {e}")
+    return _translations
+
+def _save_translations() -> None:
+    """Write cached translations atomically. Caller must hold the lock."""
+    global _pending_translations
+    if _translations is None:
+        return
+    try:
+        TRANSLATION_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = TRANSLATION_CACHE_FILE.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(_translations, f, ensure_ascii=False)
+        os.replace(tmp_file, TRANSLATION_CACHE_FILE)
+        _pending_translations = 0
+    except Exception as e:
+        logger.warning(f"Error writing translation cache {TRANSLATION_CACHE_FILE}: {e}")
+
+def flush_translations() -> None:
+    """Persist translations added since the last write."""
+    with _translation_lock:
+        if _pending_translations:
+            _save_translations()
+
+atexit.register(flush_translations)
+
+def _translation_batches(sentences: List[str], max_chars: int = TRANSLATE_BATCH_CHARS) -> List[List[str]]:
+    batches, size = [], 0
+    for sentence in sentences:
+        if not batches or size + len(sentence) > max_chars:
+            batches.append([])
+            size = 0
+        batches[-1].append(sentence)
+        size += len(sentence) + 1
+    return batches
+
+async def translate_sentences(sentences: List[str], dest: str, src: str = "en") -> Optional[List[str]]:
+    """
+    Translate sentences, answering repeated ones from the cache.
+    
+    Sentences without a cached translation are grouped into requests of up
+    to TRANSLATE_BATCH_CHARS characters, TRANSLATE_CONCURRENCY at a time, on
+    the backend from tts_backends.get_translate_backend().
+    
+    Args:
+        sentences (List[str]): Sentences in the source language.
+        dest (str): Target language code (e.g. 'hi', 'fr', 'es').
+        src (str): Source language code.
+        
+    Returns:
+        List[str]: One translation per sentence, in order.
+        None: If a request failed.
+    """
+    global _pending_translations
+    keys = [_translation_key(sentence, src, dest) for sentence in sentences]
+    with _translation_lock:
+        cache = _load_translations()
+        found = {}
+        for key in keys:
+            if key in cache:
+                # Re-insert so the least recently used entries are dropped first
+                found[key] = cache[key] = cache.pop(key)
+        _translation_stats['hits'] += sum(key in found for key in keys)
+    missing = list(dict.fromkeys(s for s, key in zip(sentences, keys) if key not in found))
+
+    if missing:
+        backend = tts_backends.get_translate_backend()
+        semaphore = asyncio.Semaphore(TRANSLATE_CONCURRENCY)
+
+        async def run(batch: List[str]) -> List[str]:
+            async with semaphore:
+                translated = await backend.translate_batch(batch, src, dest)
+            if len(translated) != len(batch):
+                raise ValueError(f"{len(translated)} translations for {len(batch)} sentences")
+            return translated
+
+        batches = _translation_batches(missing)
+        try:
+            results = await asyncio.gather(*(run(batch) for batch in batches))
+        except Exception as e:
+            logger.error(f"Translation to {dest} failed: {str(e)}")
+            return None
+
+        with _translation_lock:
+            cache = _load_translations()
+            for batch, translated in zip(batches, results):
+                for sentence, translation in zip(batch, translated):
+                    key = _translation_key(sentence, src, dest)
+                    found[key] = cache[key] = translation
+            while len(cache) > TRANSLATION_CACHE_MAX:
+                cache.pop(next(iter(cache)))
+            _translation_stats['misses'] += len(missing)
+            _translation_stats['requests'] += len(batches)
+            _pending_translations += len(missing)
+            if _pending_translations >= TRANSLATION_FLUSH_EVERY:
+                _save_translations()
+
+    return [found[key] for key in keys]
+
+async def translate(text: str, dest: str, src: str = "en") -> Optional[str]:
+    """
+    Translate text to any language, sentence by sentence (see translate_sentences).
+    
+    Args:
+        text (str): The text to translate.
+        dest (str): Target language code (e.g. 'hi', 'fr', 'es').
+        src (str): Source language code.
+        
+    Returns:
+        str: Translated text.
+        None: If translation failed.
+    """
+    if dest == src:
+        return text
+    translated = await translate_sentences(split_sentences(text), dest, src)
+    return " ".join(translated) if translated is not None else None
 
 async def translate_to_hindi(text: str) -> str:
     """
-    Translate the given text to Hindi asynchronously using googletrans.
+    Translate the given text to Hindi asynchronously; see translate.
     
     Args:
         text (str): The text to translate.
@@ -26,22 +189,29 @@ async def translate_to_hindi(text: str) -> str:
     Returns:
         str: Translated text in Hindi.
     """
-    try:
-        # Translate the text to Hindi
-        translated = await translator.translate(text, src='en', dest='hi')
-        return translated.text
-    except Exception as e:
-        logger.error(f"Translation failed: {str(e)}")
-        return None
+    return await translate(text, "hi")
 
-async def translate_and_generate_audio(text: str, lang: str = "en", output_file: str = "audio_summary.mp3") -> Optional[str]:
+def get_translation_stats() -> Dict[str, Any]:
+    """Sentence cache hits and misses and translation requests since server start."""
+    with _translation_lock:
+        stats = dict(_translation_stats)
+        stats['entries'] = len(_load_translations())
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+    return stats
+
+async def translate_and_generate_audio(text: str, lang: str = "en", output_file: Optional[str] = None) -> Optional[str]:
     """
     Generate an audio file from the given text in the specified language.
     
+    The audio is stored in the content-addressed audio cache, so the same text
+    in the same language is synthesized once and every request gets its own
+    read-only path instead of sharing one output file.
+    
     Args:
         text (str): The text to convert to speech.
         lang (str): Language code (e.g., 'en' for English, 'hi' for Hindi).
-        output_file (str): The name of the output audio file.
+        output_file (str): Also copy the audio here (optional).
         
     Returns:
         str: Path to the generated audio file.
@@ -50,25 +220,190 @@ async def translate_and_generate_audio(text: str, lang: str = "en", output_file:
     try:
         # If language is not English, translate first
         if lang != "en":
-            translated_text = await translate_to_hindi(text)
+            translated_text = await translate(text, lang)
             if not translated_text:
                 logger.error(f"Failed to translate text to {lang}")
                 return None
             text = translated_text
             
-        # Generate audio in the specified language
-        try:
-            tts = gTTS(text=text, lang=lang, slow=False)
-            tts.save(output_file)
-            return output_file
-        except Exception as e:
-            logger.error(f"TTS generation failed: {str(e)}")
+        # Generate audio in the specified language (or reuse it), in parallel chunks
+        path = await asyncio.to_thread(synthesize_to_cache, text, lang)
+        if path is None:
             return None
+        if output_file:
+            shutil.copyfile(path, output_file)
+            return output_file
+        return str(path)
             
     except Exception as e:
         logger.error(f"Error in generate_audio: {str(e)}")
         return None
 
+def synthesize_speech(text: str, lang: str = "en") -> Optional[bytes]:
+    """
+    Synthesize text to MP3 bytes.
+    
+    Clips are cached by text, language and voice; a cached clip is returned
+    without calling the TTS service.
+    
+    Args:
+        text (str): The text to convert to speech, already in the target language.
+        lang (str): Language code (e.g., 'en' for English, 'hi' for Hindi).
+        
+    Returns:
+        bytes: MP3 audio.
+        None: If TTS generation fails.
+    """
+    key = _audio_key(text, lang)
+    cached = audio_cache.get_bytes(key)
+    if cached is not None:
+        return cached
+    audio = _synthesize(text, lang)
+    if audio is not None:
+        audio_cache.put(key, audio)
+    return audio
+
+def synthesize_to_cache(text: str, lang: str = "en") -> Optional[str]:
+    """
+    Synthesize text of any length and return the path of the cached MP3.
+    
+    The text is split into sentence chunks (see split_chunks) that are
+    synthesized concurrently and joined without re-encoding.
+    """
+    stream = SentenceAudioStream(lang=lang)
+    for chunk in split_chunks(text):
+        stream.add(chunk)
+    return stream.finish()
+
+def split_chunks(text: str, max_chars: int = TTS_CHUNK_CHARS) -> List[str]:
+    """
+    Group sentences into chunks of up to max_chars characters.
+    
+    Sentences are never cut; one longer than max_chars is a chunk of its own.
+    """
+    chunks, current = [], ""
+    for sentence in split_sentences(text):
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = ""
+        current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+def _audio_key(text: str, lang: str) -> str:
+    return audio_cache.audio_key(text, lang, **tts_backends.get_backend().voice)
+
+def _synthesize(text: str, lang: str) -> Optional[bytes]:
+    """One call to the TTS backend, bypassing the cache."""
+    try:
+        return tts_backends.get_backend().synthesize(text, lang)
+    except Exception as e:
+        logger.error(f"TTS generation failed: {str(e)}")
+        return None
+
+class SentenceAudioStream:
+    """
+    Speech synthesis that starts while the text is still being generated.
+    
+    Sentences are synthesized in a background thread pool as soon as they are
+    added; finish() waits for the rest and writes the clips, in the order they
+    were added, to one MP3 file. MP3 frames can simply be concatenated.
+    Sentences and finished files both go through the audio cache, so a
+    repeated summary costs no synthesis and concurrent streams never share
+    an output file. first_chunk() hands out the first clip as soon as it is
+    synthesized, so playback can start before the rest is done.
+    """
+    
+    def __init__(self, lang: str = "en", max_workers: int = TTS_MAX_WORKERS):
+        self.lang = lang
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._futures = []
+        self._texts = []
+        self._started = None
+        
+    def add(self, text: str) -> None:
+        """Queue one sentence (or any self-contained piece of text) for synthesis."""
+        text = text.strip()
+        if text:
+            if self._started is None:
+                self._started = time.perf_counter()
+            self._texts.append(text)
+            self._futures.append(self._executor.submit(synthesize_speech, text, self.lang))
+            
+    def first_chunk(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """
+        MP3 of the first queued piece of text, once it is synthesized.
+        
+        Args:
+            timeout (float): Seconds to wait; 0 only checks, None waits until ready.
+        
+        Returns:
+            bytes: The first clip, playable on its own.
+            None: If nothing was queued, it is not ready yet or it failed.
+        """
+        if not self._futures:
+            return None
+        try:
+            return self._futures[0].result(timeout=timeout)
+        except (FutureTimeoutError, CancelledError):
+            # Not ready yet, or cancelled by finish() after a cache hit
+            return None
+        except Exception as e:
+            logger.warning(f"First audio chunk failed: {e}")
+            return None
+            
+    def finish(self, output_file: Optional[str] = None) -> Optional[str]:
+        """
+        Wait for all queued sentences and write the audio file.
+        
+        Args:
+            output_file (str): Also copy the audio here (optional); by default
+                the path of the file in the audio cache is returned.
+        
+        Returns:
+            str: Path to the generated audio file.
+            None: If nothing was queued or any sentence failed.
+        """
+        key = _audio_key("\n".join(self._texts), self.lang)
+        path = audio_cache.get_path(key) if self._texts else None
+        if path is not None:
+            self.cancel()
+            return self._deliver(path, output_file)
+            
+        try:
+            clips = [future.result() for future in self._futures]
+        finally:
+            self._executor.shutdown(wait=False)
+            
+        if not clips or any(clip is None for clip in clips):
+            logger.error(f"Sentence audio failed for {sum(clip is None for clip in clips)} of {len(clips)} sentences")
+            return None
+            
+        path = audio_cache.put(key, b"".join(clips))
+        if path is None:
+            logger.error("Writing audio file failed")
+            return None
+        logger.info(f"Audio for {len(clips)} sentences ready {time.perf_counter() - self._started:.2f}s after the first sentence was queued")
+        return self._deliver(path, output_file)
+        
+    @staticmethod
+    def _deliver(path, output_file: Optional[str]) -> Optional[str]:
+        if not output_file:
+            return str(path)
+        try:
+            shutil.copyfile(path, output_file)
+            return output_file
+        except Exception as e:
+            logger.error(f"Writing audio file failed: {str(e)}")
+            return None
+        
+    def cancel(self) -> None:
+        """Drop sentences that have not started synthesizing yet."""
+        for future in self._futures:
+            future.cancel()
+        self._executor.shutdown(wait=False)
+
 # Example usage
 async def main():
     # Test with sample data
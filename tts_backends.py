@@ -0,0 +1,201 @@
+import io
+import os
+import time
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+# Which engine synthesizes speech: "gtts" (Google Translate TTS, needs network)
+# or "stub" (silent MP3 of a plausible length, for offline development and tests)
+TTS_BACKEND = os.getenv("TTS_BACKEND", "gtts")
+
+# Which engine translates summaries before synthesis: "google" (googletrans,
+# needs network) or "stub" (marks the text with the target language, offline)
+TRANSLATE_BACKEND = os.getenv("TRANSLATE_BACKEND", "google")
+
+
+class GTTSBackend:
+    """Speech from Google Translate's TTS endpoint through gTTS."""
+
+    name = "gtts"
+
+    def __init__(self, slow: bool = False, tld: str = "com"):
+        self.slow = slow
+        self.tld = tld
+
+    @property
+    def voice(self) -> Dict[str, Any]:
+        """Settings that change the audio; part of the audio cache key."""
+        return {'engine': self.name, 'slow': self.slow, 'tld': self.tld}
+
+    def synthesize(self, text: str, lang: str) -> bytes:
+        """MP3 bytes for the text. Raises on failure."""
+        from gtts import gTTS
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=lang, slow=self.slow, tld=self.tld).write_to_fp(buffer)
+        return buffer.getvalue()
+
+
+class StubTTSBackend:
+    """
+    Offline stand-in that returns silent MP3 audio without any request.
+
+    The clip is made of valid MPEG-1 Layer III frames (128 kbit/s, 44.1 kHz)
+    and lasts about as long as reading the text aloud, so players, the audio
+    cache and frame concatenation behave as with real speech. An optional
+    per-call latency imitates a remote service.
+    """
+
+    name = "stub"
+
+    # Frame header: MPEG-1 Layer III, no CRC, 128 kbit/s, 44.1 kHz, no padding, mono
+    FRAME_HEADER = bytes([0xFF, 0xFB, 0x90, 0xC4])
+    FRAME_BYTES = 144 * 128000 // 44100
+    FRAME_SECONDS = 1152 / 44100
+    SECONDS_PER_CHAR = 0.06
+
+    def __init__(self, latency: float = float(os.getenv("TTS_STUB_LATENCY", "0"))):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    @property
+    def voice(self) -> Dict[str, Any]:
+        return {'engine': self.name}
+
+    def synthesize(self, text: str, lang: str) -> bytes:
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        frames = max(1, round(len(text) * self.SECONDS_PER_CHAR / self.FRAME_SECONDS))
+        frame = self.FRAME_HEADER + bytes(self.FRAME_BYTES - len(self.FRAME_HEADER))
+        return frame * frames
+
+
+BACKENDS = {
+    GTTSBackend.name: GTTSBackend,
+    StubTTSBackend.name: StubTTSBackend,
+}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """The configured TTS backend, created on first use."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            if TTS_BACKEND not in BACKENDS:
+                logger.warning(f"Unknown TTS_BACKEND {TTS_BACKEND!r}, using 'gtts'")
+            _backend = BACKENDS.get(TTS_BACKEND, GTTSBackend)()
+        return _backend
+
+
+def set_backend(backend: Optional[Any]) -> None:
+    """
+    Replace the TTS backend for this process.
+
+    Any object with a `name`, a `voice` dict and `synthesize(text, lang) -> bytes`
+    works. Pass None to go back to the configured one.
+    """
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+
+class GoogleTranslateBackend:
+    """Translation through googletrans; one request per batch of sentences."""
+
+    name = "google"
+
+    def __init__(self):
+        self._translator = None
+
+    def _get_translator(self):
+        # googletrans is slow to import, so it is loaded on the first translation
+        if self._translator is None:
+            from googletrans import Translator
+            self._translator = Translator()
+        return self._translator
+
+    async def translate_batch(self, sentences: List[str], src: str, dest: str) -> List[str]:
+        """
+        Translate sentences in one request, one output per input. Raises on failure.
+
+        The sentences are sent as lines of a single text. If the answer comes
+        back with a different number of lines, they are translated one by one.
+        """
+        translator = self._get_translator()
+        translated = await translator.translate("\n".join(sentences), src=src, dest=dest)
+        lines = [line.strip() for line in translated.text.split("\n")]
+        if len(lines) == len(sentences):
+            return lines
+        logger.warning(f"Batch translation returned {len(lines)} lines for {len(sentences)} sentences, "
+                       f"translating them separately")
+        return [t.text for t in await translator.translate(sentences, src=src, dest=dest)]
+
+
+class StubTranslateBackend:
+    """
+    Offline stand-in that prefixes each sentence with the target language.
+
+    Counts requests and sentences, and can wait a fixed latency per request,
+    so caching and batching can be tested and benchmarked without network.
+    """
+
+    name = "stub"
+
+    def __init__(self, latency: float = float(os.getenv("TRANSLATE_STUB_LATENCY", "0"))):
+        self.latency = latency
+        self.calls = 0
+        self.sentences = 0
+
+    async def translate_batch(self, sentences: List[str], src: str, dest: str) -> List[str]:
+        self.calls += 1
+        self.sentences += len(sentences)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return [f"[{dest}] {sentence}" for sentence in sentences]
+
+
+TRANSLATE_BACKENDS = {
+    GoogleTranslateBackend.name: GoogleTranslateBackend,
+    StubTranslateBackend.name: StubTranslateBackend,
+}
+
+_translate_backend = None
+
+
+def get_translate_backend():
+    """The configured translation backend, created on first use."""
+    global _translate_backend
+    with _backend_lock:
+        if _translate_backend is None:
+            if TRANSLATE_BACKEND not in TRANSLATE_BACKENDS:
+                logger.warning(f"Unknown TRANSLATE_BACKEND {TRANSLATE_BACKEND!r}, using 'google'")
+            _translate_backend = TRANSLATE_BACKENDS.get(TRANSLATE_BACKEND, GoogleTranslateBackend)()
+        return _translate_backend
+
+
+def set_translate_backend(backend: Optional[Any]) -> None:
+    """
+    Replace the translation backend for this process.
+
+    Any object with a `name` and an async `translate_batch(sentences, src, dest)`
+    returning one translation per sentence works. Pass None to go back to the
+    configured one.
+    """
+    global _translate_backend
+    with _backend_lock:
+        _translate_backend = backend